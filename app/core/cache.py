@@ -0,0 +1,108 @@
+"""
+In-process response cache for read-heavy admin endpoints.
+Entries are keyed by endpoint, filters and a data version
+(app/services/data_version_service.py); a submission write bumps the
+version, so stale entries are never served and simply age out. The cache
+is an LRU bounded by the total size of the cached bodies.
+
+The ETag is derived from the key alone, so a client that already holds the
+current body gets a 304 even from a worker whose cache is cold.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+# Changes to a cached endpoint's response shape should bump this, so
+# clients don't keep revalidating a body produced by older code
+CACHE_FORMAT = 1
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized response bodies with a byte budget"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Hashable, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+def make_etag(key: Tuple) -> str:
+    digest = hashlib.sha1(repr((CACHE_FORMAT,) + key).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def cached_json_response(
+    request: Request,
+    key: Tuple,
+    version: int,
+    build: Callable[[], Any]
+) -> Response:
+    """Serve `build()` as JSON through the cache, honouring If-None-Match.
+
+    `key` names the endpoint and its filters; `version` is the data version
+    read before any of the data `build` queries.
+    """
+    key = key + (version,)
+    etag = make_etag(key)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(key)
+    if body is None:
+        body = JSONResponse(content=jsonable_encoder(build())).body
+        response_cache.put(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -19,6 +19,28 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
 
+    # Image derivatives (resized WebP copies of uploaded photos)
+    IMAGE_THUMBNAIL_SIZE: int = 320  # Longest side in pixels
+    IMAGE_MEDIUM_SIZE: int = 1280
+    IMAGE_QUALITY: int = 80
+    IMAGE_WORKERS: int = 2  # Processes in the derivative pool
+
+    # Raw submission payloads (stored in submission_raw_data, loaded on demand)
+    # off: never, diff: only keys with no matching column, full: whole payload
+    RAW_SUBMISSION_MODE: str = "diff"
+    RAW_SUBMISSION_COMPRESS: bool = True  # zlib-compress stored payloads
+
+    # Batch submissions (offline-sync flushes)
+    MAX_BATCH_SUBMISSIONS: int = 500  # Items accepted per batch request
+    SUBMISSION_BATCH_CHUNK_SIZE: int = 100  # Items inserted per transaction
+
+    # Detailed analytics engine: "sql" aggregates in the database,
+    # "frame" loads the report columns into pandas (app/services/analytics_frame.py)
+    ANALYTICS_ENGINE: str = "sql"
+
+    # Response cache for dashboard/AI reports (in-process, per worker)
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Total cached body size
+
     # CORS - Can be a comma-separated string or list
     # Examples: "http://localhost:5173,https://pfmo-app.vercel.app" or ["http://localhost:5173"]
     BACKEND_CORS_ORIGINS: str = "*"  # Default to allow all for development
@@ -0,0 +1,20 @@
+# Schema migrations (Alembic) run at application startup
+import os
+
+from alembic import command
+from alembic.config import Config
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+def get_alembic_config() -> Config:
+    """Alembic config that works without alembic.ini (e.g. from uvicorn)"""
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    return config
+
+
+def run_migrations():
+    """Upgrade the database to the latest migration"""
+    command.upgrade(get_alembic_config(), "head")
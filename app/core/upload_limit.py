@@ -0,0 +1,36 @@
+# Reject oversized uploads before the request body is read
+from typing import Iterable
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Room for the multipart boundaries and part headers around the file; a file
+# within this margin over MAX_UPLOAD_SIZE is caught while it is copied
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Answer 413 from the Content-Length header alone, for requests to the
+    upload paths whose body is larger than MAX_UPLOAD_SIZE allows.
+    FastAPI spools the whole multipart body to disk before the endpoint
+    runs, so the endpoint's own check would come after that I/O.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str]):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            length = Headers(scope=scope).get("content-length", "")
+            if length.isdigit() and int(length) > settings.MAX_UPLOAD_SIZE + UPLOAD_FORM_OVERHEAD:
+                response = JSONResponse(
+                    {"detail": f"File exceeds {settings.MAX_UPLOAD_SIZE} bytes"},
+                    status_code=413)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
@@ -17,6 +18,29 @@ else:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_async_database_url(url: str) -> str:
+    """Map the configured URL onto its async driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    for prefix in ("postgresql+psycopg2:", "postgresql:", "postgres:"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg:", 1)
+    return url
+
+
+# Async engine for `async def` endpoints that query the database on the event
+# loop (submit_form), so their I/O doesn't block it. Plain `def` endpoints keep
+# the sync Session: FastAPI already runs them, and their sync dependencies, in
+# the threadpool. So does submit_batch, whose CPU-bound validation and flush
+# listeners would stall the loop under an AsyncSession.
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL))
+
+# expire_on_commit=False: attribute access after commit must not trigger I/O
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -27,3 +51,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session (async endpoints)"""
+    async with AsyncSessionLocal() as db:
+        yield db
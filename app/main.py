@@ -1,17 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base, get_db
+from app.database import get_db, async_engine
+from app.core.migrations import run_migrations
+from app.core.upload_limit import UploadSizeLimitMiddleware
 from app.routers import auth, submissions, forms, dashboard, ai_insights
 from app.core.config import settings
 from app.models.user import User, UserRole
 from app.models.form import Form
 from app.models.submission import FormSubmission
 from app.core.security import get_password_hash
-from sqlalchemy.orm import Session
+from app.services import image_service
+from app.services import rollup_service  # noqa: F401 - keeps dashboard rollups current on writes
+from app.services.submission_features import backfill_features
+from app.services.geo_service import backfill_geohashes
+from app.services.risk_service import backfill_risk
 from datetime import datetime
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create/upgrade tables (Alembic migrations in app/migrations)
+run_migrations()
 
 app = FastAPI(
     title="PFMO Data Collection API",
@@ -34,12 +40,16 @@ def parse_cors_origins(origins_str: str) -> list:
 
 cors_origins = parse_cors_origins(settings.BACKEND_CORS_ORIGINS)
 
+# Added before CORS so the early 413 still carries CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, paths=["/api/v1/submissions/upload"])
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include routers
@@ -96,6 +106,17 @@ async def startup_event():
         db.commit()
         print(f"✓ Default admin user created: {settings.ADMIN_USERNAME}")
 
+    # Fill derived feature columns for rows written before they existed
+    backfilled = backfill_features(db)
+    if backfilled:
+        print(f"✓ Computed features for {backfilled} submissions")
+    geohashed = backfill_geohashes(db)
+    if geohashed:
+        print(f"✓ Computed geohashes for {geohashed} submissions")
+    assessed = backfill_risk(db)
+    if assessed:
+        print(f"✓ Assessed risk for {assessed} submissions")
+
     # Create default form if none exists
     existing_form = db.query(Form).filter(
         Form.name == "PFMO Data Collection Form"
@@ -167,7 +188,14 @@ async def startup_event():
     db.close()
     print("✓ Database initialized successfully")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background worker processes and close pooled connections"""
+    image_service.shutdown()
+    await async_engine.dispose()
+
+
 if __name__ == "__main__":
     import uvicorn
-    from datetime import datetime
     uvicorn.run(app, host="0.0.0.0", port=8000)
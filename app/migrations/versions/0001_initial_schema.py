@@ -0,0 +1,126 @@
+"""Initial schema (users, forms, form_submissions)
+
+Databases created earlier by Base.metadata.create_all already have these
+tables; they are left untouched so existing deployments adopt migrations
+without losing data.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing_tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("username", sa.String(50), nullable=False),
+            sa.Column("email", sa.String(100), nullable=False),
+            sa.Column("hashed_password", sa.String(255), nullable=False),
+            sa.Column("full_name", sa.String(200)),
+            sa.Column("phone", sa.String(20)),
+            sa.Column("role", sa.Enum("ADMIN", "DATA_COLLECTOR",
+                      name="userrole"), nullable=False),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+            sa.Column("notes", sa.Text()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_username", "users",
+                        ["username"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "forms" not in existing_tables:
+        op.create_table(
+            "forms",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(200), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("version", sa.String(50)),
+            sa.Column("form_schema", sa.JSON()),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("is_deleted", sa.Boolean()),
+            sa.Column("created_by", sa.Integer()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_forms_id", "forms", ["id"])
+
+    if "form_submissions" not in existing_tables:
+        op.create_table(
+            "form_submissions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("form_id", sa.Integer(), sa.ForeignKey("forms.id")),
+            sa.Column("collector_id", sa.Integer(),
+                      sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("pfmo_name", sa.String(200)),
+            sa.Column("pfmo_phone", sa.String(20)),
+            sa.Column("geopolitical_zone", sa.String(50)),
+            sa.Column("state", sa.String(100)),
+            sa.Column("lga", sa.String(100)),
+            sa.Column("federal_inec_ward", sa.String(100)),
+            sa.Column("other_ward", sa.String(100)),
+            sa.Column("facility_name", sa.String(200)),
+            sa.Column("facility_uid", sa.String(50)),
+            sa.Column("assessment_type", sa.String(50)),
+            sa.Column("has_health_workers", sa.String(10)),
+            sa.Column("facility_condition", sa.String(100)),
+            sa.Column("ownership_type", sa.String(50)),
+            sa.Column("ownership_specify", sa.String(200)),
+            sa.Column("latitude", sa.Float()),
+            sa.Column("longitude", sa.Float()),
+            sa.Column("altitude", sa.Float()),
+            sa.Column("accuracy", sa.Float()),
+            sa.Column("facility_image_path", sa.String(500)),
+            sa.Column("oic_first_name", sa.String(100)),
+            sa.Column("oic_last_name", sa.String(100)),
+            sa.Column("oic_gender", sa.String(10)),
+            sa.Column("oic_phone", sa.String(20)),
+            sa.Column("oic_email", sa.String(200)),
+            sa.Column("oic_signatory", sa.String(10)),
+            sa.Column("signatory_name", sa.String(200)),
+            sa.Column("cheque_domicile", sa.String(10)),
+            sa.Column("cheque_holder", sa.String(200)),
+            sa.Column("opening_time", sa.String(10)),
+            sa.Column("closing_time", sa.String(10)),
+            sa.Column("funding_data", sa.JSON()),
+            sa.Column("impact_funding_data", sa.JSON()),
+            sa.Column("infrastructure_data", sa.JSON()),
+            sa.Column("human_resources_data", sa.JSON()),
+            sa.Column("services_data", sa.JSON()),
+            sa.Column("commodities_data", sa.JSON()),
+            sa.Column("satisfaction_survey_data", sa.JSON()),
+            sa.Column("financial_validation_data", sa.JSON()),
+            sa.Column("issues", sa.Text()),
+            sa.Column("comments", sa.Text()),
+            sa.Column("facility_selfie_path", sa.String(500)),
+            sa.Column("submission_status", sa.String(20)),
+            sa.Column("sync_status", sa.String(20)),
+            sa.Column("is_synced", sa.Boolean()),
+            sa.Column("raw_submission_data", sa.JSON()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+            sa.Column("synced_at", sa.DateTime()),
+        )
+        op.create_index("ix_form_submissions_id", "form_submissions", ["id"])
+
+
+def downgrade():
+    op.drop_table("form_submissions")
+    op.drop_table("forms")
+    op.drop_table("users")
+    sa.Enum(name="userrole").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,35 @@
+"""Add client_submission_id idempotency key to form_submissions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c["name"] for c in sa.inspect(
+        op.get_bind()).get_columns("form_submissions")}
+    if "client_submission_id" in columns:
+        return
+
+    op.add_column("form_submissions",
+                  sa.Column("client_submission_id", sa.String(64)))
+    op.create_index("ix_form_submissions_client_submission_id",
+                    "form_submissions", ["client_submission_id"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_form_submissions_client_submission_id",
+                  table_name="form_submissions")
+    with op.batch_alter_table("form_submissions") as batch_op:
+        batch_op.drop_column("client_submission_id")
@@ -0,0 +1,47 @@
+"""Composite indexes for the form_submissions query paths
+
+- (created_at, id): GET /submissions keyset pagination, dashboard recent activity
+- (collector_id, created_at, id): the same list scoped to a data collector
+- (state, lga): state/LGA filters and dashboard grouping
+- (sync_status, is_synced): /stats, dashboard sync counts, fix-sync-status
+
+On PostgreSQL the indexes are built CONCURRENTLY so writes are not blocked.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_form_submissions_created_at_id", ["created_at", "id"]),
+    ("ix_form_submissions_collector_created_at_id",
+     ["collector_id", "created_at", "id"]),
+    ("ix_form_submissions_state_lga", ["state", "lga"]),
+    ("ix_form_submissions_sync_status_is_synced", ["sync_status", "is_synced"]),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, "form_submissions", columns,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, "form_submissions", columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="form_submissions", if_exists=True)
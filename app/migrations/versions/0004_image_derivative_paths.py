@@ -0,0 +1,38 @@
+"""Add resized image derivative paths to form_submissions
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    "facility_image_thumbnail_path",
+    "facility_image_medium_path",
+    "facility_selfie_thumbnail_path",
+    "facility_selfie_medium_path",
+]
+
+
+def upgrade():
+    existing = {c["name"] for c in sa.inspect(
+        op.get_bind()).get_columns("form_submissions")}
+    with op.batch_alter_table("form_submissions") as batch_op:
+        for name in COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, sa.String(500)))
+
+
+def downgrade():
+    with op.batch_alter_table("form_submissions") as batch_op:
+        for name in reversed(COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,40 @@
+"""Move raw submission payloads into the submission_raw_data side table
+
+New rows store raw data only per RAW_SUBMISSION_MODE, outside the main
+row. The legacy form_submissions.raw_submission_data column is kept for
+existing rows but is no longer written or loaded by default.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "submission_raw_data" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "submission_raw_data",
+        sa.Column("submission_id", sa.Integer(),
+                  sa.ForeignKey("form_submissions.id", ondelete="CASCADE"),
+                  primary_key=True),
+        sa.Column("mode", sa.String(10), nullable=False),
+        sa.Column("data", sa.JSON()),
+        sa.Column("compressed_data", sa.LargeBinary()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("submission_raw_data")
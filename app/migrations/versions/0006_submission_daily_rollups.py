@@ -0,0 +1,55 @@
+"""Add submission_daily_rollups and fill it from form_submissions
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "submission_daily_rollups" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    rollups = op.create_table(
+        "submission_daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("state", sa.String(100), primary_key=True),
+        sa.Column("lga", sa.String(100), primary_key=True),
+        sa.Column("sync_status", sa.String(20), primary_key=True),
+        sa.Column("is_synced", sa.Boolean(), primary_key=True),
+        sa.Column("submission_count", sa.Integer(), nullable=False),
+    )
+
+    submissions = sa.table(
+        "form_submissions",
+        sa.column("id"), sa.column("created_at"), sa.column("state"),
+        sa.column("lga"), sa.column("sync_status"),
+        sa.column("is_synced", sa.Boolean()),
+    )
+    dimensions = [
+        sa.func.date(submissions.c.created_at),
+        sa.func.coalesce(submissions.c.state, ""),
+        sa.func.coalesce(submissions.c.lga, ""),
+        sa.func.coalesce(submissions.c.sync_status, ""),
+        sa.func.coalesce(submissions.c.is_synced, sa.false()),
+    ]
+    op.execute(rollups.insert().from_select(
+        ["day", "state", "lga", "sync_status", "is_synced", "submission_count"],
+        sa.select(*dimensions, sa.func.count(submissions.c.id))
+        .where(submissions.c.created_at.isnot(None))
+        .group_by(*dimensions)
+    ))
+
+
+def downgrade():
+    op.drop_table("submission_daily_rollups")
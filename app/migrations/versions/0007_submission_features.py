@@ -0,0 +1,63 @@
+"""Add derived feature columns to form_submissions
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+
+The columns are filled by app.services.submission_features.backfill_features,
+which runs at startup for rows that have not been computed yet.
+
+Only the numeric columns are indexed; the boolean flags are only ever
+aggregated. On PostgreSQL the indexes are built CONCURRENTLY (see 0003).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ("has_power", sa.Boolean()),
+    ("has_water", sa.Boolean()),
+    ("has_bhcpf", sa.Boolean()),
+    ("has_impact_funding", sa.Boolean()),
+    ("total_staff", sa.Integer()),
+    ("total_patients", sa.Integer()),
+    ("avg_satisfaction", sa.Float()),
+    ("funding_amount", sa.Float()),
+]
+INDEXED = ["total_staff", "total_patients", "avg_satisfaction", "funding_amount"]
+
+
+def upgrade():
+    existing = {c["name"] for c in sa.inspect(
+        op.get_bind()).get_columns("form_submissions")}
+    with op.batch_alter_table("form_submissions") as batch_op:
+        for name, type_ in COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, type_))
+
+    if op.get_bind().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name in INDEXED:
+                op.create_index(f"ix_form_submissions_{name}", "form_submissions", [name],
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name in INDEXED:
+            op.create_index(f"ix_form_submissions_{name}", "form_submissions", [name],
+                            if_not_exists=True)
+
+
+def downgrade():
+    # the flag indexes exist again if 0017 was downgraded
+    for name, _ in reversed(COLUMNS):
+        op.drop_index(f"ix_form_submissions_{name}", table_name="form_submissions",
+                      if_exists=True)
+    with op.batch_alter_table("form_submissions") as batch_op:
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,32 @@
+"""Add data_versions for response cache invalidation
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "data_versions" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    data_versions = op.create_table(
+        "data_versions",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.bulk_insert(data_versions, [{"name": "submissions", "version": 1}])
+
+
+def downgrade():
+    op.drop_table("data_versions")
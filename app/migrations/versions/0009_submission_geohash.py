@@ -0,0 +1,42 @@
+"""Add an indexed geohash column to form_submissions
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16
+
+The column is filled by app.services.geo_service.backfill_geohashes,
+which runs at startup for rows with coordinates but no geohash. On
+PostgreSQL the index is built CONCURRENTLY (see 0003).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {c["name"] for c in sa.inspect(
+        op.get_bind()).get_columns("form_submissions")}
+    if "geohash" not in existing:
+        with op.batch_alter_table("form_submissions") as batch_op:
+            batch_op.add_column(sa.Column("geohash", sa.String(12)))
+    if op.get_bind().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            op.create_index("ix_form_submissions_geohash", "form_submissions", ["geohash"],
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index("ix_form_submissions_geohash", "form_submissions", ["geohash"],
+                        if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_form_submissions_geohash", table_name="form_submissions",
+                  if_exists=True)
+    with op.batch_alter_table("form_submissions") as batch_op:
+        batch_op.drop_column("geohash")
@@ -0,0 +1,84 @@
+"""Add geopolitical zone and collector to submission_daily_rollups
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16
+
+Both columns join the primary key, so the table is recreated and refilled
+from form_submissions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+BASE_COLUMNS = ["day", "state", "lga", "sync_status", "is_synced"]
+
+
+def _create_rollups(with_zone_collector):
+    columns = [
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("state", sa.String(100), primary_key=True),
+        sa.Column("lga", sa.String(100), primary_key=True),
+        sa.Column("sync_status", sa.String(20), primary_key=True),
+        sa.Column("is_synced", sa.Boolean(), primary_key=True),
+    ]
+    if with_zone_collector:
+        columns += [
+            sa.Column("geopolitical_zone", sa.String(50), primary_key=True),
+            sa.Column("collector_id", sa.Integer(), primary_key=True),
+        ]
+    return op.create_table(
+        "submission_daily_rollups",
+        *columns,
+        sa.Column("submission_count", sa.Integer(), nullable=False),
+    )
+
+
+def _fill_rollups(rollups, with_zone_collector):
+    submissions = sa.table(
+        "form_submissions",
+        sa.column("id"), sa.column("created_at"), sa.column("state"),
+        sa.column("lga"), sa.column("sync_status"),
+        sa.column("is_synced", sa.Boolean()), sa.column("geopolitical_zone"),
+        sa.column("collector_id"),
+    )
+    dimensions = [
+        sa.func.date(submissions.c.created_at),
+        sa.func.coalesce(submissions.c.state, ""),
+        sa.func.coalesce(submissions.c.lga, ""),
+        sa.func.coalesce(submissions.c.sync_status, ""),
+        sa.func.coalesce(submissions.c.is_synced, sa.false()),
+    ]
+    names = list(BASE_COLUMNS)
+    if with_zone_collector:
+        dimensions += [
+            sa.func.coalesce(submissions.c.geopolitical_zone, ""),
+            submissions.c.collector_id,
+        ]
+        names += ["geopolitical_zone", "collector_id"]
+    op.execute(rollups.insert().from_select(
+        names + ["submission_count"],
+        sa.select(*dimensions, sa.func.count(submissions.c.id))
+        .where(submissions.c.created_at.isnot(None))
+        .group_by(*dimensions)
+    ))
+
+
+def upgrade():
+    existing = {c["name"] for c in sa.inspect(
+        op.get_bind()).get_columns("submission_daily_rollups")}
+    if "collector_id" in existing:
+        return
+    op.drop_table("submission_daily_rollups")
+    _fill_rollups(_create_rollups(True), True)
+
+
+def downgrade():
+    op.drop_table("submission_daily_rollups")
+    _fill_rollups(_create_rollups(False), False)
@@ -0,0 +1,37 @@
+"""Add submission_insights to store computed AI insights
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16
+
+Rows are filled lazily by app.services.insight_service on first read.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "submission_insights" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "submission_insights",
+        sa.Column("submission_id", sa.Integer(),
+                  sa.ForeignKey("form_submissions.id", ondelete="CASCADE"),
+                  primary_key=True),
+        sa.Column("source_updated_at", sa.DateTime()),
+        sa.Column("ruleset_version", sa.Integer(), nullable=False),
+        sa.Column("insights", sa.JSON(), nullable=False),
+        sa.Column("computed_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("submission_insights")
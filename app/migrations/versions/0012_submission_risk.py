@@ -0,0 +1,56 @@
+"""Add stored risk assessment columns to form_submissions
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-16
+
+The columns are filled by app.services.risk_service.backfill_risk,
+which runs at startup for rows that have not been assessed yet. On
+PostgreSQL the indexes are built CONCURRENTLY (see 0003).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ("risk_priority", sa.String(10)),
+    ("risk_score", sa.Integer()),
+    ("anomaly_count", sa.Integer()),
+]
+INDEXES = [
+    ("ix_form_submissions_risk_score_id", ["risk_score", "id"]),
+    ("ix_form_submissions_state_risk_score_id", ["state", "risk_score", "id"]),
+]
+
+
+def upgrade():
+    existing = {c["name"] for c in sa.inspect(
+        op.get_bind()).get_columns("form_submissions")}
+    with op.batch_alter_table("form_submissions") as batch_op:
+        for name, type_ in COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, type_))
+
+    if op.get_bind().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, "form_submissions", columns,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, "form_submissions", columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="form_submissions", if_exists=True)
+    with op.batch_alter_table("form_submissions") as batch_op:
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
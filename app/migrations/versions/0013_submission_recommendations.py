@@ -0,0 +1,39 @@
+"""Add submission_recommendations with stored AI recommendation codes
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-16
+
+The rows are written by app.services.risk_service together with the risk
+columns. Existing risk assessments are cleared so the startup backfill
+reassesses every submission and fills the new table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "submission_recommendations" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "submission_recommendations",
+            sa.Column("submission_id", sa.Integer(),
+                      sa.ForeignKey("form_submissions.id", ondelete="CASCADE"),
+                      primary_key=True),
+            sa.Column("code", sa.String(50), primary_key=True),
+        )
+    op.create_index("ix_submission_recommendations_code_submission_id",
+                    "submission_recommendations", ["code", "submission_id"],
+                    if_not_exists=True)
+
+    op.execute("UPDATE form_submissions SET risk_score = NULL")
+
+
+def downgrade():
+    op.drop_table("submission_recommendations")
@@ -0,0 +1,37 @@
+"""Compare form_submissions.geohash bytewise on PostgreSQL
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-16
+
+Bbox filtering matches geohash prefixes with ranges
+[prefix, prefix || '{'), which only hold when '{' sorts after every
+geohash character. Under a linguistic collation (e.g. en_US.UTF-8) it does
+not, so the column is switched to the "C" collation; PostgreSQL rebuilds
+ix_form_submissions_geohash as part of the ALTER. SQLite already compares
+text bytewise (BINARY), so nothing changes there.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.alter_column("form_submissions", "geohash",
+                        type_=sa.String(12, collation="C"),
+                        existing_type=sa.String(12), existing_nullable=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.alter_column("form_submissions", "geohash",
+                        type_=sa.String(12, collation="default"),
+                        existing_type=sa.String(12, collation="C"),
+                        existing_nullable=True)
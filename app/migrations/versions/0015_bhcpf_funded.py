@@ -0,0 +1,41 @@
+"""Add bhcpf_funded: BHCPF as the AI funding rule defines it
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-16
+
+has_bhcpf goes back to the detailed analytics definition (bhcpf_received
+== "Yes" or has_bhcpf), and the AI rule's definition (bhcpf_status ==
+"Received" or has_bhcpf) gets its own column. Both are filled by
+app.services.submission_features.backfill_features, which recomputes every
+row whose bhcpf_funded is NULL at startup. risk_score is cleared so
+app.services.risk_service.backfill_risk reassesses every row with the
+funding rule as it was before the features were stored.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {c["name"] for c in sa.inspect(
+        op.get_bind()).get_columns("form_submissions")}
+    if "bhcpf_funded" not in existing:
+        with op.batch_alter_table("form_submissions") as batch_op:
+            batch_op.add_column(sa.Column("bhcpf_funded", sa.Boolean()))
+
+    op.execute(sa.text("UPDATE form_submissions SET risk_score = NULL"))
+
+
+def downgrade():
+    # restored by 0017's downgrade
+    op.drop_index("ix_form_submissions_bhcpf_funded",
+                  table_name="form_submissions", if_exists=True)
+    with op.batch_alter_table("form_submissions") as batch_op:
+        batch_op.drop_column("bhcpf_funded")
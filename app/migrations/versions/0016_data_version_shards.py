@@ -0,0 +1,64 @@
+"""Spread data_versions over shard rows
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-16
+
+Every submission write used to bump the single data_versions row, so on
+PostgreSQL all writers waited on its row lock. The primary key becomes
+(name, shard) and each version gets 16 rows
+(app.services.data_version_service.VERSION_SHARDS); the version is their
+sum. The existing row becomes shard 0 with its value, so versions keep
+increasing from where they were. The table is rebuilt rather than altered,
+since SQLite cannot change a primary key in place.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+SHARDS = 16
+
+
+def _rebuild(sharded: bool):
+    """Recreate data_versions with or without the shard key, keeping totals"""
+    old = sa.table("data_versions", sa.column("name", sa.String),
+                   sa.column("version", sa.Integer))
+    totals = op.get_bind().execute(
+        sa.select(old.c.name, sa.func.sum(old.c.version)).group_by(old.c.name)
+    ).all()
+
+    columns = [sa.Column("name", sa.String(50), nullable=False),
+               sa.Column("version", sa.Integer(), nullable=False)]
+    if sharded:
+        columns.insert(1, sa.Column("shard", sa.Integer(), nullable=False))
+        key = sa.PrimaryKeyConstraint("name", "shard", name="pk_data_versions")
+    else:
+        key = sa.PrimaryKeyConstraint("name", name="data_versions_pkey")
+    new = op.create_table("data_versions_new", *columns, key)
+
+    if sharded:
+        rows = [{"name": name, "shard": shard, "version": total if shard == 0 else 0}
+                for name, total in totals for shard in range(SHARDS)]
+    else:
+        rows = [{"name": name, "version": total} for name, total in totals]
+    if rows:
+        op.bulk_insert(new, rows)
+
+    op.drop_table("data_versions")
+    op.rename_table("data_versions_new", "data_versions")
+
+
+def upgrade():
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("data_versions")}
+    if "shard" not in columns:
+        _rebuild(sharded=True)
+
+
+def downgrade():
+    _rebuild(sharded=False)
@@ -0,0 +1,47 @@
+"""Drop the indexes on the boolean feature columns
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-16
+
+has_power, has_water, has_bhcpf, bhcpf_funded and has_impact_funding
+are only aggregated, never used to select rows, so their indexes cost
+every write without serving a query. Databases migrated before 0007 and
+0015 stopped creating them still have them. On PostgreSQL they are
+dropped CONCURRENTLY so writes are not blocked.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ["has_power", "has_water", "has_bhcpf", "bhcpf_funded", "has_impact_funding"]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        # DROP INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name in COLUMNS:
+                op.drop_index(f"ix_form_submissions_{name}", table_name="form_submissions",
+                              postgresql_concurrently=True, if_exists=True)
+    else:
+        for name in COLUMNS:
+            op.drop_index(f"ix_form_submissions_{name}", table_name="form_submissions",
+                          if_exists=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name in COLUMNS:
+                op.create_index(f"ix_form_submissions_{name}", "form_submissions", [name],
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name in COLUMNS:
+            op.create_index(f"ix_form_submissions_{name}", "form_submissions", [name],
+                            if_not_exists=True)
@@ -1,5 +1,11 @@
 from app.models.user import User
 from app.models.form import Form
-from app.models.submission import FormSubmission
+from app.models.submission import FormSubmission, SubmissionRawData
+from app.models.rollup import SubmissionDailyRollup
+from app.models.data_version import DataVersion
+from app.models.insight import SubmissionInsight
+from app.models.recommendation import SubmissionRecommendation
 
-__all__ = ["User", "Form", "FormSubmission"]
+__all__ = ["User", "Form", "FormSubmission",
+           "SubmissionRawData", "SubmissionDailyRollup", "DataVersion",
+           "SubmissionInsight", "SubmissionRecommendation"]
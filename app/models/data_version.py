@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class DataVersion(Base):
+    """
+    Monotonic counters bumped in the same transaction as the writes they
+    track (app/services/data_version_service.py). Cached responses are keyed
+    on them, so a new version makes every older cache entry unreachable.
+    A counter's value is the sum of its shard rows.
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DataVersion(name={self.name}, shard={self.shard}, version={self.version})>"
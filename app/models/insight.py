@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, DateTime, JSON, ForeignKey
+from app.database import Base
+from datetime import datetime
+
+
+class SubmissionInsight(Base):
+    """
+    Stored /ai/submission/{id}/insights document
+    (app/services/insight_service.py). It is current while the submission's
+    updated_at and the AI ruleset version still match the ones it was
+    computed from; otherwise it is recomputed on the next read.
+    """
+    __tablename__ = "submission_insights"
+
+    submission_id = Column(Integer, ForeignKey(
+        "form_submissions.id", ondelete="CASCADE"), primary_key=True)
+    source_updated_at = Column(DateTime)
+    ruleset_version = Column(Integer, nullable=False)
+    insights = Column(JSON, nullable=False)
+
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SubmissionInsight(submission_id={self.submission_id}, ruleset={self.ruleset_version})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database import Base
+
+
+class SubmissionRecommendation(Base):
+    """
+    One AI recommendation for a submission, as a stable code
+    (ai_service.RECOMMENDATION_CODES). Maintained with the stored risk
+    assessment on every write (app/services/risk_service.py) so
+    recommendations can be counted with GROUP BY code.
+    """
+    __tablename__ = "submission_recommendations"
+    __table_args__ = (
+        # Drill-down: WHERE code = ? ORDER BY submission_id
+        Index("ix_submission_recommendations_code_submission_id",
+              "code", "submission_id"),
+    )
+
+    submission_id = Column(Integer, ForeignKey(
+        "form_submissions.id", ondelete="CASCADE"), primary_key=True)
+    code = Column(String(50), primary_key=True)
+
+    def __repr__(self):
+        return f"<SubmissionRecommendation(submission_id={self.submission_id}, code={self.code})>"
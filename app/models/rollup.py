@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Date, Boolean
+from app.database import Base
+
+
+class SubmissionDailyRollup(Base):
+    """
+    Pre-aggregated submission counts, maintained on every submission write
+    (app/services/rollup_service.py). NULL dimensions are stored as "" so
+    they can be part of the primary key.
+    """
+    __tablename__ = "submission_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    state = Column(String(100), primary_key=True, default="")
+    lga = Column(String(100), primary_key=True, default="")
+    sync_status = Column(String(20), primary_key=True, default="")
+    is_synced = Column(Boolean, primary_key=True, default=False)
+    geopolitical_zone = Column(String(50), primary_key=True, default="")
+    collector_id = Column(Integer, primary_key=True)
+
+    submission_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SubmissionDailyRollup(day={self.day}, state={self.state}, lga={self.lga}, count={self.submission_count})>"
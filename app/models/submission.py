@@ -1,16 +1,34 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text, ForeignKey, Boolean, Index, LargeBinary
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 from datetime import datetime
+import json
+import zlib
 
 
 class FormSubmission(Base):
     __tablename__ = "form_submissions"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_form_submissions_created_at_id", "created_at", "id"),
+        Index("ix_form_submissions_collector_created_at_id",
+              "collector_id", "created_at", "id"),
+        Index("ix_form_submissions_state_lga", "state", "lga"),
+        Index("ix_form_submissions_sync_status_is_synced",
+              "sync_status", "is_synced"),
+        # At-risk listing: ORDER BY risk_score DESC, id DESC (optionally per state)
+        Index("ix_form_submissions_risk_score_id", "risk_score", "id"),
+        Index("ix_form_submissions_state_risk_score_id",
+              "state", "risk_score", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     form_id = Column(Integer, ForeignKey("forms.id"))
     collector_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
+    # Client-generated UUID so retried submits are not stored twice
+    client_submission_id = Column(String(64), unique=True, index=True)
+
     # PFMO Identification Section 1
     pfmo_name = Column(String(200))
     pfmo_phone = Column(String(20))
@@ -34,9 +52,16 @@ class FormSubmission(Base):
     longitude = Column(Float)
     altitude = Column(Float)
     accuracy = Column(Float)
+    # Derived from latitude/longitude on write (app/services/geo_service.py).
+    # Bytewise collation on PostgreSQL so geohash prefix ranges hold
+    geohash = Column(String(12).with_variant(String(12, collation="C"), "postgresql"),
+                     index=True)
 
     # File uploads
     facility_image_path = Column(String(500))
+    # Resized derivatives generated after upload (see app/services/image_service.py)
+    facility_image_thumbnail_path = Column(String(500))
+    facility_image_medium_path = Column(String(500))
 
     # Officer-in-Charge (OIC) Information Section 3
     oic_first_name = Column(String(100))
@@ -78,6 +103,8 @@ class FormSubmission(Base):
     issues = Column(Text)
     comments = Column(Text)
     facility_selfie_path = Column(String(500))
+    facility_selfie_thumbnail_path = Column(String(500))
+    facility_selfie_medium_path = Column(String(500))
 
     # Metadata
     # pending, synced, failed
@@ -86,8 +113,29 @@ class FormSubmission(Base):
     sync_status = Column(String(20), default="pending")
     is_synced = Column(Boolean, default=False)
 
-    # Raw submission data (for debugging and data integrity)
-    raw_submission_data = Column(JSON)
+    # Derived from the JSON sections on every write
+    # (see app/services/submission_features.py)
+    # (the flags are only aggregated, so only the numbers are indexed)
+    has_power = Column(Boolean)
+    has_water = Column(Boolean)
+    has_bhcpf = Column(Boolean)
+    # BHCPF as the AI funding rule defines it (bhcpf_status / has_bhcpf)
+    bhcpf_funded = Column(Boolean)
+    has_impact_funding = Column(Boolean)
+    total_staff = Column(Integer, index=True)
+    total_patients = Column(Integer, index=True)
+    avg_satisfaction = Column(Float, index=True)
+    funding_amount = Column(Float, index=True)
+
+    # AI risk assessment, maintained on every write
+    # (see app/services/risk_service.py); risk_score is 0 when not at risk
+    risk_priority = Column(String(10))
+    risk_score = Column(Integer)
+    anomaly_count = Column(Integer)
+
+    # Legacy full copy of the payload; new rows keep raw data in
+    # submission_raw_data instead. Deferred so normal reads never load it.
+    raw_submission_data = deferred(Column(JSON))
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow,
@@ -97,6 +145,15 @@ class FormSubmission(Base):
     # Relationships
     form = relationship("Form", back_populates="submissions")
     collector = relationship("User", back_populates="submissions")
+    # Only loaded on demand (GET /submissions/{id}/raw)
+    raw_data = relationship("SubmissionRawData", uselist=False,
+                            cascade="all, delete-orphan")
+    # Stored AI insights (app/services/insight_service.py)
+    insight = relationship("SubmissionInsight", uselist=False,
+                           cascade="all, delete-orphan")
+    # Stored recommendation codes (app/services/risk_service.py)
+    recommendations = relationship("SubmissionRecommendation",
+                                   cascade="all, delete-orphan")
 
     def to_dict(self):
         """Convert submission to dictionary with all fields for AI analysis"""
@@ -104,6 +161,7 @@ class FormSubmission(Base):
             "id": self.id,
             "form_id": self.form_id,
             "collector_id": self.collector_id,
+            "client_submission_id": self.client_submission_id,
             "pfmo_name": self.pfmo_name,
             "pfmo_phone": self.pfmo_phone,
             "geopolitical_zone": self.geopolitical_zone,
@@ -135,6 +193,18 @@ class FormSubmission(Base):
             "commodities_data": self.commodities_data,
             "satisfaction_survey_data": self.satisfaction_survey_data,
             "financial_validation_data": self.financial_validation_data,
+            "has_power": self.has_power,
+            "has_water": self.has_water,
+            "has_bhcpf": self.has_bhcpf,
+            "bhcpf_funded": self.bhcpf_funded,
+            "has_impact_funding": self.has_impact_funding,
+            "total_staff": self.total_staff,
+            "total_patients": self.total_patients,
+            "avg_satisfaction": self.avg_satisfaction,
+            "funding_amount": self.funding_amount,
+            "risk_priority": self.risk_priority,
+            "risk_score": self.risk_score,
+            "anomaly_count": self.anomaly_count,
             "issues": self.issues,
             "comments": self.comments,
             "submission_status": self.submission_status,
@@ -145,3 +215,34 @@ class FormSubmission(Base):
 
     def __repr__(self):
         return f"<FormSubmission(id={self.id}, facility={self.facility_name}, status={self.sync_status})>"
+
+
+class SubmissionRawData(Base):
+    """Raw submission payload kept outside form_submissions (see RAW_SUBMISSION_MODE)"""
+    __tablename__ = "submission_raw_data"
+
+    submission_id = Column(Integer, ForeignKey(
+        "form_submissions.id", ondelete="CASCADE"), primary_key=True)
+    # full: whole payload, diff: only keys with no matching column
+    mode = Column(String(10), nullable=False)
+    # Exactly one of these is set
+    data = Column(JSON)
+    compressed_data = Column(LargeBinary)  # zlib-compressed JSON
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def from_payload(cls, payload: dict, mode: str, compress: bool) -> "SubmissionRawData":
+        if compress:
+            encoded = json.dumps(payload, separators=(",", ":")).encode()
+            return cls(mode=mode, compressed_data=zlib.compress(encoded))
+        return cls(mode=mode, data=payload)
+
+    @property
+    def payload(self) -> dict:
+        if self.compressed_data is not None:
+            return json.loads(zlib.decompress(self.compressed_data))
+        return self.data
+
+    def __repr__(self):
+        return f"<SubmissionRawData(submission_id={self.submission_id}, mode={self.mode})>"
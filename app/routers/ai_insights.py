@@ -3,18 +3,34 @@ AI Insights API endpoints
 Provides AI-powered analysis and recommendations
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import desc, func, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 
+from app.core.cache import cached_json_response
+from app.core.pagination import decode_cursor, encode_cursor
 from app.database import get_db
+from app.models.recommendation import SubmissionRecommendation
 from app.models.submission import FormSubmission
 from app.routers.auth import get_current_active_admin, get_current_user
-from app.services.ai_service import ai_service
+from app.services.ai_service import (
+    RECOMMENDATION_CATEGORIES, RECOMMENDATION_CODES, ai_service, load_facility_batch,
+    recommendation_category
+)
+from app.services.data_version_service import get_data_version
+from app.services.insight_service import load_submission_insights
 
 router = APIRouter()
 
+MAX_AT_RISK_PAGE = 500
+MAX_FACILITY_ID_PAGE = 1000
+
+RECOMMENDATION_TEXTS = {code: text for text, code in RECOMMENDATION_CODES.items()}
+# The needs rules only produce these, so each is categorized once
+CATEGORY_BY_TEXT = {text: recommendation_category(text) for text in RECOMMENDATION_CODES}
+
 
 class TextAnalysisRequest(BaseModel):
     text: str
@@ -26,127 +42,219 @@ def get_submission_insights(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    """Get AI-powered insights for a specific submission"""
-    submission = db.query(FormSubmission).filter(
-        FormSubmission.id == submission_id).first()
-
-    if not submission:
+    """Get AI-powered insights for a specific submission (stored, see insight_service)"""
+    insights = load_submission_insights(db, submission_id)
+    if insights is None:
         raise HTTPException(status_code=404, detail="Submission not found")
-
-    # Convert submission to dict
-    submission_dict = submission.to_dict()
-
-    # Get AI insights
-    insights = {
-        "submission_id": submission_id,
-        "facility_name": submission.facility_name,
-        "ai_analysis": {
-            "issues_analysis": ai_service.analyze_issues_and_comments(
-                submission.issues or "",
-                submission.comments or ""
-            ),
-            "satisfaction_analysis": ai_service.analyze_patient_satisfaction(
-                submission.satisfaction_survey_data or {}
-            ),
-            "predictions": ai_service.predict_facility_needs(submission_dict),
-            "anomalies": ai_service.detect_data_anomalies(submission_dict),
-            "summary": ai_service.generate_insights_summary(submission_dict)
-        }
-    }
-
     return insights
 
 
 @router.get("/facilities/at-risk")
 def get_at_risk_facilities(
+    request: Request,
+    limit: int = Query(50, ge=1, le=MAX_AT_RISK_PAGE),
+    cursor: Optional[str] = None,
+    state: Optional[str] = None,
+    lga: Optional[str] = None,
+    zone: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_admin)
 ):
-    """Identify facilities at risk based on AI analysis"""
-    submissions = db.query(FormSubmission).all()
-
-    at_risk_facilities = []
-
-    for submission in submissions:
-        submission_dict = submission.to_dict()
-        predictions = ai_service.predict_facility_needs(submission_dict)
-        anomalies = ai_service.detect_data_anomalies(submission_dict)
-
-        if predictions["priority_level"] == "high" or len(anomalies) > 0:
-            at_risk_facilities.append({
-                "id": submission.id,
-                "facility_name": submission.facility_name,
-                "state": submission.state,
-                "lga": submission.lga,
-                "condition": submission.facility_condition,
-                "priority": predictions["priority_level"],
-                "risk_factors": predictions["risk_factors"],
-                "predicted_needs": predictions["predicted_needs"],
-                "anomalies_count": len(anomalies)
-            })
+    """
+    Identify facilities at risk based on AI analysis, highest risk first.
+    Scores are stored on each submission (see risk_service), so a page is
+    read straight from the risk_score index. Pass `next_cursor` back as
+    `cursor` to fetch the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            score, last_id = decode_cursor(cursor, 2)
+            after = (int(score), int(last_id))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    criteria = [FormSubmission.risk_score > 0]
+    if state:
+        criteria.append(FormSubmission.state == state)
+    if lga:
+        criteria.append(FormSubmission.lga == lga)
+    if zone:
+        criteria.append(FormSubmission.geopolitical_zone == zone)
 
-    # Sort by priority
-    at_risk_facilities.sort(key=lambda x: 0 if x["priority"] == "high" else 1)
+    return cached_json_response(
+        request, ("ai.at_risk", state, lga, zone, limit, after), get_data_version(db),
+        lambda: _build_at_risk(db, criteria, limit, after)
+    )
+
+
+def _build_at_risk(db: Session, criteria, limit: int,
+                   after: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    S = FormSubmission
+    total = db.query(func.count(S.id)).filter(*criteria).scalar()
+
+    query = db.query(S.id, S.risk_priority, S.risk_score, S.anomaly_count).filter(*criteria)
+    if after:
+        query = query.filter(tuple_(S.risk_score, S.id) < tuple_(*after))
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(desc(S.risk_score), desc(S.id)).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].risk_score, rows[-1].id)
+
+    # Risk factors and needs for just this page, with the batch rules
+    batch = load_facility_batch(db, S.id.in_([row.id for row in rows]))
+    position = {int(id_): i for i, id_ in enumerate(batch.id)}
+    all_predictions = ai_service.predict_facility_needs_batch(batch)
+
+    facilities = []
+    for row in rows:
+        i = position[row.id]
+        predictions = all_predictions[i]
+        facilities.append({
+            "id": row.id,
+            "facility_name": batch.facility_name[i],
+            "state": batch.state[i],
+            "lga": batch.lga[i],
+            "condition": batch.facility_condition[i],
+            "priority": row.risk_priority,
+            "risk_score": row.risk_score,
+            "risk_factors": predictions["risk_factors"],
+            "predicted_needs": predictions["predicted_needs"],
+            "anomalies_count": row.anomaly_count
+        })
 
     return {
-        "total_at_risk": len(at_risk_facilities),
-        "facilities": at_risk_facilities
+        "total_at_risk": total,
+        "facilities": facilities,
+        "next_cursor": next_cursor
     }
 
 
 @router.get("/recommendations")
 def get_ai_recommendations(
+    request: Request,
     state: str = None,
+    view: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_admin)
 ):
-    """Get AI-generated recommendations based on all submissions"""
-    query = db.query(FormSubmission)
-    if state:
-        query = query.filter(FormSubmission.state == state)
+    """
+    Get AI-generated recommendations based on all submissions.
+    `view=aggregate` returns each distinct recommendation once, with its
+    category, facility count and count per state, counted from the stored
+    recommendation codes; list its facilities with
+    /recommendations/{code}/facilities.
+    """
+    if view not in (None, "aggregate"):
+        raise HTTPException(status_code=400, detail="view must be 'aggregate'")
+    build = _build_recommendation_summary if view else _build_recommendations
+    return cached_json_response(
+        request, ("ai.recommendations", state, view), get_data_version(db),
+        lambda: build(db, state)
+    )
 
-    submissions = query.all()
 
-    recommendations = {
-        "infrastructure": [],
-        "staffing": [],
-        "funding": [],
-        "general": []
-    }
+def _build_recommendations(db: Session, state: str = None) -> Dict[str, Any]:
+    criteria = [FormSubmission.state == state] if state else []
+    batch = load_facility_batch(db, *criteria)
 
-    for submission in submissions:
-        submission_dict = submission.to_dict()
-        predictions = ai_service.predict_facility_needs(submission_dict)
+    recommendations = {category: [] for category in RECOMMENDATION_CATEGORIES}
 
+    all_predictions = ai_service.predict_facility_needs_batch(batch)
+    for facility_name, facility_state, predictions in zip(
+            batch.facility_name, batch.state, all_predictions):
         for rec in predictions.get("recommendations", []):
-            if "infrastructure" in rec.lower() or "power" in rec.lower() or "water" in rec.lower():
-                recommendations["infrastructure"].append({
-                    "facility": submission.facility_name,
-                    "state": submission.state,
-                    "recommendation": rec
-                })
-            elif "staff" in rec.lower() or "worker" in rec.lower():
-                recommendations["staffing"].append({
-                    "facility": submission.facility_name,
-                    "state": submission.state,
-                    "recommendation": rec
-                })
-            elif "funding" in rec.lower() or "financial" in rec.lower():
-                recommendations["funding"].append({
-                    "facility": submission.facility_name,
-                    "state": submission.state,
-                    "recommendation": rec
-                })
-            else:
-                recommendations["general"].append({
-                    "facility": submission.facility_name,
-                    "state": submission.state,
-                    "recommendation": rec
-                })
+            category = CATEGORY_BY_TEXT.get(rec) or recommendation_category(rec)
+            recommendations[category].append({
+                "facility": facility_name,
+                "state": facility_state,
+                "recommendation": rec
+            })
 
     return recommendations
 
 
+def _build_recommendation_summary(db: Session, state: str = None) -> Dict[str, Any]:
+    R, S = SubmissionRecommendation, FormSubmission
+    query = db.query(R.code, S.state, func.count()).join(S, S.id == R.submission_id)
+    if state:
+        query = query.filter(S.state == state)
+
+    summary = {}
+    for code, facility_state, count in query.group_by(R.code, S.state):
+        text = RECOMMENDATION_TEXTS.get(code)
+        if text is None:
+            # Retired code on a row the ruleset backfill has not reached yet
+            continue
+        entry = summary.setdefault(code, {
+            "code": code,
+            "recommendation": text,
+            "category": CATEGORY_BY_TEXT[text],
+            "facility_count": 0,
+            "by_state": {}
+        })
+        entry["facility_count"] += count
+        key = facility_state or "Unknown"
+        entry["by_state"][key] = entry["by_state"].get(key, 0) + count
+
+    return {
+        "recommendations": sorted(
+            summary.values(), key=lambda e: (-e["facility_count"], e["code"]))
+    }
+
+
+@router.get("/recommendations/{code}/facilities")
+def get_recommendation_facilities(
+    code: str,
+    request: Request,
+    state: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_FACILITY_ID_PAGE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_active_admin)
+):
+    """
+    Submission ids of the facilities a recommendation applies to, in id
+    order. Pass `next_cursor` back as `cursor` to fetch the next page.
+    """
+    if code not in RECOMMENDATION_TEXTS:
+        raise HTTPException(status_code=404, detail="Unknown recommendation code")
+    last_id = 0
+    if cursor:
+        try:
+            last_id, = decode_cursor(cursor, 1)
+            last_id = int(last_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return cached_json_response(
+        request, ("ai.recommendation_facilities", code, state, limit, last_id),
+        get_data_version(db),
+        lambda: _build_recommendation_facilities(db, code, state, limit, last_id)
+    )
+
+
+def _build_recommendation_facilities(db: Session, code: str, state: Optional[str],
+                                     limit: int, last_id: int) -> Dict[str, Any]:
+    R, S = SubmissionRecommendation, FormSubmission
+    query = db.query(R.submission_id).filter(R.code == code, R.submission_id > last_id)
+    if state:
+        query = query.join(S, S.id == R.submission_id).filter(S.state == state)
+    # Fetch one extra row to know whether another page exists
+    ids = [row.submission_id for row in
+           query.order_by(R.submission_id).limit(limit + 1)]
+
+    next_cursor = None
+    if len(ids) > limit:
+        ids = ids[:limit]
+        next_cursor = encode_cursor(ids[-1])
+
+    return {"code": code, "facility_ids": ids, "next_cursor": next_cursor}
+
+
 @router.post("/analyze-text")
 def analyze_text(
     request: TextAnalysisRequest,
@@ -1,60 +1,96 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from sqlalchemy import func, desc, case
+from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta
 
+from app.core.cache import cached_json_response
+from app.core.config import settings
 from app.database import get_db
 from app.models.submission import FormSubmission
+from app.models.rollup import SubmissionDailyRollup
 from app.models.user import User
+from app.services.analytics_frame import build_detailed_analytics_frame
+from app.services.analytics_service import build_detailed_analytics
+from app.services.data_version_service import get_data_version
+from app.services.geo_service import (
+    POINTS_MIN_ZOOM, get_facility_clusters, parse_bbox, points_as_binary,
+    points_as_columns, points_as_objects, precision_for_zoom, query_facility_points
+)
+from app.services.rollup_service import rebuild_rollups
 from app.routers.auth import get_current_active_admin
 
 router = APIRouter()
 
 
+def _dimension(value: str):
+    """Rollup tables store NULL dimensions as "" """
+    return value or None
+
+
 @router.get("/overview")
 def get_dashboard_overview(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_admin)
 ):
-    """Get dashboard overview statistics"""
-
-    # Total submissions
-    total_submissions = db.query(func.count(FormSubmission.id)).scalar() or 0
-
-    # Synced vs pending
-    synced = db.query(func.count(FormSubmission.id)).filter(
-        FormSubmission.is_synced == True
-    ).scalar() or 0
-    pending = db.query(func.count(FormSubmission.id)).filter(
-        FormSubmission.sync_status == "pending"
-    ).scalar() or 0
-
-    # Submissions by state
-    submissions_by_state = db.query(
+    """Get dashboard overview statistics (read from submission_daily_rollups)"""
+    # The 30-day window moves daily, so the start date is part of the cache key
+    thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).date()
+    return cached_json_response(
+        request, ("dashboard.overview", thirty_days_ago), get_data_version(db),
+        lambda: _build_overview(db, thirty_days_ago)
+    )
+
+
+def _build_overview(db: Session, thirty_days_ago) -> Dict[str, Any]:
+    count = func.sum(SubmissionDailyRollup.submission_count)
+
+    # Totals, sync counts, states and LGAs all come from one grouped scan
+    # of the rollups, split up below
+    rollups = db.query(
+        SubmissionDailyRollup.state,
+        SubmissionDailyRollup.lga,
+        count.label('count'),
+        func.sum(case(
+            (SubmissionDailyRollup.is_synced == True,
+             SubmissionDailyRollup.submission_count),
+            else_=0)).label('synced'),
+        func.sum(case(
+            (SubmissionDailyRollup.sync_status == "pending",
+             SubmissionDailyRollup.submission_count),
+            else_=0)).label('pending')
+    ).group_by(SubmissionDailyRollup.state, SubmissionDailyRollup.lga).all()
+
+    total_submissions = synced = pending = 0
+    submissions_by_state = {}
+    submissions_by_lga = {}
+    for state, lga, row_count, row_synced, row_pending in rollups:
+        total_submissions += row_count
+        synced += row_synced or 0
+        pending += row_pending or 0
+        submissions_by_state[state] = submissions_by_state.get(state, 0) + row_count
+        submissions_by_lga[lga] = submissions_by_lga.get(lga, 0) + row_count
+
+    # Recent activity (only the columns returned)
+    recent_submissions = db.query(
+        FormSubmission.id,
+        FormSubmission.facility_name,
         FormSubmission.state,
-        func.count(FormSubmission.id).label('count')
-    ).group_by(FormSubmission.state).all()
-
-    # Submissions by LGA
-    submissions_by_lga = db.query(
-        FormSubmission.lga,
-        func.count(FormSubmission.id).label('count')
-    ).group_by(FormSubmission.lga).order_by(desc('count')).limit(10).all()
-
-    # Recent activity
-    recent_submissions = db.query(FormSubmission).order_by(
+        FormSubmission.created_at,
+        FormSubmission.sync_status
+    ).order_by(
         desc(FormSubmission.created_at)
     ).limit(10).all()
 
     # Submissions over time (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
     submissions_over_time = db.query(
-        func.date(FormSubmission.created_at).label('date'),
-        func.count(FormSubmission.id).label('count')
+        SubmissionDailyRollup.day,
+        count.label('count')
     ).filter(
-        FormSubmission.created_at >= thirty_days_ago
-    ).group_by(func.date(FormSubmission.created_at)).all()
+        SubmissionDailyRollup.day >= thirty_days_ago
+    ).group_by(SubmissionDailyRollup.day).order_by(SubmissionDailyRollup.day).all()
 
     return {
         "total_submissions": total_submissions,
@@ -62,22 +98,22 @@ def get_dashboard_overview(
         "pending_submissions": pending,
         "synced_percentage": round((synced / total_submissions * 100) if total_submissions > 0 else 0, 2),
         "submissions_by_state": [
-            {"state": state, "count": count}
-            for state, count in submissions_by_state
+            {"state": _dimension(state), "count": count}
+            for state, count in submissions_by_state.items()
         ],
         "top_lgas": [
-            {"lga": lga, "count": count}
-            for lga, count in submissions_by_lga
+            {"lga": _dimension(lga), "count": count}
+            for lga, count in sorted(submissions_by_lga.items(), key=lambda x: x[1], reverse=True)[:10]
         ],
         "recent_submissions": [
             {
-                "id": s.id,
-                "facility_name": s.facility_name,
-                "state": s.state,
-                "created_at": s.created_at.isoformat() if s.created_at else None,
-                "sync_status": s.sync_status
+                "id": submission_id,
+                "facility_name": facility_name,
+                "state": state,
+                "created_at": created_at.isoformat() if created_at else None,
+                "sync_status": sync_status
             }
-            for s in recent_submissions
+            for submission_id, facility_name, state, created_at, sync_status in recent_submissions
         ],
         "submissions_over_time": [
             {"date": str(date), "count": count}
@@ -86,40 +122,217 @@ def get_dashboard_overview(
     }
 
 
-@router.get("/geographic-data")
-def get_geographic_data(
+# Timeseries dimensions: query name -> rollup column
+TIMESERIES_DIMENSIONS = {
+    "state": SubmissionDailyRollup.state,
+    "zone": SubmissionDailyRollup.geopolitical_zone,
+    "collector": SubmissionDailyRollup.collector_id,
+    "sync_status": SubmissionDailyRollup.sync_status,
+}
+MAX_TIMESERIES_PERIODS = 1000
+
+
+def _period_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _periods(start: date, end: date, granularity: str) -> List[date]:
+    """Every period start from the one containing `start` through `end`"""
+    periods = []
+    current = _period_start(start, granularity)
+    while current <= end:
+        periods.append(current)
+        if len(periods) > MAX_TIMESERIES_PERIODS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Range too long: at most {MAX_TIMESERIES_PERIODS} {granularity} periods")
+        if granularity == "month":
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=7 if granularity == "week" else 1)
+    return periods
+
+
+def _parse_dimensions(dimensions: Optional[str]) -> List[str]:
+    requested = [d.strip() for d in (dimensions or "").split(",") if d.strip()]
+    unknown = [d for d in requested if d not in TIMESERIES_DIMENSIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown dimensions: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+
+@router.get("/timeseries")
+def get_timeseries(
+    request: Request,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    dimensions: Optional[str] = Query(
+        None, description="Comma-separated: state, zone, collector, sync_status"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_admin)
 ):
-    """Get geographic distribution data for mapping"""
-
-    submissions = db.query(
-        FormSubmission.latitude,
-        FormSubmission.longitude,
-        FormSubmission.facility_name,
-        FormSubmission.state,
-        FormSubmission.lga,
-        FormSubmission.facility_condition
+    """Submission counts per period (read from submission_daily_rollups).
+
+    Defaults to the last 30 days. Each series holds one count per entry in
+    `periods` (the first day of each day/week/month bucket).
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    selected = _parse_dimensions(dimensions)
+    periods = _periods(start, end, granularity)
+
+    return cached_json_response(
+        request, ("dashboard.timeseries", start, end, granularity, tuple(selected)),
+        get_data_version(db),
+        lambda: _build_timeseries(db, start, end, granularity, selected, periods)
+    )
+
+
+def _build_timeseries(db: Session, start: date, end: date, granularity: str,
+                      selected: List[str], periods: List[date]) -> Dict[str, Any]:
+    columns = [TIMESERIES_DIMENSIONS[name] for name in selected]
+    rows = db.query(
+        SubmissionDailyRollup.day,
+        *columns,
+        func.sum(SubmissionDailyRollup.submission_count)
     ).filter(
-        FormSubmission.latitude.isnot(None),
-        FormSubmission.longitude.isnot(None)
-    ).all()
+        SubmissionDailyRollup.day >= start,
+        SubmissionDailyRollup.day <= end
+    ).group_by(SubmissionDailyRollup.day, *columns).all()
+
+    # Daily rows are bucketed here so the same query serves every granularity
+    index = {period: i for i, period in enumerate(periods)}
+    series = {}
+    for day, *key, count in rows:
+        counts = series.setdefault(tuple(key), [0] * len(periods))
+        counts[index[_period_start(day, granularity)]] += count
+
+    collector_names = {}
+    if "collector" in selected:
+        position = selected.index("collector")
+        ids = {key[position] for key in series}
+        collector_names = dict(
+            db.query(User.id, User.username).filter(User.id.in_(ids)).all()
+        ) if ids else {}
+
+    def describe(key):
+        labels = {}
+        for name, value in zip(selected, key):
+            if name == "collector":
+                labels["collector_id"] = value
+                labels["collector"] = collector_names.get(value)
+            else:
+                labels[name] = _dimension(value)
+        return labels
 
     return {
-        "facilities": [
-            {
-                "latitude": lat,
-                "longitude": lng,
-                "name": facility_name,
-                "state": state,
-                "lga": lga,
-                "condition": condition
-            }
-            for lat, lng, facility_name, state, lga, condition in submissions
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "granularity": granularity,
+        "dimensions": selected,
+        "periods": [period.isoformat() for period in periods],
+        "series": sorted(
+            (
+                {**describe(key), "counts": counts, "total": sum(counts)}
+                for key, counts in series.items()
+            ),
+            key=lambda item: item["total"], reverse=True
+        ) if selected else [
+            {"counts": series.get((), [0] * len(periods)),
+             "total": sum(series.get((), []))}
         ]
     }
 
 
+@router.post("/rollups/rebuild")
+def rebuild_dashboard_rollups(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_active_admin)
+):
+    """Recompute the dashboard rollup tables from all submissions (admin only)"""
+    rows = rebuild_rollups(db)
+    return {"message": f"Rebuilt {rows} rollup rows", "rollup_rows": rows}
+
+
+# Compact encodings of the map points, chosen through the Accept header
+POINTS_COLUMNAR_TYPE = "application/vnd.pfmo.points+json"
+POINTS_BINARY_TYPE = "application/vnd.pfmo.points"
+POINTS_MEDIA_TYPES = (POINTS_BINARY_TYPE, POINTS_COLUMNAR_TYPE, "application/json")
+
+
+def _preferred_media_type(accept: Optional[str], offered) -> str:
+    """Highest-q offered type in an Accept header; the first offered on ties.
+    Types the header refuses (q=0) are never chosen; the last offered type
+    is the fallback when none is acceptable."""
+    best, best_q = offered[-1], 0.0
+    for part in (accept or "").split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media_type not in offered or q <= 0:
+            continue
+        if q > best_q or (q == best_q and offered.index(media_type) < offered.index(best)):
+            best, best_q = media_type, q
+    return best
+
+
+@router.get("/geographic-data")
+def get_geographic_data(
+    request: Request,
+    bbox: Optional[str] = Query(
+        None, description="min_lon,min_lat,max_lon,max_lat"),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    names: bool = Query(False, description="Include facility names in compact formats"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_active_admin)
+):
+    """Get geographic distribution data for mapping.
+
+    Without `zoom` (or at zoom >= 13) individual facilities are returned,
+    as JSON objects by default, or in a compact form when the Accept header
+    asks for application/vnd.pfmo.points+json (columnar, dictionary-encoded)
+    or application/vnd.pfmo.points (binary, see geo_service.points_as_binary).
+    Compact formats identify facilities by submission id; `names=true` adds
+    the names.
+    Below that zoom, facilities are clustered by geohash cell.
+    """
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if zoom is not None and zoom < POINTS_MIN_ZOOM:
+        precision = precision_for_zoom(zoom)
+        return {
+            "precision": precision,
+            "clusters": get_facility_clusters(db, precision, bounds)
+        }
+
+    rows = query_facility_points(db, bounds)
+    media_type = _preferred_media_type(request.headers.get("accept"), POINTS_MEDIA_TYPES)
+    headers = {"Vary": "Accept"}
+    if media_type == POINTS_BINARY_TYPE:
+        return Response(content=points_as_binary(rows, names), media_type=media_type,
+                        headers=headers)
+    if media_type == POINTS_COLUMNAR_TYPE:
+        return JSONResponse(content=points_as_columns(rows, names), media_type=media_type,
+                            headers=headers)
+    return JSONResponse(content=points_as_objects(rows), headers=headers)
+
+
 @router.get("/collectors")
 def get_collectors_stats(
     db: Session = Depends(get_db),
@@ -149,245 +362,14 @@ def get_collectors_stats(
 
 @router.get("/detailed-analytics")
 def get_detailed_analytics(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_admin)
 ):
-    """Get detailed analytics of form submission content"""
-
-    submissions = db.query(FormSubmission).all()
-
-    # Facility Condition Analysis
-    condition_counts = {}
-    ownership_counts = {}
-    assessment_type_counts = {}
-    has_health_workers_counts = {}
-
-    # Funding Analysis
-    bhcpf_facilities = 0
-    impact_facilities = 0
-    total_funding_amount = 0
-    funding_by_state = {}
-
-    # Infrastructure Analysis
-    infrastructure_stats = {
-        "has_power": 0,
-        "has_water": 0,
-        "has_internet": 0,
-        "has_pharmacy": 0,
-        "revitalization_count": 0
-    }
-
-    # Human Resources Analysis
-    total_staff = 0
-    staff_by_type = {}
-    facilities_with_staff = 0
-
-    # Services Utilization
-    total_patients = 0
-    services_offered = {}
-    avg_patients_per_facility = 0
-
-    # Patient Satisfaction
-    satisfaction_scores = []
-    satisfaction_by_category = {}
-
-    # Geographic Zone Analysis
-    zone_counts = {}
-
-    for sub in submissions:
-        # Facility Condition
-        if sub.facility_condition:
-            condition_counts[sub.facility_condition] = condition_counts.get(
-                sub.facility_condition, 0) + 1
-
-        # Ownership Type
-        if sub.ownership_type:
-            ownership_counts[sub.ownership_type] = ownership_counts.get(
-                sub.ownership_type, 0) + 1
-
-        # Assessment Type
-        if sub.assessment_type:
-            assessment_type_counts[sub.assessment_type] = assessment_type_counts.get(
-                sub.assessment_type, 0) + 1
-
-        # Health Workers
-        if sub.has_health_workers:
-            has_health_workers_counts[sub.has_health_workers] = has_health_workers_counts.get(
-                sub.has_health_workers, 0) + 1
-
-        # Geopolitical Zone
-        if sub.geopolitical_zone:
-            zone_counts[sub.geopolitical_zone] = zone_counts.get(
-                sub.geopolitical_zone, 0) + 1
-
-        # Funding Data Analysis
-        if sub.funding_data and isinstance(sub.funding_data, dict):
-            if sub.funding_data.get('bhcpf_received') == 'Yes' or sub.funding_data.get('has_bhcpf'):
-                bhcpf_facilities += 1
-            if sub.funding_data.get('amount'):
-                try:
-                    amount = float(
-                        str(sub.funding_data.get('amount', 0)).replace(',', ''))
-                    total_funding_amount += amount
-                    if sub.state:
-                        funding_by_state[sub.state] = funding_by_state.get(
-                            sub.state, 0) + amount
-                except:
-                    pass
-
-        if sub.impact_funding_data and isinstance(sub.impact_funding_data, dict):
-            if sub.impact_funding_data.get('received') == 'Yes' or sub.impact_funding_data.get('has_impact_funding'):
-                impact_facilities += 1
-
-        # Infrastructure Data Analysis
-        if sub.infrastructure_data and isinstance(sub.infrastructure_data, dict):
-            if sub.infrastructure_data.get('has_power') == 'Yes' or sub.infrastructure_data.get('power_available'):
-                infrastructure_stats["has_power"] += 1
-            if sub.infrastructure_data.get('has_water') == 'Yes' or sub.infrastructure_data.get('water_available'):
-                infrastructure_stats["has_water"] += 1
-            if sub.infrastructure_data.get('has_internet') == 'Yes' or sub.infrastructure_data.get('internet_available'):
-                infrastructure_stats["has_internet"] += 1
-            if sub.infrastructure_data.get('has_pharmacy') == 'Yes' or sub.infrastructure_data.get('pharmacy_available'):
-                infrastructure_stats["has_pharmacy"] += 1
-            if sub.infrastructure_data.get('revitalization') == 'Yes' or sub.infrastructure_data.get('revitalized'):
-                infrastructure_stats["revitalization_count"] += 1
-
-        # Human Resources Analysis
-        if sub.human_resources_data and isinstance(sub.human_resources_data, dict):
-            facility_staff_count = 0
-            for key, value in sub.human_resources_data.items():
-                if 'staff' in key.lower() or 'personnel' in key.lower() or 'worker' in key.lower():
-                    try:
-                        count = int(str(value).split()[0]) if isinstance(
-                            value, str) else int(value)
-                        facility_staff_count += count
-                        staff_type = key.replace('_', ' ').title()
-                        staff_by_type[staff_type] = staff_by_type.get(
-                            staff_type, 0) + count
-                    except:
-                        pass
-            if facility_staff_count > 0:
-                total_staff += facility_staff_count
-                facilities_with_staff += 1
-
-        # Services Utilization Analysis
-        if sub.services_data and isinstance(sub.services_data, dict):
-            # Count patients
-            for key, value in sub.services_data.items():
-                if 'patient' in key.lower() or 'attendance' in key.lower() or 'utilization' in key.lower():
-                    try:
-                        count = int(str(value).split()[0]) if isinstance(
-                            value, str) else int(value)
-                        total_patients += count
-                    except:
-                        pass
-
-            # Count services offered
-            for key, value in sub.services_data.items():
-                if isinstance(value, str) and value.lower() in ['yes', 'true', 'available']:
-                    service_name = key.replace('_', ' ').title()
-                    services_offered[service_name] = services_offered.get(
-                        service_name, 0) + 1
-
-        # Patient Satisfaction Analysis
-        if sub.satisfaction_survey_data and isinstance(sub.satisfaction_survey_data, dict):
-            for key, value in sub.satisfaction_survey_data.items():
-                if 'satisfaction' in key.lower() or 'rating' in key.lower() or 'score' in key.lower():
-                    try:
-                        score = float(value) if isinstance(
-                            value, (int, float)) else float(str(value).split()[0])
-                        satisfaction_scores.append(score)
-                        category = key.replace('_', ' ').title()
-                        if category not in satisfaction_by_category:
-                            satisfaction_by_category[category] = []
-                        satisfaction_by_category[category].append(score)
-                    except:
-                        pass
-
-    total_submissions = len(submissions)
-
-    return {
-        "facility_analysis": {
-            "condition_distribution": [
-                {"condition": k, "count": v, "percentage": round(
-                    (v / total_submissions * 100) if total_submissions > 0 else 0, 2)}
-                for k, v in condition_counts.items()
-            ],
-            "ownership_distribution": [
-                {"type": k, "count": v, "percentage": round(
-                    (v / total_submissions * 100) if total_submissions > 0 else 0, 2)}
-                for k, v in ownership_counts.items()
-            ],
-            "assessment_type_distribution": [
-                {"type": k, "count": v}
-                for k, v in assessment_type_counts.items()
-            ],
-            "health_workers_distribution": [
-                {"status": k, "count": v, "percentage": round(
-                    (v / total_submissions * 100) if total_submissions > 0 else 0, 2)}
-                for k, v in has_health_workers_counts.items()
-            ],
-            "geopolitical_zone_distribution": [
-                {"zone": k, "count": v}
-                for k, v in zone_counts.items()
-            ]
-        },
-        "funding_analysis": {
-            "bhcpf_facilities": bhcpf_facilities,
-            "bhcpf_percentage": round((bhcpf_facilities / total_submissions * 100) if total_submissions > 0 else 0, 2),
-            "impact_facilities": impact_facilities,
-            "impact_percentage": round((impact_facilities / total_submissions * 100) if total_submissions > 0 else 0, 2),
-            "total_funding_amount": round(total_funding_amount, 2),
-            "average_funding_per_facility": round((total_funding_amount / total_submissions) if total_submissions > 0 else 0, 2),
-            "funding_by_state": [
-                {"state": k, "amount": round(v, 2)}
-                for k, v in sorted(funding_by_state.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-        },
-        "infrastructure_analysis": {
-            "facilities_with_power": infrastructure_stats["has_power"],
-            "power_percentage": round((infrastructure_stats["has_power"] / total_submissions * 100) if total_submissions > 0 else 0, 2),
-            "facilities_with_water": infrastructure_stats["has_water"],
-            "water_percentage": round((infrastructure_stats["has_water"] / total_submissions * 100) if total_submissions > 0 else 0, 2),
-            "facilities_with_internet": infrastructure_stats["has_internet"],
-            "internet_percentage": round((infrastructure_stats["has_internet"] / total_submissions * 100) if total_submissions > 0 else 0, 2),
-            "facilities_with_pharmacy": infrastructure_stats["has_pharmacy"],
-            "pharmacy_percentage": round((infrastructure_stats["has_pharmacy"] / total_submissions * 100) if total_submissions > 0 else 0, 2),
-            "revitalized_facilities": infrastructure_stats["revitalization_count"],
-            "revitalization_percentage": round((infrastructure_stats["revitalization_count"] / total_submissions * 100) if total_submissions > 0 else 0, 2)
-        },
-        "human_resources_analysis": {
-            "total_staff": total_staff,
-            "facilities_with_staff": facilities_with_staff,
-            "average_staff_per_facility": round((total_staff / facilities_with_staff) if facilities_with_staff > 0 else 0, 2),
-            "staff_by_type": [
-                {"type": k, "count": v}
-                for k, v in sorted(staff_by_type.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-        },
-        "services_utilization": {
-            "total_patients": total_patients,
-            "average_patients_per_facility": round((total_patients / total_submissions) if total_submissions > 0 else 0, 2),
-            "top_services_offered": [
-                {"service": k, "facilities": v, "percentage": round(
-                    (v / total_submissions * 100) if total_submissions > 0 else 0, 2)}
-                for k, v in sorted(services_offered.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-        },
-        "patient_satisfaction": {
-            "average_score": round((sum(satisfaction_scores) / len(satisfaction_scores)) if satisfaction_scores else 0, 2),
-            "total_responses": len(satisfaction_scores),
-            "scores_by_category": {
-                k: {
-                    "average": round((sum(v) / len(v)) if v else 0, 2),
-                    "count": len(v)
-                }
-                for k, v in satisfaction_by_category.items()
-            }
-        },
-        "summary": {
-            "total_facilities": total_submissions,
-            "facilities_with_complete_data": sum(1 for s in submissions if s.facility_condition and s.ownership_type),
-            "data_completeness_percentage": round((sum(1 for s in submissions if s.facility_condition and s.ownership_type) / total_submissions * 100) if total_submissions > 0 else 0, 2)
-        }
-    }
+    """Get detailed analytics of form submission content (see ANALYTICS_ENGINE)"""
+    build = (build_detailed_analytics_frame if settings.ANALYTICS_ENGINE == "frame"
+             else build_detailed_analytics)
+    return cached_json_response(
+        request, ("dashboard.detailed_analytics",), get_data_version(db),
+        lambda: build(db)
+    )
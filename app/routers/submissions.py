@@ -1,66 +1,365 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Header, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import case, desc, func, select, tuple_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from typing import List, Optional
 from datetime import datetime
+import csv
+import io
+import json
 import os
-import shutil
+import uuid
 
-from app.database import get_db
-from app.models.submission import FormSubmission
+import aiofiles
+import aiofiles.os
+
+from app.database import get_db, get_async_db, SessionLocal
+from app.models.submission import FormSubmission, SubmissionRawData
 from app.models.user import User, UserRole
-from app.schemas.submission import SubmissionCreate, SubmissionResponse, SubmissionUpdate
+from app.schemas.submission import (
+    SubmissionCreate,
+    SubmissionResponse,
+    SubmissionUpdate,
+    SubmissionBatchItemResult,
+    SubmissionBatchResponse
+)
 from app.routers.auth import get_current_user, get_current_active_admin
 from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.services import image_service
 
 router = APIRouter()
 
-
-@router.post("/submit", response_model=SubmissionResponse, status_code=status.HTTP_201_CREATED)
-async def submit_form(
-    submission: SubmissionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Submit a new form"""
-    submission_data = submission.dict(exclude_unset=True)
+# Columns returned by GET /submissions?view=summary (the admin list view)
+SUMMARY_FIELDS = ("id", "facility_name", "state",
+                  "lga", "sync_status", "created_at")
+
+# JSON section columns flattened into "<section>.<key>" columns on CSV export
+SECTION_FIELDS = (
+    "funding_data",
+    "impact_funding_data",
+    "infrastructure_data",
+    "human_resources_data",
+    "services_data",
+    "commodities_data",
+    "satisfaction_survey_data",
+    "financial_validation_data",
+)
+
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# Bytes read/written per step while saving an upload
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Fields a client may request through ?fields=
+SELECTABLE_FIELDS = frozenset(
+    name for name in SubmissionResponse.model_fields
+    if name in FormSubmission.__table__.columns
+)
+
+
+def _raw_payload(submission_data: dict, extras: dict) -> Optional[dict]:
+    """Raw data to keep for a submission under RAW_SUBMISSION_MODE (None = nothing)"""
+    if settings.RAW_SUBMISSION_MODE == "full":
+        return {**submission_data, **extras}
+    if settings.RAW_SUBMISSION_MODE == "diff" and extras:
+        # Only what the parsed columns could not hold
+        return extras
+    return None
+
+
+def _build_submission(submission: SubmissionCreate, collector_id: int) -> FormSubmission:
+    """Build a FormSubmission row from a validated payload"""
+    extras = dict(submission.model_extra or {})
+    # Older clients echo a raw_submission_data copy; it duplicates the payload
+    extras.pop("raw_submission_data", None)
+    submission_data = submission.dict(
+        exclude_unset=True, exclude=set(submission.model_extra or {}))
 
     # Add collector ID
-    submission_data["collector_id"] = current_user.id
-    submission_data["raw_submission_data"] = submission_data.copy()
-    
+    submission_data["collector_id"] = collector_id
+    raw_payload = _raw_payload(submission_data, extras)
+
     # When submission is successfully received by server, mark it as synced
     # This is because if it's on the server, it's successfully synced
     submission_data["is_synced"] = True
     submission_data["sync_status"] = "synced"
     submission_data["synced_at"] = datetime.utcnow()
 
+    # Resized copies the upload pipeline has already written; ones still being
+    # generated are recorded by its background task when they are done
+    for field in image_service.IMAGE_FIELDS:
+        path = submission_data.get(f"{field}_path")
+        for name, derivative in image_service.existing_derivatives(path).items():
+            submission_data[f"{field}_{name}_path"] = derivative
+
     db_submission = FormSubmission(
         **submission_data,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
+    if raw_payload is not None:
+        db_submission.raw_data = SubmissionRawData.from_payload(
+            raw_payload, settings.RAW_SUBMISSION_MODE, settings.RAW_SUBMISSION_COMPRESS)
+    return db_submission
+
+
+async def _get_by_client_id(db: AsyncSession, client_submission_id: str, collector_id: int) -> Optional[FormSubmission]:
+    """Find a submission the server already holds for a client UUID"""
+    result = await db.execute(select(FormSubmission).where(
+        FormSubmission.client_submission_id == client_submission_id))
+    existing = result.scalars().first()
+
+    if existing and existing.collector_id != collector_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="client_submission_id already used by another collector"
+        )
+    return existing
+
+
+@router.post("/submit", response_model=SubmissionResponse, status_code=status.HTTP_201_CREATED)
+async def submit_form(
+    submission: SubmissionCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", max_length=64),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Submit a new form.
+    Retries carrying the same client_submission_id (or Idempotency-Key
+    header) are answered from the existing row with 200 instead of a new insert.
+    """
+    if idempotency_key and not submission.client_submission_id:
+        submission.client_submission_id = idempotency_key
+
+    if submission.client_submission_id:
+        existing = await _get_by_client_id(
+            db, submission.client_submission_id, current_user.id)
+        if existing:
+            response.status_code = status.HTTP_200_OK
+            return existing
+
+    db_submission = _build_submission(submission, current_user.id)
 
     db.add(db_submission)
-    db.commit()
-    db.refresh(db_submission)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent retry inserted the same client_submission_id first
+        await db.rollback()
+        existing = submission.client_submission_id and await _get_by_client_id(
+            db, submission.client_submission_id, current_user.id)
+        if not existing:
+            raise
+        response.status_code = status.HTTP_200_OK
+        return existing
+    await db.refresh(db_submission)
 
     return db_submission
 
 
-@router.get("/submissions", response_model=List[SubmissionResponse])
-def get_submissions(
-    skip: int = 0,
-    limit: int = 100,
-    state: Optional[str] = None,
-    lga: Optional[str] = None,
-    sync_status: Optional[str] = None,
+def _parse_batch_payload(body: bytes, content_type: str) -> list:
+    """Parse a batch body sent as a JSON array or as NDJSON (one payload per line)"""
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        payload = json.loads(body or b"[]")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed batch payload")
+
+    # Accept both a bare array and {"submissions": [...]}
+    if isinstance(payload, dict):
+        payload = payload.get("submissions")
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=400, detail="Batch payload must be a list of submissions")
+    return payload
+
+
+def _insert_chunk(db: Session, chunk: list, collector_id: int) -> List[SubmissionBatchItemResult]:
+    """Insert (index, SubmissionCreate) pairs in one transaction and commit"""
+    rows = [_build_submission(submission, collector_id) for _, submission in chunk]
+    db.add_all(rows)
+    # Flush issues the chunk as a multi-row insert and assigns ids
+    db.flush()
+    created = [
+        SubmissionBatchItemResult(index=index, status="created", id=row.id)
+        for (index, _), row in zip(chunk, rows)
+    ]
+    db.commit()
+    return created
+
+
+def _resolve_conflict(db: Session, index: int, submission: SubmissionCreate,
+                      collector_id: int, error: Exception) -> SubmissionBatchItemResult:
+    """Result for an item whose insert hit an IntegrityError"""
+    existing = submission.client_submission_id and db.query(
+        FormSubmission.id, FormSubmission.collector_id
+    ).filter(FormSubmission.client_submission_id == submission.client_submission_id).first()
+    if not existing:
+        return SubmissionBatchItemResult(
+            index=index, status="failed", errors=[{"msg": error.__class__.__name__}])
+    if existing.collector_id != collector_id:
+        return SubmissionBatchItemResult(
+            index=index, status="invalid",
+            errors=[{"loc": ["client_submission_id"],
+                     "msg": "client_submission_id already used by another collector"}])
+    # A concurrent sync inserted the same client_submission_id first
+    return SubmissionBatchItemResult(index=index, status="duplicate", id=existing.id)
+
+
+def _insert_batch(db: Session, items: list, collector_id: int) -> List[SubmissionBatchItemResult]:
+    """
+    Validate and insert batch items, committing once per chunk.
+    Items whose client_submission_id the server already holds (or that repeat
+    an earlier item in the same batch) are reported as duplicates, not inserted.
+    A chunk that hits an IntegrityError is retried one item at a time, so a
+    client UUID inserted concurrently only affects its own item.
+    """
+    results = {}
+    validated = []
+
+    for index, item in enumerate(items):
+        try:
+            validated.append((index, SubmissionCreate.model_validate(item)))
+        except ValidationError as e:
+            results[index] = SubmissionBatchItemResult(
+                index=index,
+                status="invalid",
+                errors=[{"loc": list(err["loc"]), "msg": err["msg"]}
+                        for err in e.errors()]
+            )
+
+    # Look up every client UUID in the batch with a single query
+    client_ids = {s.client_submission_id for _, s in validated if s.client_submission_id}
+    known = {}
+    if client_ids:
+        known = {
+            client_id: (submission_id, owner_id)
+            for submission_id, client_id, owner_id in db.query(
+                FormSubmission.id,
+                FormSubmission.client_submission_id,
+                FormSubmission.collector_id
+            ).filter(FormSubmission.client_submission_id.in_(client_ids))
+        }
+
+    pending = []
+    first_index = {}
+    repeats = []
+    for index, submission in validated:
+        client_id = submission.client_submission_id
+        if client_id in known:
+            submission_id, owner_id = known[client_id]
+            if owner_id != collector_id:
+                results[index] = SubmissionBatchItemResult(
+                    index=index, status="invalid",
+                    errors=[{"loc": ["client_submission_id"],
+                             "msg": "client_submission_id already used by another collector"}])
+            else:
+                results[index] = SubmissionBatchItemResult(
+                    index=index, status="duplicate", id=submission_id)
+        elif client_id in first_index:
+            repeats.append((index, first_index[client_id]))
+        else:
+            if client_id:
+                first_index[client_id] = index
+            pending.append((index, submission))
+
+    chunk_size = max(settings.SUBMISSION_BATCH_CHUNK_SIZE, 1)
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        try:
+            created = _insert_chunk(db, chunk, collector_id)
+        except IntegrityError:
+            db.rollback()
+            created = []
+            for index, submission in chunk:
+                try:
+                    created += _insert_chunk(db, [(index, submission)], collector_id)
+                except IntegrityError as e:
+                    db.rollback()
+                    results[index] = _resolve_conflict(db, index, submission, collector_id, e)
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    results[index] = SubmissionBatchItemResult(
+                        index=index, status="failed", errors=[{"msg": e.__class__.__name__}])
+        except SQLAlchemyError as e:
+            db.rollback()
+            created = [
+                SubmissionBatchItemResult(
+                    index=index, status="failed", errors=[{"msg": e.__class__.__name__}])
+                for index, _ in chunk
+            ]
+
+        for result in created:
+            results[result.index] = result
+
+    for index, original_index in repeats:
+        original = results[original_index]
+        if original.status == "created":
+            results[index] = SubmissionBatchItemResult(
+                index=index, status="duplicate", id=original.id)
+        else:
+            results[index] = original.model_copy(update={"index": index})
+
+    return [results[index] for index in sorted(results)]
+
+
+@router.post("/submit-batch", response_model=SubmissionBatchResponse)
+async def submit_batch(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all submissions with optional filters"""
-    query = db.query(FormSubmission)
+    """
+    Submit many forms in one request (offline-sync flush).
+    Accepts a JSON array of submissions, {"submissions": [...]},
+    or NDJSON (Content-Type: application/x-ndjson).
+    Returns a result per item in request order; items the server already
+    holds (same client_submission_id) come back as "duplicate".
+    """
+    items = _parse_batch_payload(
+        await request.body(), request.headers.get("content-type", ""))
+
+    if len(items) > settings.MAX_BATCH_SUBMISSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.MAX_BATCH_SUBMISSIONS} submissions"
+        )
+
+    # Validation, row building and the before_flush listeners are CPU work
+    # (~0.3s per 500 items), so the whole batch runs on a sync Session in the
+    # threadpool; AsyncSession.run_sync would run it on the event loop thread
+    results = await run_in_threadpool(_insert_batch, db, items, current_user.id)
+    created = sum(1 for r in results if r.status == "created")
+    duplicates = sum(1 for r in results if r.status == "duplicate")
+
+    return SubmissionBatchResponse(
+        total=len(items),
+        created=created,
+        duplicates=duplicates,
+        failed=len(items) - created - duplicates,
+        results=results
+    )
+
 
+def _filter_submissions(
+    query,
+    current_user: User,
+    state: Optional[str] = None,
+    lga: Optional[str] = None,
+    sync_status: Optional[str] = None
+):
+    """Apply role scoping and the common list filters to a submissions query"""
     # Filter by role
     if current_user.role == UserRole.DATA_COLLECTOR:
         query = query.filter(FormSubmission.collector_id == current_user.id)
@@ -72,12 +371,190 @@ def get_submissions(
         query = query.filter(FormSubmission.lga == lga)
     if sync_status:
         query = query.filter(FormSubmission.sync_status == sync_status)
+    return query
+
+
+def _parse_fields(fields: Optional[str], view: Optional[str]) -> Optional[List[str]]:
+    """Resolve ?fields= / ?view= into the column names to load (None = full rows)"""
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in SELECTABLE_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        # id is always returned so rows can be opened/paginated
+        return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+    if view == "summary":
+        return list(SUMMARY_FIELDS)
+    if view not in (None, "full"):
+        raise HTTPException(status_code=400, detail="view must be 'summary' or 'full'")
+    return None
+
 
+@router.get("/submissions", response_model=List[SubmissionResponse])
+def get_submissions(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    state: Optional[str] = None,
+    lga: Optional[str] = None,
+    sync_status: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get all submissions with optional filters.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page; cursor pages cost the same at any depth (skip is ignored).
+    Use `fields=id,state,...` or `view=summary` to load and return only
+    those columns instead of full submissions.
+    """
+    selected = _parse_fields(fields, view)
+
+    query = _filter_submissions(
+        db.query(FormSubmission), current_user, state, lga, sync_status)
+
+    if selected:
+        # created_at is needed for the cursor even when not returned
+        query = query.options(load_only(
+            *(getattr(FormSubmission, f) for f in {*selected, "created_at"})))
+
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor, 2)
+            created_at = datetime.fromisoformat(created_at)
+            last_id = int(last_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(
+            tuple_(FormSubmission.created_at, FormSubmission.id) < tuple_(created_at, last_id))
+        skip = 0
+
+    # Fetch one extra row to know whether another page exists
     submissions = query.order_by(
-        desc(FormSubmission.created_at)).offset(skip).limit(limit).all()
+        desc(FormSubmission.created_at), desc(FormSubmission.id)
+    ).offset(skip).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(submissions) > limit:
+        submissions = submissions[:limit]
+        last = submissions[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    if selected:
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return JSONResponse(
+            content=jsonable_encoder(
+                [{f: getattr(s, f) for f in selected} for s in submissions]),
+            headers=headers
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return submissions
 
 
+def _export_value(value):
+    """Render one value for an export cell"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _stream_export(export_format: str, current_user: User, state, lga, sync_status):
+    """
+    Yield an export chunk by chunk from its own session.
+    Rows are fetched EXPORT_BATCH_SIZE at a time (server-side cursor on
+    PostgreSQL), so memory stays flat regardless of how many rows match.
+    """
+    db = SessionLocal()
+    try:
+        scalar_fields = [
+            c.name for c in FormSubmission.__table__.columns
+            if c.name not in SECTION_FIELDS and c.name != "raw_submission_data"
+        ]
+        columns = [getattr(FormSubmission, f)
+                   for f in scalar_fields + list(SECTION_FIELDS)]
+
+        def rows(*selected):
+            query = _filter_submissions(
+                db.query(*selected), current_user, state, lga, sync_status)
+            return query.order_by(FormSubmission.id).execution_options(
+                yield_per=EXPORT_BATCH_SIZE)
+
+        if export_format == "ndjson":
+            buffer = []
+            for row in rows(*columns):
+                record = {k: v.isoformat() if isinstance(v, datetime) else v
+                          for k, v in row._mapping.items()}
+                buffer.append(json.dumps(record))
+                if len(buffer) >= EXPORT_BATCH_SIZE:
+                    yield "\n".join(buffer) + "\n"
+                    buffer = []
+            if buffer:
+                yield "\n".join(buffer) + "\n"
+            return
+
+        # CSV needs its header up front: collect the section keys in a first
+        # pass that reads only the JSON columns
+        section_keys = {section: {} for section in SECTION_FIELDS}
+        for row in rows(*(getattr(FormSubmission, f) for f in SECTION_FIELDS)):
+            for section, data in zip(SECTION_FIELDS, row):
+                if isinstance(data, dict):
+                    section_keys[section].update(dict.fromkeys(data))
+
+        flat_fields = [(section, key)
+                       for section in SECTION_FIELDS for key in section_keys[section]]
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(
+            scalar_fields + [f"{section}.{key}" for section, key in flat_fields])
+
+        for count, row in enumerate(rows(*columns), start=1):
+            record = row._mapping
+            writer.writerow(
+                [_export_value(record[f]) for f in scalar_fields] +
+                [_export_value(record[section].get(key))
+                 if isinstance(record[section], dict) else None
+                 for section, key in flat_fields]
+            )
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+        yield output.getvalue()
+    finally:
+        db.close()
+
+
+@router.get("/export")
+def export_submissions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    state: Optional[str] = None,
+    lga: Optional[str] = None,
+    sync_status: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream submissions as CSV (JSON sections flattened into
+    "<section>.<key>" columns) or NDJSON, with the same filters as the list.
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"submissions_{datetime.utcnow():%Y%m%d_%H%M%S}.{format}"
+
+    return StreamingResponse(
+        _stream_export(format, current_user, state, lga, sync_status),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/submissions/{submission_id}", response_model=SubmissionResponse)
 def get_submission(
     submission_id: int,
@@ -98,6 +575,38 @@ def get_submission(
     return submission
 
 
+@router.get("/submissions/{submission_id}/raw")
+def get_submission_raw_data(
+    submission_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the raw payload stored for a submission (see RAW_SUBMISSION_MODE)"""
+    submission = db.query(FormSubmission).filter(
+        FormSubmission.id == submission_id).first()
+
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    # Check permissions
+    if current_user.role == UserRole.DATA_COLLECTOR and submission.collector_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    if submission.raw_data is not None:
+        return {
+            "submission_id": submission_id,
+            "mode": submission.raw_data.mode,
+            "raw_submission_data": submission.raw_data.payload
+        }
+
+    # Rows stored before raw data moved to its own table
+    return {
+        "submission_id": submission_id,
+        "mode": "legacy" if submission.raw_submission_data is not None else None,
+        "raw_submission_data": submission.raw_submission_data
+    }
+
+
 @router.put("/submissions/{submission_id}", response_model=SubmissionResponse)
 def update_submission(
     submission_id: int,
@@ -151,26 +660,67 @@ def delete_submission(
 
 @router.post("/upload")
 async def upload_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
-    """Upload a file (e.g., facility image)"""
+    """
+    Upload a file (e.g., facility image).
+    Written in chunks without blocking the event loop, and renamed into place
+    only when complete. Bodies whose Content-Length is too large are refused
+    before they are read (UploadSizeLimitMiddleware); otherwise the copy is
+    rejected with 413 once MAX_UPLOAD_SIZE is exceeded.
+    Images get thumbnail/medium derivatives generated after the response;
+    submissions referencing the file get their paths once they exist.
+    """
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {settings.MAX_UPLOAD_SIZE} bytes"
+        )
+
     # Create uploads directory if it doesn't exist
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    await aiofiles.os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+    uploaded_at = datetime.utcnow()
 
     # Generate unique filename
     file_ext = file.filename.split('.')[-1]
-    unique_filename = f"{datetime.utcnow().timestamp()}_{current_user.id}.{file_ext}"
+    # The random part keeps two uploads from ever sharing (and replacing) a path
+    unique_filename = f"{datetime.utcnow().timestamp()}_{current_user.id}_{uuid.uuid4().hex[:12]}.{file_ext}"
     file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
-
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    temp_path = f"{file_path}.part"
+
+    # Save file to a temp path, then rename so readers never see partial files
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds {settings.MAX_UPLOAD_SIZE} bytes"
+                    )
+                await buffer.write(chunk)
+        await aiofiles.os.replace(temp_path, file_path)
+    except BaseException:
+        if await aiofiles.os.path.exists(temp_path):
+            await aiofiles.os.remove(temp_path)
+        raise
+
+    derivatives = {}
+    if image_service.is_image(file_path):
+        derivatives = image_service.derivative_paths(file_path)
+        background_tasks.add_task(
+            image_service.generate_derivatives, file_path, uploaded_at)
 
     return {
         "file_path": file_path,
         "filename": unique_filename,
-        "original_filename": file.filename
+        "original_filename": file.filename,
+        "size": size,
+        "derivatives": derivatives
     }
 
 
@@ -180,15 +730,16 @@ def get_submission_stats(
     current_user: User = Depends(get_current_user)
 ):
     """Get submission statistics"""
-    query = db.query(FormSubmission)
-
-    # Filter by role
-    if current_user.role == UserRole.DATA_COLLECTOR:
-        query = query.filter(FormSubmission.collector_id == current_user.id)
-
-    total = query.count()
-    synced = query.filter(FormSubmission.is_synced == True).count()
-    pending = query.filter(FormSubmission.sync_status == "pending").count()
+    # All three counts in a single scan
+    query = _filter_submissions(db.query(
+        func.count(FormSubmission.id),
+        func.sum(case((FormSubmission.is_synced == True, 1), else_=0)),
+        func.sum(case((FormSubmission.sync_status == "pending", 1), else_=0))
+    ), current_user)
+
+    total, synced, pending = query.one()
+    synced = synced or 0
+    pending = pending or 0
 
     return {
         "total_submissions": total,
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -7,6 +7,9 @@ class SubmissionBase(BaseModel):
     form_id: Optional[int] = None
     collector_id: Optional[int] = None
 
+    # Client-generated UUID used as the idempotency key for retries
+    client_submission_id: Optional[str] = Field(None, max_length=64)
+
     # PFMO Identification
     pfmo_name: Optional[str] = None
     pfmo_phone: Optional[str] = None
@@ -65,11 +68,12 @@ class SubmissionBase(BaseModel):
     # Metadata
     submission_status: Optional[str] = "pending"
     sync_status: Optional[str] = "pending"
-    raw_submission_data: Optional[Dict[str, Any]] = None
 
 
 class SubmissionCreate(SubmissionBase):
-    pass
+    # Unknown keys are kept (model_extra) so they can be stored as raw data
+    class Config:
+        extra = "allow"
 
 
 class SubmissionUpdate(BaseModel):
@@ -81,6 +85,10 @@ class SubmissionUpdate(BaseModel):
 class SubmissionResponse(SubmissionBase):
     id: int
     collector_id: int
+    facility_image_thumbnail_path: Optional[str] = None
+    facility_image_medium_path: Optional[str] = None
+    facility_selfie_thumbnail_path: Optional[str] = None
+    facility_selfie_medium_path: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     synced_at: Optional[datetime] = None
@@ -88,3 +96,19 @@ class SubmissionResponse(SubmissionBase):
 
     class Config:
         from_attributes = True
+
+
+class SubmissionBatchItemResult(BaseModel):
+    index: int
+    # created, duplicate, invalid, failed
+    status: str
+    id: Optional[int] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+
+
+class SubmissionBatchResponse(BaseModel):
+    total: int
+    created: int
+    duplicates: int = 0
+    failed: int
+    results: List[SubmissionBatchItemResult]
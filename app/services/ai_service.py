@@ -4,8 +4,17 @@ Provides AI-powered analysis and insights for healthcare facility data
 """
 
 import os
-from typing import Dict, List, Any, Optional
-import json
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import exists, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.submission import FormSubmission
+from app.services.analytics_service import get_json_dialect
+from app.services.submission_features import SOURCE_ATTRIBUTES, compute_features, get_features
 
 # Optional: Uncomment when you add AI libraries
 # import openai
@@ -13,6 +22,297 @@ import json
 # import requests
 
 
+# Bump whenever the output of the AIService analyses changes, so stored
+# submission insights (app/services/insight_service.py) are recomputed
+RULESET_VERSION = 4
+
+# Facility needs rules: (risk factor or None, predicted need, recommendation)
+NEED_CONDITION = ("Poor facility condition", "Infrastructure improvement",
+                  "Prioritize facility rehabilitation")
+NEED_STAFFING = ("Insufficient staffing", "Additional healthcare workers",
+                 "Recruit and train more staff")
+NEED_FUNDING = ("Lack of funding", "Financial support",
+                "Apply for BHCPF or IMPACT funding")
+NEED_POWER = (None, "Power supply", "Install or repair power infrastructure")
+NEED_WATER = (None, "Water supply", "Ensure reliable water access")
+
+# Stable codes for the needs rules' recommendations (stored in
+# submission_recommendations; never reuse a code for different advice)
+RECOMMENDATION_CODES = {
+    NEED_CONDITION[2]: "rehabilitate_facility",
+    NEED_STAFFING[2]: "recruit_staff",
+    NEED_FUNDING[2]: "apply_for_funding",
+    NEED_POWER[2]: "repair_power",
+    NEED_WATER[2]: "improve_water_access",
+}
+RECOMMENDATION_CATEGORIES = ("infrastructure", "staffing", "funding", "general")
+
+POOR_CONDITIONS = ("poor", "critical")
+CRITICAL_FIELDS = ("facility_name", "state", "lga", "facility_condition")
+MIN_STAFF = 5
+# Rough bounds of Nigeria: (min_lat, max_lat, min_lon, max_lon)
+NIGERIA_BOUNDS = (4.0, 14.0, 2.0, 15.0)
+
+
+# Text analysis keywords, matched as word stems: "lack" also finds
+# "lacking", "issue" finds "issues". Keywords in EXACT_KEYWORDS only match
+# as whole words, so "no" doesn't find "not" or "now".
+NEGATIVE_KEYWORDS = ("problem", "issue", "broken", "missing",
+                     "urgent", "critical", "poor", "bad", "lack", "leak", "no")
+POSITIVE_KEYWORDS = ("good", "excellent",
+                     "working", "available", "complete", "satisfied")
+TOPIC_KEYWORDS = {
+    "infrastructure": ("power", "water", "building", "facility", "structure"),
+    "staffing": ("staff", "worker", "personnel", "doctor", "nurse"),
+    "funding": ("money", "budget", "funding", "financial", "cost"),
+    "equipment": ("equipment", "machine", "device", "tool"),
+    "supplies": ("supply", "commodity", "medicine", "drug", "stock"),
+    "services": ("service", "patient", "treatment", "care"),
+}
+EXACT_KEYWORDS = frozenset({"no"})
+# A positive keyword after one of these (or a "...n't" word), or with an
+# "un" prefix, counts as negative: "not working", "isn't available"
+NEGATORS = frozenset({"not", "no", "never", "hardly"})
+
+
+class KeywordMatcher:
+    """
+    Stem matcher for a fixed set of labelled keywords, built once.
+    A word matches a keyword when it starts with it (after an optional
+    "un", "under" or "over" prefix), so inflections count: "leaking",
+    "understaffed". Each distinct word is matched once against a single
+    compiled pattern, so the cost does not grow with the number of keywords.
+    Positive keywords that are negated are reported as f"not {keyword}"
+    under the "negative" label.
+    """
+
+    WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        """`keywords` maps each label (a sentiment, a topic) to its words"""
+        self._labels: Dict[str, Set[str]] = {}
+        for label, words in keywords.items():
+            for word in words:
+                self._labels.setdefault(word, set()).add(label)
+        # Matched stem text -> keyword ("supplie" from "supplies" -> "supply")
+        self._stems: Dict[str, str] = {}
+        alternatives = []
+        for word in self._labels:
+            stems = [word]
+            if word.endswith("y") and word not in EXACT_KEYWORDS:
+                stems.append(word[:-1] + "ie")
+            for stem in stems:
+                self._stems[stem] = word
+                alternatives.append(re.escape(stem) + ("$" if word in EXACT_KEYWORDS else ""))
+        # Longest first, so "worker" is tried before a shorter keyword it starts with
+        alternatives.sort(key=len, reverse=True)
+        self._pattern = re.compile(
+            r"(?:(un)|under|over)?(" + "|".join(alternatives) + r")\w*")
+
+    def _keyword(self, word: str):
+        """(keyword, has "un" prefix) for one word, or None"""
+        match = self._pattern.fullmatch(word)
+        if match is None:
+            return None
+        return self._stems[match.group(2)], bool(match.group(1))
+
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """label -> the distinct keywords found for it"""
+        cache: Dict[str, Any] = {}
+        found: Dict[str, Set[str]] = {}
+        previous = ""
+        for token in self.WORD.findall(text.lower()):
+            word = re.split("['’]", token)[0]
+            if word not in cache:
+                cache[word] = self._keyword(word)
+            hit = cache[word]
+            if hit is not None:
+                keyword, un_prefix = hit
+                labels = self._labels[keyword]
+                negated = un_prefix or previous in NEGATORS or previous.endswith(("n't", "n’t"))
+                if "positive" in labels and negated:
+                    found.setdefault("negative", set()).add(f"not {keyword}")
+                    labels = labels - {"positive"}
+                for label in labels:
+                    found.setdefault(label, set()).add(keyword)
+            previous = token
+        return found
+
+
+def recommendation_category(recommendation: str) -> str:
+    """Bucket a recommendation by its wording"""
+    text = recommendation.lower()
+    if "infrastructure" in text or "power" in text or "water" in text:
+        return "infrastructure"
+    if "staff" in text or "worker" in text:
+        return "staffing"
+    if "funding" in text or "financial" in text:
+        return "funding"
+    return "general"
+
+
+def recommendation_codes(predictions: Dict[str, Any]) -> List[str]:
+    return [RECOMMENDATION_CODES[rec] for rec in predictions["recommendations"]]
+
+
+def _add_need(predictions: Dict[str, Any], rule):
+    risk_factor, need, recommendation = rule
+    if risk_factor:
+        predictions["risk_factors"].append(risk_factor)
+    predictions["predicted_needs"].append(need)
+    predictions["recommendations"].append(recommendation)
+
+
+def _missing_field_anomaly(field: str) -> Dict[str, Any]:
+    return {
+        "type": "missing_data",
+        "field": field,
+        "severity": "high",
+        "message": f"Missing critical field: {field}"
+    }
+
+
+def _location_anomaly(lat, lon) -> Dict[str, Any]:
+    return {
+        "type": "invalid_location",
+        "field": "coordinates",
+        "severity": "medium",
+        "message": f"Coordinates ({lat}, {lon}) appear to be outside Nigeria"
+    }
+
+
+def _inconsistency_anomaly() -> Dict[str, Any]:
+    return {
+        "type": "inconsistency",
+        "field": "health_workers",
+        "severity": "medium",
+        "message": "Form indicates no health workers but HR data exists"
+    }
+
+
+@dataclass
+class SubmissionFacts:
+    """One submission's inputs to the AIService rules, each section parsed
+    once. Built by parse_submission()."""
+    facility_name: Any  # as the summary shows them
+    state: Any
+    condition: Any
+    poor_condition: bool
+    missing_fields: List[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    no_health_workers: bool
+    has_hr_values: bool  # human_resources_data is an object with a truthy member
+    has_funding_data: bool  # funding_data is an object
+    has_infrastructure_data: bool  # infrastructure_data is an object
+    features: Dict[str, Any]  # get_features(): stored, or derived when missing
+
+
+def parse_submission(submission_data: Dict[str, Any]) -> SubmissionFacts:
+    """Read everything the rules need from a to_dict() payload"""
+    hr_data = submission_data.get("human_resources_data", {})
+    return SubmissionFacts(
+        facility_name=submission_data.get("facility_name", "Unknown Facility"),
+        state=submission_data.get("state", "Unknown State"),
+        condition=submission_data.get("facility_condition", "Unknown"),
+        poor_condition=(submission_data.get("facility_condition") or "").lower()
+        in POOR_CONDITIONS,
+        missing_fields=[field for field in CRITICAL_FIELDS
+                        if not submission_data.get(field)],
+        latitude=submission_data.get("latitude"),
+        longitude=submission_data.get("longitude"),
+        no_health_workers=submission_data.get("has_health_workers") == "No",
+        has_hr_values=isinstance(hr_data, dict) and any(v for v in hr_data.values() if v),
+        has_funding_data=isinstance(submission_data.get("funding_data"), dict),
+        has_infrastructure_data=isinstance(submission_data.get("infrastructure_data"), dict),
+        # Staffing, funding and infrastructure use the same derived features
+        # as the dashboard (stored on the submission when available)
+        features=get_features(submission_data),
+    )
+
+
+@dataclass
+class FacilityBatch:
+    """Column-oriented facility data for the batch rules, one array entry
+    per submission. Built by load_facility_batch()."""
+    id: np.ndarray
+    facility_name: np.ndarray
+    state: np.ndarray
+    lga: np.ndarray
+    facility_condition: np.ndarray
+    has_health_workers: np.ndarray
+    latitude: np.ndarray  # float, NaN when missing
+    longitude: np.ndarray  # float, NaN when missing
+    total_staff: np.ndarray  # float, NaN when there is no HR section
+    bhcpf_funded: np.ndarray
+    has_power: np.ndarray
+    has_water: np.ndarray
+    has_funding_data: np.ndarray  # funding_data is a JSON object
+    has_infrastructure_data: np.ndarray  # infrastructure_data is a JSON object
+    has_hr_values: np.ndarray  # human_resources_data is an object with a truthy member
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+def _bools(values) -> np.ndarray:
+    return np.array(values, dtype=object).astype(bool)
+
+
+def load_facility_batch(db: Session, *criteria, limit: Optional[int] = None) -> FacilityBatch:
+    """One query for the batch columns of the submissions matching `criteria`
+    (the first `limit` of them by id, if given)"""
+    S = FormSubmission
+    dialect = get_json_dialect(db)
+    members, _, value = dialect.each(S.human_resources_data)
+    query = select(
+        S.id, S.facility_name, S.state, S.lga, S.facility_condition,
+        S.has_health_workers, S.latitude, S.longitude,
+        S.total_staff, S.bhcpf_funded, S.has_power, S.has_water,
+        dialect.kind(S.funding_data) == "object",
+        dialect.kind(S.infrastructure_data) == "object",
+        exists(select(literal(1)).select_from(members).where(dialect.truthy(value))),
+    ).where(*criteria).order_by(S.id).limit(limit)
+    columns = [list(c) for c in zip(*db.execute(query).all())] or [[] for _ in range(15)]
+    (ids, names, states, lgas, conditions, workers, lats, lons,
+     staff, bhcpf, power, water, funding_data, infra_data, hr_values) = columns
+
+    # Submissions written without the ORM since the startup backfill have
+    # no stored features yet; derive them like get_features() would
+    if any(None in column for column in (power, water, bhcpf)):
+        position = {id_: i for i, id_ in enumerate(ids)}
+        rows = db.execute(
+            select(S.id, *(getattr(S, attr) for attr in SOURCE_ATTRIBUTES))
+            .where(*criteria, S.id.between(ids[0], ids[-1]))
+            .where(or_(S.has_power.is_(None), S.has_water.is_(None), S.bhcpf_funded.is_(None)))
+        ).all()
+        for row in rows:
+            i = position.get(row.id)
+            if i is None:  # beyond `limit`
+                continue
+            computed = compute_features(dict(zip(SOURCE_ATTRIBUTES, row[1:])))
+            staff[i], bhcpf[i] = computed["total_staff"], computed["bhcpf_funded"]
+            power[i], water[i] = computed["has_power"], computed["has_water"]
+
+    return FacilityBatch(
+        id=np.array(ids, dtype=np.int64),
+        facility_name=np.array(names, dtype=object),
+        state=np.array(states, dtype=object),
+        lga=np.array(lgas, dtype=object),
+        facility_condition=np.array(conditions, dtype=object),
+        has_health_workers=np.array(workers, dtype=object),
+        latitude=np.array(lats, dtype=float),
+        longitude=np.array(lons, dtype=float),
+        total_staff=np.array(staff, dtype=float),
+        bhcpf_funded=_bools(bhcpf),
+        has_power=_bools(power),
+        has_water=_bools(water),
+        has_funding_data=_bools(funding_data),
+        has_infrastructure_data=_bools(infra_data),
+        has_hr_values=_bools(hr_values),
+    )
+
+
 class AIService:
     """AI-powered analysis service for PFMO data"""
 
@@ -20,6 +320,11 @@ class AIService:
         # Initialize AI services (add your API keys here)
         self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
         self.enabled = bool(self.openai_api_key)
+        self.keyword_matcher = KeywordMatcher({
+            "negative": NEGATIVE_KEYWORDS,
+            "positive": POSITIVE_KEYWORDS,
+            **TOPIC_KEYWORDS,
+        })
 
     def analyze_issues_and_comments(self, issues: str, comments: str) -> Dict[str, Any]:
         """
@@ -70,18 +375,11 @@ class AIService:
 
     def _basic_text_analysis(self, text: str) -> Dict[str, Any]:
         """Basic keyword-based text analysis (fallback)"""
-        text_lower = text.lower()
-
-        # Sentiment keywords
-        negative_keywords = ['problem', 'issue', 'broken', 'missing',
-                             'urgent', 'critical', 'poor', 'bad', 'lack', 'no']
-        positive_keywords = ['good', 'excellent',
-                             'working', 'available', 'complete', 'satisfied']
+        found = self.keyword_matcher.match(text)
 
-        negative_count = sum(
-            1 for word in negative_keywords if word in text_lower)
-        positive_count = sum(
-            1 for word in positive_keywords if word in text_lower)
+        # Sentiment: distinct keywords of each kind
+        negative_count = len(found.get("negative", ()))
+        positive_count = len(found.get("positive", ()))
 
         if negative_count > positive_count:
             sentiment = "negative"
@@ -94,19 +392,7 @@ class AIService:
             priority = "medium"
 
         # Extract topics
-        topics = []
-        topic_keywords = {
-            "infrastructure": ["power", "water", "building", "facility", "structure"],
-            "staffing": ["staff", "worker", "personnel", "doctor", "nurse"],
-            "funding": ["money", "budget", "funding", "financial", "cost"],
-            "equipment": ["equipment", "machine", "device", "tool"],
-            "supplies": ["supply", "commodity", "medicine", "drug", "stock"],
-            "services": ["service", "patient", "treatment", "care"]
-        }
-
-        for topic, keywords in topic_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                topics.append(topic)
+        topics = [topic for topic in TOPIC_KEYWORDS if topic in found]
 
         return {
             "sentiment": sentiment,
@@ -164,135 +450,166 @@ class AIService:
             }
         }
 
+    def analyze_submission(self, submission_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Every analysis of one submission (a to_dict() payload) in a single
+        pass: the sections are parsed once and predictions, anomalies and
+        the summary are all derived from that
+        """
+        facts = parse_submission(submission_data)
+        predictions = self._predict_needs(facts)
+        anomalies = self._detect_anomalies(facts)
+        return {
+            "issues_analysis": self.analyze_issues_and_comments(
+                submission_data.get("issues") or "",
+                submission_data.get("comments") or ""
+            ),
+            "satisfaction_analysis": self.analyze_patient_satisfaction(
+                submission_data.get("satisfaction_survey_data") or {}
+            ),
+            "predictions": predictions,
+            "anomalies": anomalies,
+            "summary": self._summarize(facts, predictions, anomalies)
+        }
+
+    def assess(self, submission_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """(predict_facility_needs(), detect_data_anomalies()) from one parse"""
+        facts = parse_submission(submission_data)
+        return self._predict_needs(facts), self._detect_anomalies(facts)
+
     def predict_facility_needs(self, submission_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Predict facility needs based on current data
         Uses facility condition, funding, staffing, and infrastructure
         """
+        return self._predict_needs(parse_submission(submission_data))
+
+    def detect_data_anomalies(self, submission_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Detect anomalies and potential data quality issues
+        """
+        return self._detect_anomalies(parse_submission(submission_data))
+
+    def _predict_needs(self, facts: SubmissionFacts) -> Dict[str, Any]:
         predictions = {
             "priority_level": "medium",
             "predicted_needs": [],
             "risk_factors": [],
             "recommendations": []
         }
+        features = facts.features
 
         # Analyze facility condition
-        condition = submission_data.get("facility_condition", "").lower()
-        if condition in ["poor", "critical"]:
+        if facts.poor_condition:
             predictions["priority_level"] = "high"
-            predictions["risk_factors"].append("Poor facility condition")
-            predictions["predicted_needs"].append("Infrastructure improvement")
-            predictions["recommendations"].append(
-                "Prioritize facility rehabilitation")
+            _add_need(predictions, NEED_CONDITION)
 
         # Analyze staffing
-        hr_data = submission_data.get("human_resources_data", {})
-        if isinstance(hr_data, dict):
-            total_staff = sum(
-                int(str(v).split()[0]) if isinstance(v, (str, int)) else 0
-                for k, v in hr_data.items()
-                if "staff" in k.lower() or "personnel" in k.lower()
-            )
-            if total_staff < 5:
-                predictions["risk_factors"].append("Insufficient staffing")
-                predictions["predicted_needs"].append(
-                    "Additional healthcare workers")
-                predictions["recommendations"].append(
-                    "Recruit and train more staff")
+        total_staff = features["total_staff"]
+        if total_staff is not None and total_staff < MIN_STAFF:
+            _add_need(predictions, NEED_STAFFING)
 
         # Analyze funding
-        funding_data = submission_data.get("funding_data", {})
-        if isinstance(funding_data, dict):
-            has_funding = funding_data.get(
-                "bhcpf_status") == "Received" or funding_data.get("has_bhcpf")
-            if not has_funding:
-                predictions["risk_factors"].append("Lack of funding")
-                predictions["predicted_needs"].append("Financial support")
-                predictions["recommendations"].append(
-                    "Apply for BHCPF or IMPACT funding")
+        if facts.has_funding_data and not features["bhcpf_funded"]:
+            _add_need(predictions, NEED_FUNDING)
 
         # Analyze infrastructure
-        infra_data = submission_data.get("infrastructure_data", {})
-        if isinstance(infra_data, dict):
-            has_power = infra_data.get(
-                "has_power") == "Yes" or infra_data.get("power_available")
-            has_water = infra_data.get(
-                "has_water") == "Yes" or infra_data.get("water_available")
-
-            if not has_power:
-                predictions["predicted_needs"].append("Power supply")
-                predictions["recommendations"].append(
-                    "Install or repair power infrastructure")
-            if not has_water:
-                predictions["predicted_needs"].append("Water supply")
-                predictions["recommendations"].append(
-                    "Ensure reliable water access")
+        if facts.has_infrastructure_data:
+            if not features["has_power"]:
+                _add_need(predictions, NEED_POWER)
+            if not features["has_water"]:
+                _add_need(predictions, NEED_WATER)
 
         return predictions
 
-    def detect_data_anomalies(self, submission_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Detect anomalies and potential data quality issues
-        """
-        anomalies = []
-
+    def _detect_anomalies(self, facts: SubmissionFacts) -> List[Dict[str, Any]]:
         # Check for missing critical data
-        critical_fields = ["facility_name",
-                           "state", "lga", "facility_condition"]
-        for field in critical_fields:
-            if not submission_data.get(field):
-                anomalies.append({
-                    "type": "missing_data",
-                    "field": field,
-                    "severity": "high",
-                    "message": f"Missing critical field: {field}"
-                })
+        anomalies = [_missing_field_anomaly(field) for field in facts.missing_fields]
 
         # Check GPS coordinates validity
-        lat = submission_data.get("latitude")
-        lon = submission_data.get("longitude")
+        lat, lon = facts.latitude, facts.longitude
         if lat and lon:
             # Check if coordinates are in Nigeria (rough bounds)
-            if not (4.0 <= lat <= 14.0) or not (2.0 <= lon <= 15.0):
-                anomalies.append({
-                    "type": "invalid_location",
-                    "field": "coordinates",
-                    "severity": "medium",
-                    "message": f"Coordinates ({lat}, {lon}) appear to be outside Nigeria"
-                })
-
-        # Check for logical inconsistencies
-        has_workers = submission_data.get("has_health_workers")
-        hr_data = submission_data.get("human_resources_data", {})
-        if has_workers == "No" and isinstance(hr_data, dict):
-            # Check if HR data exists despite saying no workers
-            has_hr_data = any(v for v in hr_data.values() if v)
-            if has_hr_data:
-                anomalies.append({
-                    "type": "inconsistency",
-                    "field": "health_workers",
-                    "severity": "medium",
-                    "message": "Form indicates no health workers but HR data exists"
-                })
+            min_lat, max_lat, min_lon, max_lon = NIGERIA_BOUNDS
+            if not (min_lat <= lat <= max_lat) or not (min_lon <= lon <= max_lon):
+                anomalies.append(_location_anomaly(lat, lon))
+
+        # Check for logical inconsistencies: HR data despite saying no workers
+        if facts.no_health_workers and facts.has_hr_values:
+            anomalies.append(_inconsistency_anomaly())
 
         return anomalies
 
+    def predict_facility_needs_batch(self, batch: FacilityBatch) -> List[Dict[str, Any]]:
+        """
+        predict_facility_needs() for every facility in a batch; each rule is
+        evaluated once as a mask over the batch columns
+        """
+        conditions = np.char.lower(batch.facility_condition.astype(str))
+        rules = (
+            (NEED_CONDITION, np.isin(conditions, POOR_CONDITIONS)),
+            (NEED_STAFFING, batch.total_staff < MIN_STAFF),  # NaN compares False
+            (NEED_FUNDING, batch.has_funding_data & ~batch.bhcpf_funded),
+            (NEED_POWER, batch.has_infrastructure_data & ~batch.has_power),
+            (NEED_WATER, batch.has_infrastructure_data & ~batch.has_water),
+        )
+        high = rules[0][1].tolist()
+        hits = np.column_stack([mask for _, mask in rules]).tolist()
+
+        results = []
+        for is_high, row_hits in zip(high, hits):
+            predictions = {
+                "priority_level": "high" if is_high else "medium",
+                "predicted_needs": [],
+                "risk_factors": [],
+                "recommendations": []
+            }
+            for (rule, _), hit in zip(rules, row_hits):
+                if hit:
+                    _add_need(predictions, rule)
+            results.append(predictions)
+        return results
+
+    def detect_data_anomalies_batch(self, batch: FacilityBatch) -> List[List[Dict[str, Any]]]:
+        """
+        detect_data_anomalies() for every facility in a batch, evaluated as
+        masks over the batch columns
+        """
+        missing = np.column_stack(
+            [~getattr(batch, field).astype(bool) for field in CRITICAL_FIELDS]
+        ).tolist()
+
+        lat, lon = batch.latitude, batch.longitude
+        min_lat, max_lat, min_lon, max_lon = NIGERIA_BOUNDS
+        located = ~np.isnan(lat) & ~np.isnan(lon) & (lat != 0) & (lon != 0)
+        inside = (min_lat <= lat) & (lat <= max_lat) & (min_lon <= lon) & (lon <= max_lon)
+        outside = (located & ~inside).tolist()
+        inconsistent = ((batch.has_health_workers == "No") & batch.has_hr_values).tolist()
+
+        results = []
+        for i, row_missing in enumerate(missing):
+            anomalies = [_missing_field_anomaly(field)
+                         for field, is_missing in zip(CRITICAL_FIELDS, row_missing)
+                         if is_missing]
+            if outside[i]:
+                anomalies.append(_location_anomaly(float(lat[i]), float(lon[i])))
+            if inconsistent[i]:
+                anomalies.append(_inconsistency_anomaly())
+            results.append(anomalies)
+        return results
+
     def generate_insights_summary(self, submission_data: Dict[str, Any]) -> str:
         """
         Generate a natural language summary of facility insights
         """
-        facility_name = submission_data.get(
-            "facility_name", "Unknown Facility")
-        state = submission_data.get("state", "Unknown State")
-        condition = submission_data.get("facility_condition", "Unknown")
-
-        # Analyze various aspects
-        predictions = self.predict_facility_needs(submission_data)
-        anomalies = self.detect_data_anomalies(submission_data)
+        facts = parse_submission(submission_data)
+        return self._summarize(facts, self._predict_needs(facts), self._detect_anomalies(facts))
 
+    def _summarize(self, facts: SubmissionFacts, predictions: Dict[str, Any],
+                   anomalies: List[Dict[str, Any]]) -> str:
         summary_parts = [
-            f"Facility: {facility_name} in {state}",
-            f"Condition: {condition}",
+            f"Facility: {facts.facility_name} in {facts.state}",
+            f"Condition: {facts.condition}",
         ]
 
         if predictions["risk_factors"]:
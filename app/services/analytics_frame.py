@@ -0,0 +1,184 @@
+"""
+Columnar (pandas) engine for the detailed analytics report.
+One SELECT loads the report columns into a DataFrame: categorical dtypes
+for the low-cardinality text columns, the derived feature columns as
+numbers, and each JSON section exploded once into a long (row, key, value)
+frame whose values are parsed a single time. The report is then a set of
+value_counts/groupby reductions over those frames.
+
+Used instead of the SQL engine (analytics_service.build_detailed_analytics)
+when ANALYTICS_ENGINE=frame; both produce the same ReportFacts.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.submission import FormSubmission
+from app.services.analytics_service import (
+    SERVICE_OFFERED_VALUES, ReportFacts, _merge_titles, assemble_detailed_analytics
+)
+from app.services.submission_features import (
+    SATISFACTION_KEYS, STAFF_KEYS, as_count, as_score
+)
+
+CATEGORICAL_COLUMNS = (
+    "state", "lga", "geopolitical_zone", "facility_condition", "ownership_type",
+    "assessment_type", "has_health_workers",
+)
+NUMERIC_COLUMNS = ("total_staff", "total_patients", "funding_amount")
+FLAG_COLUMNS = ("has_power", "has_water", "has_bhcpf", "has_impact_funding")
+SECTION_COLUMNS = (
+    "infrastructure_data", "human_resources_data", "services_data",
+    "satisfaction_survey_data",
+)
+
+# Report distribution name -> categorical column
+DISTRIBUTIONS = {
+    "condition": "facility_condition",
+    "ownership": "ownership_type",
+    "assessment_type": "assessment_type",
+    "health_workers": "has_health_workers",
+    "zone": "geopolitical_zone",
+}
+
+
+def load_submission_frame(db: Session) -> pd.DataFrame:
+    """Every submission's report columns, typed once"""
+    columns = CATEGORICAL_COLUMNS + NUMERIC_COLUMNS + FLAG_COLUMNS + SECTION_COLUMNS
+    rows = db.execute(select(*(getattr(FormSubmission, c) for c in columns))).all()
+    frame = pd.DataFrame.from_records(rows, columns=columns)
+
+    for name in CATEGORICAL_COLUMNS:
+        frame[name] = frame[name].astype("category")
+    for name in NUMERIC_COLUMNS:
+        frame[name] = pd.to_numeric(frame[name], errors="coerce")
+    for name in FLAG_COLUMNS:
+        frame[name] = frame[name].eq(True)
+    return frame
+
+
+def explode_section(section: pd.Series) -> pd.DataFrame:
+    """Long frame with one (row, key, value) per member of a JSON object column"""
+    rows, keys, values = [], [], []
+    for row, data in zip(section.index, section.array):
+        if isinstance(data, dict):
+            rows.extend([row] * len(data))
+            keys.extend(data.keys())
+            values.extend(data.values())
+    return pd.DataFrame({
+        "row": np.asarray(rows, dtype=np.int64),
+        "key": pd.Categorical(keys),
+        "value": pd.Series(values, dtype=object),
+    })
+
+
+def _key_mask(keys: pd.Series, words) -> np.ndarray:
+    """Rows whose key contains any of `words`, tested once per distinct key"""
+    lowered = keys.cat.categories.str.lower()
+    hit = np.zeros(len(lowered), dtype=bool)
+    for word in words:
+        hit |= lowered.str.contains(word, regex=False)
+    return hit[keys.cat.codes.to_numpy()] if len(hit) else np.zeros(len(keys), dtype=bool)
+
+
+def _parse_values(values: pd.Series, parse) -> pd.Series:
+    """`parse` applied once per distinct value, as floats (NaN where it gave None)"""
+    try:
+        codes, uniques = pd.factorize(values)
+    except TypeError:  # unhashable members (lists, objects)
+        return pd.to_numeric(values.map(parse), errors="coerce")
+    # The trailing NaN is what code -1 (a missing value) indexes
+    parsed = np.array([np.nan if (v := parse(u)) is None else v for u in uniques] + [np.nan],
+                      dtype=float)
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def _sum_by_key(keys: pd.Series, values: pd.Series) -> List[Tuple[str, float]]:
+    sums = values.groupby(keys, observed=True).sum()
+    return list(zip(sums.index, sums.to_numpy()))
+
+
+def _yes_or_truthy_count(members: pd.DataFrame, yes_key: str, truthy_key: str) -> int:
+    """Facilities where section[yes_key] == "Yes" or section[truthy_key] is truthy"""
+    key, value = members["key"], members["value"]
+    yes = (key == yes_key).to_numpy() & value.eq("Yes").to_numpy()
+    is_truthy_key = (key == truthy_key).to_numpy()
+    truthy = np.zeros(len(members), dtype=bool)
+    truthy[is_truthy_key] = value[is_truthy_key].map(bool).to_numpy(dtype=bool)
+    return int(members["row"][yes | truthy].nunique())
+
+
+def _present(column: pd.Series) -> pd.Series:
+    return column.notna() & column.astype(object).ne("")
+
+
+def _distribution(column: pd.Series) -> List[Tuple[str, int]]:
+    """Value counts in value order, like the SQL engine's GROUP BY"""
+    counts = column.value_counts(sort=False)
+    return [(value, int(count)) for value, count in counts.items()
+            if count and value != ""]
+
+
+def build_detailed_analytics_frame(db: Session) -> Dict[str, Any]:
+    """Compute the /dashboard/detailed-analytics report with pandas"""
+    frame = load_submission_frame(db)
+
+    # Facility-level totals from the typed columns
+    staff = frame["total_staff"]
+    staffed = staff > 0
+    funding_by_state = frame.groupby("state", observed=True)["funding_amount"].sum(min_count=1)
+
+    # JSON sections: explode once, parse each value once
+    infra = explode_section(frame["infrastructure_data"])
+
+    hr = explode_section(frame["human_resources_data"])
+    hr = hr[_key_mask(hr["key"], STAFF_KEYS)]
+    hr_counts = _parse_values(hr["value"], as_count)
+    counted = hr_counts.notna()
+
+    services = explode_section(frame["services_data"])
+    # Per value: the .str accessor refuses a column with no strings in it
+    offered = services["value"].map(
+        lambda v: isinstance(v, str) and v.lower() in SERVICE_OFFERED_VALUES
+    ).astype(bool)
+
+    survey = explode_section(frame["satisfaction_survey_data"])
+    survey = survey[_key_mask(survey["key"], SATISFACTION_KEYS)]
+    scores = _parse_values(survey["value"], as_score)
+    scored = scores.notna()
+    score_keys = survey["key"][scored]
+
+    return assemble_detailed_analytics(ReportFacts(
+        total_submissions=len(frame),
+        complete_data=int((_present(frame["facility_condition"])
+                           & _present(frame["ownership_type"])).sum()),
+        distributions={name: _distribution(frame[column])
+                       for name, column in DISTRIBUTIONS.items()},
+        bhcpf_facilities=int(frame["has_bhcpf"].sum()),
+        impact_facilities=int(frame["has_impact_funding"].sum()),
+        total_funding_amount=float(frame["funding_amount"].sum()),
+        funding_by_state={state: float(amount)
+                          for state, amount in funding_by_state.items()
+                          if state and not pd.isna(amount)},
+        has_power=int(frame["has_power"].sum()),
+        has_water=int(frame["has_water"].sum()),
+        has_internet=_yes_or_truthy_count(infra, "has_internet", "internet_available"),
+        has_pharmacy=_yes_or_truthy_count(infra, "has_pharmacy", "pharmacy_available"),
+        revitalization_count=_yes_or_truthy_count(infra, "revitalization", "revitalized"),
+        total_staff=int(staff[staffed].sum()),
+        facilities_with_staff=int(staffed.sum()),
+        staff_by_type={k: int(v) for k, v in _merge_titles(
+            _sum_by_key(hr["key"][counted], hr_counts[counted])).items()},
+        total_patients=int(frame["total_patients"].sum()),
+        services_offered=_merge_titles(
+            (k, int(v)) for k, v in _sum_by_key(services["key"][offered],
+                                                 offered[offered].astype(int))),
+        satisfaction_sums={k: float(v) for k, v in _merge_titles(
+            _sum_by_key(score_keys, scores[scored])).items()},
+        satisfaction_counts=_merge_titles(
+            (k, int(v)) for k, v in score_keys.value_counts().items() if v),
+    ))
@@ -0,0 +1,474 @@
+"""
+Detailed analytics computed in the database.
+The JSON section columns are read with database-side JSON functions
+(json_extract/json_each on SQLite, jsonb operators on PostgreSQL) so the
+report never loads FormSubmission objects. Per-facility totals come from
+the derived feature columns (app/services/submission_features.py); only
+the per-key breakdowns still walk the JSON. JsonDialect hides the backend
+differences; the value semantics (what counts as "Yes", a staff count, a
+score, an amount) are defined once on top of it so both backends return
+identical results.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import (
+    BigInteger, Float, String, and_, case, cast, column, false, func,
+    literal, literal_column, or_, select, true, union_all
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.submission import FormSubmission
+from app.services.submission_features import (
+    LEADING_FLOAT_PATTERN, LEADING_INT_PATTERN, MAX_COUNT, SATISFACTION_KEYS,
+    STAFF_KEYS
+)
+
+SERVICE_OFFERED_VALUES = ("yes", "true", "available")
+
+
+@dataclass
+class JsonValue:
+    """SQL expressions describing one JSON value"""
+    # One of: string, number, boolean, null, array, object (NULL when absent)
+    kind: Any
+    # String content for strings, literal text for numbers
+    text: Any
+    number: Any
+    is_true: Any
+    is_empty_container: Any
+
+
+@dataclass
+class ReportFacts:
+    """Aggregates behind the detailed analytics report, however computed.
+    Per-key dicts are keyed by display title; distributions map a
+    dimension name to (value, count) pairs."""
+    total_submissions: int
+    complete_data: int
+    distributions: Dict[str, List[Tuple[str, int]]]
+    bhcpf_facilities: int
+    impact_facilities: int
+    total_funding_amount: float
+    funding_by_state: Dict[str, float]
+    has_power: int
+    has_water: int
+    has_internet: int
+    has_pharmacy: int
+    revitalization_count: int
+    total_staff: int
+    facilities_with_staff: int
+    staff_by_type: Dict[str, int]
+    total_patients: int
+    services_offered: Dict[str, int]
+    satisfaction_sums: Dict[str, float]
+    satisfaction_counts: Dict[str, int]
+
+
+class JsonDialect(ABC):
+    """Backend-specific JSON access; subclasses implement the primitives"""
+
+    @abstractmethod
+    def get(self, col, key: str) -> JsonValue:
+        """The value stored under `key` in a JSON object column"""
+
+    @abstractmethod
+    def each(self, col) -> Tuple[Any, Any, JsonValue]:
+        """(from clause, key, value) iterating the members of a JSON object column"""
+
+    @abstractmethod
+    def kind(self, col):
+        """JSON kind of a whole column value: object, array, string, number, boolean or null"""
+
+    @abstractmethod
+    def leading_int(self, text):
+        """The leading integer of a string that starts with one"""
+
+    @abstractmethod
+    def leading_float(self, text):
+        """The leading decimal number of a string that starts with one"""
+
+    @abstractmethod
+    def to_int(self, number):
+        """A JSON number truncated towards zero, like int()"""
+
+    # Shared semantics, mirroring Python truthiness and int()/float() parsing
+
+    def truthy(self, value: JsonValue):
+        return case(
+            (value.kind == "boolean", value.is_true),
+            (value.kind == "number", value.number != 0),
+            (value.kind == "string", value.text != ""),
+            (value.kind.in_(("array", "object")), ~value.is_empty_container),
+            else_=false()
+        )
+
+    def equals(self, value: JsonValue, expected: str):
+        return and_(value.kind == "string", value.text == expected)
+
+    def as_count(self, value: JsonValue):
+        """int(value), or int(first word) for strings; NULL when that would fail
+        or the count is beyond MAX_COUNT (checked before the integer cast)"""
+        def in_range(number):
+            return func.abs(number) < MAX_COUNT + 1
+
+        return case(
+            (and_(value.kind == "number", in_range(value.number)),
+             self.to_int(value.number)),
+            (value.kind == "boolean", case((value.is_true, 1), else_=0)),
+            (and_(value.kind == "string", value.text.regexp_match(LEADING_INT_PATTERN),
+                  in_range(self.leading_float(value.text))),
+             self.leading_int(value.text)),
+            else_=None
+        )
+
+    def as_score(self, value: JsonValue):
+        """float(value), or float(first word) for strings; NULL when that would fail"""
+        return case(
+            (value.kind == "number", cast(value.number, Float)),
+            (value.kind == "boolean", case((value.is_true, 1.0), else_=0.0)),
+            (and_(value.kind == "string", value.text.regexp_match(LEADING_FLOAT_PATTERN)),
+             self.leading_float(value.text)),
+            else_=None
+        )
+
+
+class SqliteJson(JsonDialect):
+    """SQLite JSON1 functions; json_type() names are mapped onto JSON kinds"""
+
+    def _kind(self, json_type):
+        return case(
+            (json_type.in_(("true", "false")), "boolean"),
+            (json_type.in_(("integer", "real")), "number"),
+            (json_type == "text", "string"),
+            else_=json_type
+        )
+
+    def get(self, col, key: str) -> JsonValue:
+        path = f'$."{key}"'
+        json_type = func.json_type(col, path)
+        extracted = func.json_extract(col, path)
+        return JsonValue(
+            kind=self._kind(json_type),
+            text=extracted,
+            number=extracted,
+            is_true=json_type == "true",
+            is_empty_container=or_(extracted == "{}", extracted == "[]")
+        )
+
+    def each(self, col):
+        # json_each also walks arrays; only objects count as a section
+        members = func.json_each(
+            case((func.json_type(col) == "object", col), else_=None)
+        ).table_valued("key", "value", "type").alias()
+        return members, members.c.key, JsonValue(
+            kind=self._kind(members.c.type),
+            text=members.c.value,
+            number=members.c.value,
+            is_true=members.c.type == "true",
+            is_empty_container=or_(members.c.value == "{}", members.c.value == "[]")
+        )
+
+    def kind(self, col):
+        return self._kind(func.json_type(col))
+
+    # CAST reads the leading number and ignores the rest ("5 nurses" -> 5);
+    # the regex guards above make sure there is one
+
+    def leading_int(self, text):
+        return cast(text, BigInteger)
+
+    def leading_float(self, text):
+        return cast(text, Float)
+
+    def to_int(self, number):
+        return cast(number, BigInteger)
+
+
+class PostgresJson(JsonDialect):
+    """PostgreSQL jsonb operators; the section columns are stored as `json`
+    and cast to `jsonb` where they are read"""
+
+    def _jsonb(self, col):
+        return cast(col, JSONB)
+
+    def _value(self, value) -> JsonValue:
+        text = value.op("#>>", return_type=String)(literal_column("'{}'"))
+        return JsonValue(
+            kind=func.jsonb_typeof(value),
+            text=text,
+            number=cast(text, Float),
+            is_true=text == "true",
+            is_empty_container=or_(
+                value == cast(literal("{}"), JSONB),
+                value == cast(literal("[]"), JSONB)
+            )
+        )
+
+    def get(self, col, key: str) -> JsonValue:
+        return self._value(self._jsonb(col).op("->", return_type=JSONB)(literal(key)))
+
+    def each(self, col):
+        # jsonb_each raises on non-objects, so feed it an empty object instead
+        doc = self._jsonb(col)
+        members = func.jsonb_each(
+            case((func.jsonb_typeof(doc) == "object", doc),
+                 else_=cast(literal("{}"), JSONB))
+        ).table_valued(column("key", String), column("value", JSONB)).alias()
+        return members, members.c.key, self._value(members.c.value)
+
+    def kind(self, col):
+        return func.jsonb_typeof(self._jsonb(col))
+
+    def leading_int(self, text):
+        return cast(func.substring(text, r"^\s*([+-]?[0-9]+)"), BigInteger)
+
+    def leading_float(self, text):
+        return cast(func.substring(
+            text, r"^\s*([+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)"), Float)
+
+    def to_int(self, number):
+        return cast(func.trunc(number), BigInteger)
+
+
+def get_json_dialect(db: Session) -> JsonDialect:
+    if db.get_bind().dialect.name == "postgresql":
+        return PostgresJson()
+    return SqliteJson()
+
+
+def _key_matches(key, words) -> Any:
+    return or_(*(func.lower(key).like(f"%{word}%") for word in words))
+
+
+def _title(key: str) -> str:
+    return key.replace('_', ' ').title()
+
+
+def _merge_titles(rows) -> Dict[str, Any]:
+    """Sum per-key totals under their display name ("staff_count" -> "Staff Count")"""
+    merged = {}
+    for key, value in rows:
+        title = _title(key)
+        merged[title] = merged.get(title, 0) + value
+    return merged
+
+
+def _percentage(part, total) -> float:
+    return round((part / total * 100) if total > 0 else 0, 2)
+
+
+def _distributions(db: Session) -> Dict[str, List[Tuple[str, int]]]:
+    """Value counts for the categorical facility columns, in one statement"""
+    dimensions = {
+        "condition": FormSubmission.facility_condition,
+        "ownership": FormSubmission.ownership_type,
+        "assessment_type": FormSubmission.assessment_type,
+        "health_workers": FormSubmission.has_health_workers,
+        "zone": FormSubmission.geopolitical_zone,
+    }
+    query = union_all(*(
+        select(literal(name).label("dimension"), col.label("value"),
+               func.count().label("count"))
+        .where(col.isnot(None), col != "")
+        .group_by(col)
+        for name, col in dimensions.items()
+    ))
+
+    result = {name: [] for name in dimensions}
+    for dimension, value, count in db.execute(query):
+        result[dimension].append((value, count))
+    return result
+
+
+def build_detailed_analytics(db: Session) -> Dict[str, Any]:
+    """Compute the /dashboard/detailed-analytics report in SQL"""
+    dialect = get_json_dialect(db)
+    S = FormSubmission
+
+    def flag(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    def yes_or_truthy(column, yes_key, truthy_key):
+        return or_(dialect.equals(dialect.get(column, yes_key), "Yes"),
+                   dialect.truthy(dialect.get(column, truthy_key)))
+
+    # Facility-level flags and funding, grouped by state so funding_by_state
+    # comes out of the same scan
+    facility_rows = db.execute(
+        select(
+            S.state,
+            func.count(S.id),
+            flag(S.has_bhcpf),
+            flag(S.has_impact_funding),
+            flag(S.has_power),
+            flag(S.has_water),
+            flag(yes_or_truthy(S.infrastructure_data, "has_internet", "internet_available")),
+            flag(yes_or_truthy(S.infrastructure_data, "has_pharmacy", "pharmacy_available")),
+            flag(yes_or_truthy(S.infrastructure_data, "revitalization", "revitalized")),
+            flag(and_(S.facility_condition.isnot(None), S.facility_condition != "",
+                      S.ownership_type.isnot(None), S.ownership_type != "")),
+            func.sum(S.funding_amount),
+            func.coalesce(func.sum(case((S.total_staff > 0, S.total_staff), else_=0)), 0),
+            flag(S.total_staff > 0),
+            func.coalesce(func.sum(S.total_patients), 0),
+        ).group_by(S.state)
+    ).all()
+
+    total_submissions = 0
+    totals = [0] * 8
+    total_funding_amount = 0
+    funding_by_state = {}
+    total_staff = facilities_with_staff = total_patients = 0
+    for state, count, *flags, state_amount, staff, staffed, patients in facility_rows:
+        total_submissions += count
+        totals = [a + b for a, b in zip(totals, flags)]
+        total_staff += staff
+        facilities_with_staff += staffed
+        total_patients += patients
+        if state_amount is not None:
+            total_funding_amount += state_amount
+            if state:
+                funding_by_state[state] = state_amount
+    (bhcpf_facilities, impact_facilities, has_power, has_water, has_internet,
+     has_pharmacy, revitalization_count, complete_data) = totals
+
+    # Human resources: staff counts per key
+    members, key, value = dialect.each(S.human_resources_data)
+    staff = dialect.as_count(value)
+    staff_by_type = _merge_titles(db.execute(
+        select(key, func.sum(staff)).select_from(S).join(members, true())
+        .where(_key_matches(key, STAFF_KEYS), staff.isnot(None)).group_by(key)
+    ).all())
+
+    # Services offered, per key
+    members, key, value = dialect.each(S.services_data)
+    offered = and_(value.kind == "string",
+                   func.lower(value.text).in_(SERVICE_OFFERED_VALUES))
+    services_offered = _merge_titles(db.execute(
+        select(key, func.count()).select_from(S).join(members, true())
+        .where(offered).group_by(key)
+    ).all())
+
+    # Patient satisfaction: score sums and counts per key
+    members, key, value = dialect.each(S.satisfaction_survey_data)
+    score = dialect.as_score(value)
+    satisfaction_rows = db.execute(
+        select(key, func.sum(score), func.count(score)).select_from(S).join(members, true())
+        .where(_key_matches(key, SATISFACTION_KEYS), score.isnot(None))
+        .group_by(key)
+    ).all()
+    satisfaction_sums = _merge_titles((k, s) for k, s, _ in satisfaction_rows)
+    satisfaction_counts = _merge_titles((k, c) for k, _, c in satisfaction_rows)
+
+    return assemble_detailed_analytics(ReportFacts(
+        total_submissions=total_submissions,
+        complete_data=complete_data,
+        distributions=_distributions(db),
+        bhcpf_facilities=bhcpf_facilities,
+        impact_facilities=impact_facilities,
+        total_funding_amount=total_funding_amount,
+        funding_by_state=funding_by_state,
+        has_power=has_power,
+        has_water=has_water,
+        has_internet=has_internet,
+        has_pharmacy=has_pharmacy,
+        revitalization_count=revitalization_count,
+        total_staff=total_staff,
+        facilities_with_staff=facilities_with_staff,
+        staff_by_type=staff_by_type,
+        total_patients=total_patients,
+        services_offered=services_offered,
+        satisfaction_sums=satisfaction_sums,
+        satisfaction_counts=satisfaction_counts,
+    ))
+
+
+def assemble_detailed_analytics(facts: ReportFacts) -> Dict[str, Any]:
+    """Shape report facts into the /dashboard/detailed-analytics response"""
+    total_responses = sum(facts.satisfaction_counts.values())
+
+    return {
+        "facility_analysis": {
+            "condition_distribution": [
+                {"condition": k, "count": v, "percentage": _percentage(v, facts.total_submissions)}
+                for k, v in facts.distributions["condition"]
+            ],
+            "ownership_distribution": [
+                {"type": k, "count": v, "percentage": _percentage(v, facts.total_submissions)}
+                for k, v in facts.distributions["ownership"]
+            ],
+            "assessment_type_distribution": [
+                {"type": k, "count": v}
+                for k, v in facts.distributions["assessment_type"]
+            ],
+            "health_workers_distribution": [
+                {"status": k, "count": v, "percentage": _percentage(v, facts.total_submissions)}
+                for k, v in facts.distributions["health_workers"]
+            ],
+            "geopolitical_zone_distribution": [
+                {"zone": k, "count": v}
+                for k, v in facts.distributions["zone"]
+            ]
+        },
+        "funding_analysis": {
+            "bhcpf_facilities": facts.bhcpf_facilities,
+            "bhcpf_percentage": _percentage(facts.bhcpf_facilities, facts.total_submissions),
+            "impact_facilities": facts.impact_facilities,
+            "impact_percentage": _percentage(facts.impact_facilities, facts.total_submissions),
+            "total_funding_amount": round(facts.total_funding_amount, 2),
+            "average_funding_per_facility": round((facts.total_funding_amount / facts.total_submissions) if facts.total_submissions > 0 else 0, 2),
+            "funding_by_state": [
+                {"state": k, "amount": round(v, 2)}
+                for k, v in sorted(facts.funding_by_state.items(), key=lambda x: x[1], reverse=True)[:10]
+            ]
+        },
+        "infrastructure_analysis": {
+            "facilities_with_power": facts.has_power,
+            "power_percentage": _percentage(facts.has_power, facts.total_submissions),
+            "facilities_with_water": facts.has_water,
+            "water_percentage": _percentage(facts.has_water, facts.total_submissions),
+            "facilities_with_internet": facts.has_internet,
+            "internet_percentage": _percentage(facts.has_internet, facts.total_submissions),
+            "facilities_with_pharmacy": facts.has_pharmacy,
+            "pharmacy_percentage": _percentage(facts.has_pharmacy, facts.total_submissions),
+            "revitalized_facilities": facts.revitalization_count,
+            "revitalization_percentage": _percentage(facts.revitalization_count, facts.total_submissions)
+        },
+        "human_resources_analysis": {
+            "total_staff": facts.total_staff,
+            "facilities_with_staff": facts.facilities_with_staff,
+            "average_staff_per_facility": round((facts.total_staff / facts.facilities_with_staff) if facts.facilities_with_staff > 0 else 0, 2),
+            "staff_by_type": [
+                {"type": k, "count": v}
+                for k, v in sorted(facts.staff_by_type.items(), key=lambda x: x[1], reverse=True)[:10]
+            ]
+        },
+        "services_utilization": {
+            "total_patients": facts.total_patients,
+            "average_patients_per_facility": round((facts.total_patients / facts.total_submissions) if facts.total_submissions > 0 else 0, 2),
+            "top_services_offered": [
+                {"service": k, "facilities": v, "percentage": _percentage(v, facts.total_submissions)}
+                for k, v in sorted(facts.services_offered.items(), key=lambda x: x[1], reverse=True)[:10]
+            ]
+        },
+        "patient_satisfaction": {
+            "average_score": round((sum(facts.satisfaction_sums.values()) / total_responses) if total_responses else 0, 2),
+            "total_responses": total_responses,
+            "scores_by_category": {
+                k: {
+                    "average": round((facts.satisfaction_sums[k] / count) if count else 0, 2),
+                    "count": count
+                }
+                for k, count in facts.satisfaction_counts.items()
+            }
+        },
+        "summary": {
+            "total_facilities": facts.total_submissions,
+            "facilities_with_complete_data": facts.complete_data,
+            "data_completeness_percentage": _percentage(facts.complete_data, facts.total_submissions)
+        }
+    }
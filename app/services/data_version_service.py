@@ -0,0 +1,65 @@
+"""
+Data versions for cache invalidation.
+Every flush that inserts, updates or deletes a FormSubmission increments
+data_versions["submissions"] in the same transaction, so all API workers
+see the new version as soon as the write commits. Cached responses
+(app/core/cache.py) include the version in their key and ETag.
+
+A version is spread over VERSION_SHARDS rows and read as their sum, so
+concurrent writers (e.g. submit_batch chunks) lock different rows instead
+of all queueing on one. Each session always bumps the same shard, so a
+transaction never holds two shard locks that another could take in the
+opposite order. A shard row that is missing (e.g. deleted by hand) is
+recreated by the next bump instead of silently dropping it.
+"""
+
+import random
+
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.data_version import DataVersion
+from app.models.submission import FormSubmission
+
+SUBMISSIONS = "submissions"
+
+# Rows per version; each one is seeded by a migration (0016)
+VERSION_SHARDS = 16
+
+
+def get_data_version(db: Session, name: str = SUBMISSIONS) -> int:
+    """Current version; read it before the data it guards"""
+    return db.execute(
+        select(func.coalesce(func.sum(DataVersion.version), 0))
+        .where(DataVersion.name == name)
+    ).scalar()
+
+
+def bump_data_version(db: Session, name: str = SUBMISSIONS):
+    """Invalidate cached responses; for writes that bypass the ORM flush"""
+    shard = db.info.setdefault("data_version_shard", random.randrange(VERSION_SHARDS))
+    dialect = db.get_bind().dialect.name
+    insert_fn = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    db.connection().execute(
+        insert_fn(DataVersion)
+        .values(name=name, shard=shard, version=1)
+        .on_conflict_do_update(
+            index_elements=[DataVersion.name, DataVersion.shard],
+            set_={"version": DataVersion.version + 1}
+        )
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def track_data_changes(session: Session, flush_context, instances):
+    """Bump the submissions version when a flush writes any FormSubmission"""
+    changed = (
+        any(isinstance(obj, FormSubmission) for obj in session.new)
+        or any(isinstance(obj, FormSubmission) for obj in session.deleted)
+        or any(isinstance(obj, FormSubmission) and session.is_modified(obj)
+               for obj in session.dirty)
+    )
+    if changed:
+        bump_data_version(session)
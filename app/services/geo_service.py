@@ -0,0 +1,306 @@
+"""
+Geohash indexing, map clustering and compact map point encodings.
+Every submission with coordinates gets a geohash computed at write time
+(before_flush listener, like the derived features). The indexed column
+backs both bbox filtering (a few geohash prefix ranges covering the box)
+and clustering (GROUP BY a geohash prefix whose length follows the zoom).
+"""
+
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, event, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.submission import FormSubmission
+from app.services.data_version_service import bump_data_version
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Stored precision: 9 characters is a cell of roughly 5 x 5 metres
+GEOHASH_PRECISION = 9
+# Sorts after every geohash character under bytewise comparison, so
+# [prefix, prefix + END) is a prefix range. The column uses the "C"
+# collation on PostgreSQL for this (migration 0014); a linguistic collation
+# would sort "{" before the digits and letters
+PREFIX_END = "{"
+
+# At and above this zoom level the map gets individual facilities
+POINTS_MIN_ZOOM = 13
+# Most geohash prefix ranges used to pre-filter a bbox through the index
+MAX_BBOX_CELLS = 16
+
+BACKFILL_BATCH_SIZE = 500
+
+BBox = Tuple[float, float, float, float]
+
+
+def encode_geohash(latitude: float, longitude: float,
+                   precision: int = GEOHASH_PRECISION) -> Optional[str]:
+    """Standard base-32 geohash; None for missing or out-of-range coordinates"""
+    if latitude is None or longitude is None:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell"""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def precision_for_zoom(zoom: int) -> int:
+    """Cluster cell size that gives a readable number of markers per screen"""
+    return max(1, min(GEOHASH_PRECISION - 2, zoom // 2 + 1))
+
+
+def parse_bbox(value: str) -> BBox:
+    """"min_lon,min_lat,max_lon,max_lat" (GeoJSON order); raises ValueError"""
+    parts = [float(p) for p in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must have four comma-separated numbers")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat within world bounds")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def bbox_cells(bbox: BBox, max_cells: int = MAX_BBOX_CELLS) -> List[str]:
+    """The finest set of at most `max_cells` geohash prefixes covering a bbox"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    best = [""]
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(precision)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        cols = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * cols > max_cells:
+            break
+        cells = set()
+        for row in range(rows):
+            lat = min(min_lat + row * height, max_lat)
+            for col in range(cols):
+                lon = min(min_lon + col * width, max_lon)
+                cells.add(encode_geohash(lat, lon, precision))
+        # Corners that a step landed short of
+        cells.add(encode_geohash(max_lat, max_lon, precision))
+        cells.add(encode_geohash(min_lat, max_lon, precision))
+        cells.add(encode_geohash(max_lat, min_lon, precision))
+        best = sorted(cells)
+    return best
+
+
+def bbox_filter(bbox: BBox):
+    """Index-friendly geohash ranges plus the exact coordinate test"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    S = FormSubmission
+    exact = and_(S.latitude.between(min_lat, max_lat),
+                 S.longitude.between(min_lon, max_lon))
+    cells = [cell for cell in bbox_cells(bbox) if cell]
+    if not cells:
+        return exact
+    return and_(
+        or_(*(and_(S.geohash >= cell, S.geohash < cell + PREFIX_END) for cell in cells)),
+        exact
+    )
+
+
+def query_facility_points(db: Session, bbox: Optional[BBox] = None) -> List[Tuple]:
+    """(latitude, longitude, name, state, lga, condition, id) per located facility"""
+    S = FormSubmission
+    query = select(S.latitude, S.longitude, S.facility_name, S.state, S.lga,
+                   S.facility_condition, S.id)
+    if bbox:
+        query = query.where(bbox_filter(bbox))
+    else:
+        query = query.where(S.latitude.isnot(None), S.longitude.isnot(None))
+    return db.execute(query).all()
+
+
+def points_as_objects(rows) -> Dict[str, Any]:
+    """One JSON object per facility (the original response shape)"""
+    return {
+        "facilities": [
+            {
+                "latitude": lat,
+                "longitude": lng,
+                "name": facility_name,
+                "state": state,
+                "lga": lga,
+                "condition": condition
+            }
+            for lat, lng, facility_name, state, lga, condition, _ in rows
+        ]
+    }
+
+
+def _microdegrees(value: float) -> int:
+    return int(round(value * 1_000_000))
+
+
+def _dictionary_encode(values) -> Tuple[List[Any], List[int]]:
+    """(distinct values, per-row index into them)"""
+    lookup = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    return list(lookup), codes
+
+
+def points_as_columns(rows, include_names: bool = False) -> Dict[str, Any]:
+    """Parallel arrays: coordinates as int microdegrees, state/LGA/condition
+    dictionary-encoded (`values[codes[i]]` is row i's value). Names are the
+    bulk of the payload, so rows carry their submission id unless asked."""
+    columns = list(zip(*rows)) or [()] * 7
+    lat, lng, names, states, lgas, conditions, ids = columns
+    result = {
+        "count": len(rows),
+        "id": list(ids),
+        "latitude_e6": [_microdegrees(v) for v in lat],
+        "longitude_e6": [_microdegrees(v) for v in lng],
+    }
+    if include_names:
+        result["name"] = list(names)
+    for key, values in (("state", states), ("lga", lgas), ("condition", conditions)):
+        dictionary, codes = _dictionary_encode(values)
+        result[key] = {"values": dictionary, "codes": codes}
+    return result
+
+
+def points_as_binary(rows, include_names: bool = False) -> bytes:
+    """Little-endian buffer, laid out so typed arrays can view it in place:
+        b"PFM1", uint32 count N, uint32 trailer length T,
+        int32[N] submission id,
+        int32[N] latitude and int32[N] longitude in microdegrees,
+        uint16[N] state, lga and condition codes,
+        T bytes of UTF-8 JSON {"state": [...], "lga": [...], "condition": [...]}
+        holding the dictionaries (plus "name": [...] per row if requested).
+    """
+    columns = points_as_columns(rows, include_names)
+    trailer = {"name": columns["name"]} if include_names else {}
+    for key in ("state", "lga", "condition"):
+        trailer[key] = columns[key]["values"]
+        if len(trailer[key]) > 0xFFFF:
+            raise ValueError(f"too many distinct {key} values for uint16 codes")
+    trailer_bytes = json.dumps(trailer, separators=(",", ":")).encode()
+
+    arrays = [array("i", columns[key]) for key in ("id", "latitude_e6", "longitude_e6")]
+    arrays += [array("H", columns[key]["codes"]) for key in ("state", "lga", "condition")]
+    if sys.byteorder != "little":
+        for values in arrays:
+            values.byteswap()
+
+    return b"".join(
+        [b"PFM1", struct.pack("<II", len(rows), len(trailer_bytes))]
+        + [values.tobytes() for values in arrays]
+        + [trailer_bytes]
+    )
+
+
+def get_facility_clusters(db: Session, precision: int,
+                          bbox: Optional[BBox] = None) -> List[Dict[str, Any]]:
+    """Facilities grouped by geohash prefix, with centroids and condition counts"""
+    S = FormSubmission
+    cell = func.substr(S.geohash, 1, precision)
+    query = select(
+        cell, S.facility_condition, func.count(),
+        func.sum(S.latitude), func.sum(S.longitude)
+    ).where(S.geohash.isnot(None)).group_by(cell, S.facility_condition)
+    if bbox:
+        query = query.where(bbox_filter(bbox))
+
+    clusters = {}
+    for geohash, condition, count, lat_sum, lon_sum in db.execute(query):
+        cluster = clusters.setdefault(geohash, {
+            "geohash": geohash, "count": 0, "lat_sum": 0.0, "lon_sum": 0.0,
+            "conditions": {}
+        })
+        cluster["count"] += count
+        cluster["lat_sum"] += lat_sum
+        cluster["lon_sum"] += lon_sum
+        key = condition or "Unknown"
+        cluster["conditions"][key] = cluster["conditions"].get(key, 0) + count
+
+    return [
+        {
+            "geohash": c["geohash"],
+            "latitude": c["lat_sum"] / c["count"],
+            "longitude": c["lon_sum"] / c["count"],
+            "count": c["count"],
+            "conditions": c["conditions"]
+        }
+        for c in sorted(clusters.values(), key=lambda c: c["count"], reverse=True)
+    ]
+
+
+def apply_geohash(submission: FormSubmission):
+    submission.geohash = encode_geohash(submission.latitude, submission.longitude)
+
+
+@event.listens_for(Session, "before_flush")
+def track_coordinate_changes(session: Session, flush_context, instances):
+    """Keep geohash in step with latitude/longitude"""
+    for obj in session.new:
+        if isinstance(obj, FormSubmission):
+            apply_geohash(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, FormSubmission):
+            attrs = inspect(obj).attrs
+            if attrs.latitude.history.has_changes() or attrs.longitude.history.has_changes():
+                apply_geohash(obj)
+
+
+def backfill_geohashes(db: Session) -> int:
+    """Geohash rows that have coordinates but no geohash; returns rows updated"""
+    table = FormSubmission.__table__
+    # updated_at is written back unchanged so the backfill doesn't look like an edit
+    stmt = (
+        update(table).where(table.c.id == bindparam("b_id"))
+        .values(geohash=bindparam("b_geohash"), updated_at=bindparam("b_updated_at"))
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.updated_at, table.c.latitude, table.c.longitude)
+            .where(table.c.id > last_id, table.c.geohash.is_(None),
+                   table.c.latitude.isnot(None), table.c.longitude.isnot(None))
+            .order_by(table.c.id).limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        params = [
+            {"b_id": row.id, "b_updated_at": row.updated_at,
+             "b_geohash": encode_geohash(row.latitude, row.longitude)}
+            for row in rows
+        ]
+        db.execute(stmt, params)
+        bump_data_version(db)
+        db.commit()
+
+        updated += len(rows)
+        last_id = rows[-1].id
+    return updated
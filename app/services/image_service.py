@@ -0,0 +1,154 @@
+"""
+Image derivative pipeline for uploaded facility photos and selfies.
+Resized, EXIF-stripped WebP copies are generated on a process pool after
+the upload response has been sent, so requests never wait on Pillow.
+A submission only carries derivative paths once the files exist: set at
+submit time if they were already written, otherwise by the background
+task when it finishes, provided the original it resized is still the file
+at that path.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.models.submission import FormSubmission
+
+logger = logging.getLogger(__name__)
+
+# Upload extensions we generate derivatives for
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
+
+# Derivative name -> longest side in pixels
+DERIVATIVE_SIZES = {
+    "thumbnail": settings.IMAGE_THUMBNAIL_SIZE,
+    "medium": settings.IMAGE_MEDIUM_SIZE,
+}
+
+# Submission image columns: "<field>_path" plus "<field>_<derivative>_path"
+IMAGE_FIELDS = ("facility_image", "facility_selfie")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def is_image(path: Optional[str]) -> bool:
+    """Whether a stored upload is an image we make derivatives for"""
+    return bool(path) and path.rsplit(".", 1)[-1].lower() in IMAGE_EXTENSIONS
+
+
+def derivative_paths(path: str) -> Dict[str, str]:
+    """Where the derivatives of an uploaded image are (or will be) stored"""
+    root, _ = os.path.splitext(path)
+    return {name: f"{root}_{name}.webp" for name in DERIVATIVE_SIZES}
+
+
+def file_signature(path: str) -> Tuple[int, int, int]:
+    """(inode, mtime, size) of a file; changes when the file is replaced"""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def existing_derivatives(path: Optional[str]) -> Dict[str, str]:
+    """Derivative paths of an image, or {} until every one of them has been written"""
+    if not is_image(path):
+        return {}
+    paths = derivative_paths(path)
+    return paths if all(os.path.exists(p) for p in paths.values()) else {}
+
+
+def create_derivatives(path: str) -> Dict[str, str]:
+    """
+    Write the resized derivatives of one image (runs in a worker process).
+    EXIF orientation is applied to the pixels first; the saved files carry
+    no EXIF (GPS, device) metadata.
+    """
+    targets = derivative_paths(path)
+
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+
+        for name, max_side in DERIVATIVE_SIZES.items():
+            derivative = image.copy()
+            derivative.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+            temp_path = f"{targets[name]}.part"
+            derivative.save(temp_path, format="WEBP",
+                            quality=settings.IMAGE_QUALITY)
+            os.replace(temp_path, targets[name])
+
+    return targets
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _executor
+
+
+async def record_derivatives(path: str, derivatives: Dict[str, str], uploaded_at: datetime,
+                             source: Tuple[int, int, int]) -> bool:
+    """
+    Store derivative paths on the submissions that reference an uploaded
+    image. Nothing is stored (False) if the original no longer has the
+    `source` signature the derivatives were made from: the file that
+    replaced it gets its own derivatives and records them itself.
+    """
+    table = FormSubmission.__table__
+    async with AsyncSessionLocal() as db:
+        try:
+            replaced = file_signature(path) != source
+        except FileNotFoundError:
+            replaced = True
+        if replaced:
+            logger.info("Not recording derivatives of %s: the original was replaced", path)
+            return False
+
+        for field in IMAGE_FIELDS:
+            # Only submissions created after the upload can reference it, which
+            # keeps the lookup on the created_at index
+            await db.execute(
+                update(table)
+                .where(table.c[f"{field}_path"] == path,
+                       table.c.created_at >= uploaded_at)
+                # updated_at is set to itself so this doesn't look like an edit
+                .values(updated_at=table.c.updated_at,
+                        **{f"{field}_{name}_path": derivative
+                           for name, derivative in derivatives.items()})
+            )
+        await db.commit()
+    return True
+
+
+async def generate_derivatives(path: str, uploaded_at: datetime) -> Optional[Dict[str, str]]:
+    """
+    Generate derivatives on the process pool, then record them on the
+    submissions already referencing the image (use as a background task).
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        source = file_signature(path)
+        derivatives = await loop.run_in_executor(_get_executor(), create_derivatives, path)
+        await record_derivatives(path, derivatives, uploaded_at, source)
+    except Exception:
+        logger.exception("Image derivative generation failed for %s", path)
+        return None
+    return derivatives
+
+
+def shutdown():
+    """Stop the worker processes (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
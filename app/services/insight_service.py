@@ -0,0 +1,60 @@
+"""
+Stored per-submission AI insights.
+The insights document for a submission is computed once and kept in
+submission_insights together with the submission's updated_at and the
+AIService ruleset version it was computed from. A read is a single indexed
+lookup; the document is recomputed (lazily, on that read) only when the
+submission was edited or RULESET_VERSION changed.
+"""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.insight import SubmissionInsight
+from app.models.submission import FormSubmission
+from app.services.ai_service import RULESET_VERSION, ai_service
+
+
+def build_submission_insights(submission: FormSubmission) -> Dict[str, Any]:
+    """Run every AIService analysis for one submission"""
+    return {
+        "submission_id": submission.id,
+        "facility_name": submission.facility_name,
+        "ai_analysis": ai_service.analyze_submission(submission.to_dict())
+    }
+
+
+def load_submission_insights(db: Session, submission_id: int) -> Optional[Dict[str, Any]]:
+    """The insights document, recomputed if stale; None if there is no such submission"""
+    S, I = FormSubmission, SubmissionInsight
+    row = db.execute(
+        select(S.updated_at, I.insights)
+        .outerjoin(I, and_(I.submission_id == S.id,
+                           I.ruleset_version == RULESET_VERSION,
+                           I.source_updated_at.is_not_distinct_from(S.updated_at)))
+        .where(S.id == submission_id)
+    ).first()
+    if row is None:
+        return None
+    if row.insights is not None:
+        return row.insights
+
+    submission = db.get(FormSubmission, submission_id)
+    insights = build_submission_insights(submission)
+    # Added on its own, not through submission.insight, so storing it
+    # doesn't count as a change to the submission
+    stored = db.get(SubmissionInsight, submission_id) or SubmissionInsight(
+        submission_id=submission_id)
+    stored.source_updated_at = submission.updated_at
+    stored.ruleset_version = RULESET_VERSION
+    stored.insights = insights
+    db.add(stored)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent read stored the same document first
+        db.rollback()
+    return insights
@@ -0,0 +1,154 @@
+"""
+Stored AI risk assessment.
+risk_priority, risk_score and anomaly_count, plus the recommendation codes
+in submission_recommendations, are computed with the AIService rules
+whenever a FormSubmission is inserted or one of the rule inputs changes
+(before_flush listener, like the derived features). The at-risk listing is
+then an indexed ORDER BY risk_score and the recommendation summary a
+GROUP BY code, instead of running the rules over every submission on each
+request.
+
+Recompute every row after changing the rules:
+    python -m app.services.risk_service backfill --all
+"""
+
+import sys
+from typing import Any, Dict, List
+
+from sqlalchemy import bindparam, delete, event, inspect, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.recommendation import SubmissionRecommendation
+from app.models.submission import FormSubmission
+from app.services.ai_service import (
+    CRITICAL_FIELDS, ai_service, load_facility_batch, recommendation_codes
+)
+from app.services.data_version_service import bump_data_version
+from app.services.submission_features import SOURCE_ATTRIBUTES
+
+# Submission attributes the needs and anomaly rules read. The feature
+# columns are left out: the rules derive them from the sections, so the
+# result doesn't depend on the order the before_flush listeners run in.
+RISK_ATTRIBUTES = tuple(dict.fromkeys(
+    CRITICAL_FIELDS
+    + ("latitude", "longitude", "has_health_workers")
+    + SOURCE_ATTRIBUTES
+))
+
+# High priority outranks any number of risk factors (at most 3), which
+# outrank any number of anomalies (at most 6)
+HIGH_PRIORITY_SCORE = 100
+RISK_FACTOR_SCORE = 10
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def risk_columns(predictions: Dict[str, Any], anomalies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """risk_priority, risk_score and anomaly_count for one facility.
+    The score is 0 unless the facility is at risk (high priority or any anomaly)."""
+    high = predictions["priority_level"] == "high"
+    score = 0
+    if high or anomalies:
+        score = (HIGH_PRIORITY_SCORE * high
+                 + RISK_FACTOR_SCORE * len(predictions["risk_factors"])
+                 + len(anomalies))
+    return {
+        "risk_priority": predictions["priority_level"],
+        "risk_score": score,
+        "anomaly_count": len(anomalies),
+    }
+
+
+def apply_risk(submission: FormSubmission):
+    data = {attr: getattr(submission, attr) for attr in RISK_ATTRIBUTES}
+    predictions, anomalies = ai_service.assess(data)
+    for name, value in risk_columns(predictions, anomalies).items():
+        setattr(submission, name, value)
+
+    codes = recommendation_codes(predictions)
+    current = {r.code: r for r in submission.recommendations}
+    if set(current) != set(codes):
+        submission.recommendations = [
+            current.get(code) or SubmissionRecommendation(code=code) for code in codes
+        ]
+
+
+@event.listens_for(Session, "before_flush")
+def track_risk_changes(session: Session, flush_context, instances):
+    """Reassess new submissions and ones whose rule inputs changed"""
+    for obj in session.new:
+        if isinstance(obj, FormSubmission):
+            apply_risk(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, FormSubmission):
+            attrs = inspect(obj).attrs
+            if any(attrs[attr].history.has_changes() for attr in RISK_ATTRIBUTES):
+                apply_risk(obj)
+
+
+def backfill_risk(db: Session, recompute_all: bool = False) -> int:
+    """Fill the risk columns and recommendation codes in batches with the
+    batch rules; returns rows updated.
+
+    By default only rows that were never assessed (risk_score IS NULL) are
+    touched, so this is cheap to run on every startup.
+    """
+    table = FormSubmission.__table__
+    # updated_at is set to itself so the backfill doesn't look like an edit
+    stmt = (
+        update(table).where(table.c.id == bindparam("b_id"))
+        .values(updated_at=table.c.updated_at,
+                risk_priority=bindparam("b_risk_priority"),
+                risk_score=bindparam("b_risk_score"),
+                anomaly_count=bindparam("b_anomaly_count"))
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        criteria = [FormSubmission.id > last_id]
+        if not recompute_all:
+            criteria.append(FormSubmission.risk_score.is_(None))
+        batch = load_facility_batch(db, *criteria, limit=BACKFILL_BATCH_SIZE)
+        if not len(batch):
+            break
+
+        ids = [int(id_) for id_ in batch.id]
+        assessments = list(zip(ai_service.predict_facility_needs_batch(batch),
+                               ai_service.detect_data_anomalies_batch(batch)))
+        params = [
+            {"b_id": id_, **{f"b_{name}": value for name, value in risk_columns(*a).items()}}
+            for id_, a in zip(ids, assessments)
+        ]
+        db.execute(stmt, params)
+
+        recommendations = [
+            {"submission_id": id_, "code": code}
+            for id_, (predictions, _) in zip(ids, assessments)
+            for code in recommendation_codes(predictions)
+        ]
+        db.execute(delete(SubmissionRecommendation)
+                   .where(SubmissionRecommendation.submission_id.in_(ids)))
+        if recommendations:
+            db.execute(insert(SubmissionRecommendation), recommendations)
+        bump_data_version(db)
+        db.commit()
+
+        updated += len(batch)
+        last_id = int(batch.id[-1])
+    return updated
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if sys.argv[1:2] != ["backfill"] or sys.argv[2:] not in ([], ["--all"]):
+        sys.exit("usage: python -m app.services.risk_service backfill [--all]")
+
+    db = SessionLocal()
+    try:
+        count = backfill_risk(db, recompute_all=sys.argv[2:] == ["--all"])
+        print(f"✓ Assessed risk for {count} submissions")
+    finally:
+        db.close()
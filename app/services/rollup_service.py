@@ -0,0 +1,163 @@
+"""
+Rollup maintenance for the dashboard.
+submission_daily_rollups holds submission counts per (day, state, LGA,
+sync status, geopolitical zone, collector). Every flush that inserts, updates or deletes a FormSubmission
+applies matching +1/-1 upserts in the same transaction, so the dashboard can
+read a few hundred pre-aggregated rows instead of scanning form_submissions.
+
+Rebuild from scratch (e.g. after a bulk import done outside the ORM):
+    python -m app.services.rollup_service rebuild
+"""
+
+import sys
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, delete, func, insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.rollup import SubmissionDailyRollup
+from app.models.submission import FormSubmission
+from app.services.data_version_service import bump_data_version
+
+# FormSubmission attributes that decide which rollup row a submission counts in
+ROLLUP_ATTRIBUTES = ("created_at", "state", "lga", "sync_status", "is_synced",
+                     "geopolitical_zone", "collector_id")
+ROLLUP_COLUMNS = ("day", "state", "lga", "sync_status", "is_synced",
+                  "geopolitical_zone", "collector_id")
+
+RollupKey = Tuple
+
+
+def _make_key(created_at, state, lga, sync_status, is_synced, geopolitical_zone,
+              collector_id) -> Optional[RollupKey]:
+    if created_at is None:
+        return None
+    return (created_at.date(), state or "", lga or "", sync_status or "", bool(is_synced),
+            geopolitical_zone or "", collector_id)
+
+
+def rollup_key(submission: FormSubmission) -> Optional[RollupKey]:
+    """Rollup row a submission currently counts in"""
+    return _make_key(*(getattr(submission, attr) for attr in ROLLUP_ATTRIBUTES))
+
+
+def _apply_column_defaults(submission: FormSubmission):
+    """Resolve Python-side defaults (created_at, sync_status, ...) before the
+    INSERT so the rollup key matches the row that gets written"""
+    table = FormSubmission.__table__
+    for attr in ROLLUP_ATTRIBUTES:
+        default = table.c[attr].default
+        if getattr(submission, attr) is None and default is not None:
+            setattr(submission, attr,
+                    default.arg(None) if default.is_callable else default.arg)
+
+
+def _committed_rollup_key(session: Session, submission: FormSubmission) -> Optional[RollupKey]:
+    """Rollup row a submission counted in before its pending changes"""
+    attrs = inspect(submission).attrs
+    values = []
+    for attr in ROLLUP_ATTRIBUTES:
+        history = attrs[attr].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.added:
+            # Assigned while expired (e.g. after a commit), so the old value
+            # was never loaded; read the committed row instead
+            columns = [getattr(FormSubmission, a) for a in ROLLUP_ATTRIBUTES]
+            return _make_key(*session.connection().execute(
+                select(*columns).where(FormSubmission.id == submission.id)
+            ).one())
+        else:
+            values.append(getattr(submission, attr))
+    return _make_key(*values)
+
+
+def apply_rollup_deltas(session: Session, deltas: Dict[RollupKey, int]):
+    """Upsert count deltas into the rollup table and drop rows that reach zero"""
+    rows = [
+        dict(zip(ROLLUP_COLUMNS, key), submission_count=delta)
+        for key, delta in deltas.items() if key is not None and delta
+    ]
+    if not rows:
+        return
+
+    table = SubmissionDailyRollup.__table__
+    dialect = session.get_bind().dialect.name
+    insert_fn = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert_fn(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[c.name for c in table.primary_key],
+        set_={"submission_count": table.c.submission_count +
+              stmt.excluded.submission_count}
+    )
+
+    connection = session.connection()
+    connection.execute(stmt, rows)
+    if any(row["submission_count"] < 0 for row in rows):
+        connection.execute(delete(table).where(table.c.submission_count <= 0))
+
+
+@event.listens_for(Session, "before_flush")
+def track_rollup_changes(session: Session, flush_context, instances):
+    """Turn pending FormSubmission inserts/updates/deletes into rollup deltas"""
+    deltas = Counter()
+
+    for obj in session.new:
+        if isinstance(obj, FormSubmission):
+            _apply_column_defaults(obj)
+            deltas[rollup_key(obj)] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, FormSubmission):
+            deltas[_committed_rollup_key(session, obj)] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, FormSubmission) and session.is_modified(obj):
+            old_key, new_key = _committed_rollup_key(session, obj), rollup_key(obj)
+            if old_key != new_key:
+                deltas[old_key] -= 1
+                deltas[new_key] += 1
+
+    apply_rollup_deltas(session, deltas)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup row from form_submissions; returns rows written"""
+    table = SubmissionDailyRollup.__table__
+    day = func.date(FormSubmission.created_at)
+    dimensions = [
+        day,
+        func.coalesce(FormSubmission.state, ""),
+        func.coalesce(FormSubmission.lga, ""),
+        func.coalesce(FormSubmission.sync_status, ""),
+        func.coalesce(FormSubmission.is_synced, False),
+        func.coalesce(FormSubmission.geopolitical_zone, ""),
+        FormSubmission.collector_id,
+    ]
+
+    db.execute(delete(table))
+    result = db.execute(insert(table).from_select(
+        list(ROLLUP_COLUMNS) + ["submission_count"],
+        select(*dimensions, func.count(FormSubmission.id))
+        .where(FormSubmission.created_at.isnot(None))
+        .group_by(*dimensions)
+    ))
+    bump_data_version(db)
+    db.commit()
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m app.services.rollup_service rebuild")
+
+    db = SessionLocal()
+    try:
+        print(f"✓ Rebuilt {rebuild_rollups(db)} rollup rows")
+    finally:
+        db.close()
@@ -0,0 +1,225 @@
+"""
+Derived submission features.
+The facts the dashboard and the AI service need from the free-form JSON
+sections (power, water, staff and patient counts, satisfaction, funding)
+are computed once whenever a FormSubmission is inserted or its sections
+change, and stored in typed, indexed columns. Reports then aggregate plain
+numeric columns instead of re-parsing JSON on every request.
+
+Recompute every row (e.g. after changing a definition below):
+    python -m app.services.submission_features backfill --all
+"""
+
+import math
+import re
+import sys
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam, event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models.submission import FormSubmission
+from app.services.data_version_service import bump_data_version
+
+# A whitespace-separated leading integer, e.g. "5" or "5 nurses"
+LEADING_INT_PATTERN = r"^\s*[+-]?[0-9]+(\s|$)"
+# A whitespace-separated leading decimal number, e.g. "4.5 stars"
+LEADING_FLOAT_PATTERN = r"^\s*[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?(\s|$)"
+# A whole decimal number, e.g. " 1000.50 " (commas removed first)
+NUMBER_PATTERN = r"^\s*[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?\s*$"
+
+# Largest count the Integer feature columns hold (32-bit on PostgreSQL);
+# counts beyond it are typos and treated as unparseable
+MAX_COUNT = 2**31 - 1
+
+# Key substrings that mark counted fields within a JSON section
+STAFF_KEYS = ("staff", "personnel", "worker")
+PATIENT_KEYS = ("patient", "attendance", "utilization")
+SATISFACTION_KEYS = ("satisfaction", "rating", "score")
+
+# JSON sections the features are derived from
+SOURCE_ATTRIBUTES = (
+    "funding_data", "impact_funding_data", "infrastructure_data",
+    "human_resources_data", "services_data", "satisfaction_survey_data",
+)
+FEATURE_COLUMNS = (
+    "has_power", "has_water", "has_bhcpf", "bhcpf_funded", "has_impact_funding",
+    "total_staff", "total_patients", "avg_satisfaction", "funding_amount",
+)
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _section(data: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    value = data.get(name)
+    return value if isinstance(value, dict) else None
+
+
+def _key_matches(key: str, words) -> bool:
+    key = key.lower()
+    return any(word in key for word in words)
+
+
+def as_count(value) -> Optional[int]:
+    """int(value), or int(first word) for strings; None when that would fail
+    or the count is beyond MAX_COUNT"""
+    count = None
+    if isinstance(value, bool):
+        count = int(value)
+    elif isinstance(value, (int, float)):
+        count = int(value) if math.isfinite(value) else None
+    elif isinstance(value, str) and re.match(LEADING_INT_PATTERN, value):
+        count = int(value.split()[0])
+    if count is None or abs(count) > MAX_COUNT:
+        return None
+    return count
+
+
+def as_score(value) -> Optional[float]:
+    """float(value), or float(first word) for strings; None when that would fail"""
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, str) and re.match(LEADING_FLOAT_PATTERN, value):
+        return float(value.split()[0])
+    return None
+
+
+def as_amount(value) -> Optional[float]:
+    """float(value) with thousands separators removed; None when that would fail"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        text = value.replace(",", "")
+        if re.match(NUMBER_PATTERN, text):
+            return float(text)
+    return None
+
+
+def _yes_or_truthy(section, yes_key: str, truthy_key: str) -> bool:
+    if section is None:
+        return False
+    return section.get(yes_key) == "Yes" or bool(section.get(truthy_key))
+
+
+def _sum_counts(section, words) -> Optional[int]:
+    if section is None:
+        return None
+    counts = (as_count(v) for k, v in section.items() if _key_matches(k, words))
+    total = sum(c for c in counts if c is not None)
+    return total if abs(total) <= MAX_COUNT else None
+
+
+def compute_features(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the feature columns from a submission's JSON sections"""
+    funding = _section(data, "funding_data")
+    impact = _section(data, "impact_funding_data")
+    infra = _section(data, "infrastructure_data")
+    satisfaction = _section(data, "satisfaction_survey_data")
+
+    scores = [] if satisfaction is None else [
+        s for s in (as_score(v) for k, v in satisfaction.items()
+                    if _key_matches(k, SATISFACTION_KEYS))
+        if s is not None
+    ]
+    amount = funding.get("amount") if funding else None
+
+    return {
+        "has_power": _yes_or_truthy(infra, "has_power", "power_available"),
+        "has_water": _yes_or_truthy(infra, "has_water", "water_available"),
+        # The detailed analytics report's definition...
+        "has_bhcpf": _yes_or_truthy(funding, "bhcpf_received", "has_bhcpf"),
+        # ...and the AI funding rule's, which reads bhcpf_status instead
+        "bhcpf_funded": bool(funding) and (funding.get("bhcpf_status") == "Received"
+                                           or bool(funding.get("has_bhcpf"))),
+        "has_impact_funding": _yes_or_truthy(impact, "received", "has_impact_funding"),
+        "total_staff": _sum_counts(_section(data, "human_resources_data"), STAFF_KEYS),
+        "total_patients": _sum_counts(_section(data, "services_data"), PATIENT_KEYS),
+        "avg_satisfaction": sum(scores) / len(scores) if scores else None,
+        "funding_amount": as_amount(amount) if amount else None,
+    }
+
+
+def get_features(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored features from a to_dict() payload, computed when missing"""
+    if all(data.get(name) is not None
+           for name in ("has_power", "has_water", "has_bhcpf", "bhcpf_funded")):
+        return {name: data.get(name) for name in FEATURE_COLUMNS}
+    return compute_features(data)
+
+
+def apply_features(submission: FormSubmission):
+    data = {attr: getattr(submission, attr) for attr in SOURCE_ATTRIBUTES}
+    for name, value in compute_features(data).items():
+        setattr(submission, name, value)
+
+
+@event.listens_for(Session, "before_flush")
+def track_feature_changes(session: Session, flush_context, instances):
+    """Recompute features for new submissions and ones whose sections changed"""
+    for obj in session.new:
+        if isinstance(obj, FormSubmission):
+            apply_features(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, FormSubmission):
+            attrs = inspect(obj).attrs
+            if any(attrs[attr].history.has_changes() for attr in SOURCE_ATTRIBUTES):
+                apply_features(obj)
+
+
+def backfill_features(db: Session, recompute_all: bool = False) -> int:
+    """Fill the feature columns in batches; returns rows updated.
+
+    By default only rows that were never computed are touched, so this is
+    cheap to run on every startup. bhcpf_funded is the newest feature
+    column, so it is NULL on every row that lacks some of them.
+    """
+    table = FormSubmission.__table__
+    columns = [table.c.id, table.c.updated_at] + [table.c[attr] for attr in SOURCE_ATTRIBUTES]
+    # updated_at is written back unchanged so the backfill doesn't look like an edit
+    stmt = (
+        update(table).where(table.c.id == bindparam("b_id"))
+        .values(updated_at=bindparam("b_updated_at"),
+                **{name: bindparam(f"b_{name}") for name in FEATURE_COLUMNS})
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        query = select(*columns).where(table.c.id > last_id)
+        if not recompute_all:
+            query = query.where(table.c.bhcpf_funded.is_(None))
+        rows = db.execute(query.order_by(table.c.id).limit(BACKFILL_BATCH_SIZE)).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            features = compute_features(dict(zip(SOURCE_ATTRIBUTES, row[2:])))
+            params.append({"b_id": row.id, "b_updated_at": row.updated_at,
+                           **{f"b_{name}": value for name, value in features.items()}})
+        db.execute(stmt, params)
+        bump_data_version(db)
+        db.commit()
+
+        updated += len(rows)
+        last_id = rows[-1].id
+    return updated
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if sys.argv[1:2] != ["backfill"] or sys.argv[2:] not in ([], ["--all"]):
+        sys.exit("usage: python -m app.services.submission_features backfill [--all]")
+
+    db = SessionLocal()
+    try:
+        count = backfill_features(db, recompute_all=sys.argv[2:] == ["--all"])
+        print(f"✓ Computed features for {count} submissions")
+    finally:
+        db.close()
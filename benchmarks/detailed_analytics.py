@@ -0,0 +1,190 @@
+"""
+Time the detailed analytics engines (ANALYTICS_ENGINE=sql and =frame).
+
+    python benchmarks/detailed_analytics.py [rows ...]
+
+Runs against a throwaway SQLite database seeded with synthetic submissions
+(default 10000, 100000 and 1000000 rows; the largest takes several minutes)
+and checks that both engines give the same report as the per-row loop they
+replaced (baseline_analytics.py), on those rows and on small data sets with
+unusual JSON sections. The loop is timed alongside them as the baseline.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from baseline_analytics import build_detailed_analytics_loop  # noqa: E402
+from app.main import app  # noqa: E402,F401  (registers the session listeners)
+from app.models.submission import FormSubmission  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.analytics_frame import build_detailed_analytics_frame  # noqa: E402
+from app.services.analytics_service import build_detailed_analytics  # noqa: E402
+from app.services.submission_features import SOURCE_ATTRIBUTES, compute_features  # noqa: E402
+
+ENGINES = {
+    "sql": build_detailed_analytics,
+    "frame": build_detailed_analytics_frame,
+}
+BASELINE = ("loop", build_detailed_analytics_loop)
+
+# Sections that once broke an engine, each given to every row of a small set
+EDGE_CASES = {
+    "numeric services": {"services_data": {"monthly_patients": 5}},
+    "boolean services": {"services_data": {"immunization": True, "antenatal": False}},
+    "empty sections": {section: {} for section in (
+        "infrastructure_data", "human_resources_data", "services_data",
+        "satisfaction_survey_data")},
+    "no sections": {section: None for section in (
+        "funding_data", "impact_funding_data", "infrastructure_data",
+        "human_resources_data", "services_data", "satisfaction_survey_data")},
+    "oversized counts": {"human_resources_data": {"doctors_staff": 1e20,
+                                                  "nurses_staff": "3000000000 nurses",
+                                                  "chew_workers": 4}},
+}
+EDGE_CASE_ROWS = 50
+# Edge cases where the engines deliberately differ from the loop
+LOOP_DIFFERS = {
+    # Counts beyond MAX_COUNT are ignored instead of stored
+    "oversized counts",
+}
+
+STATES = ["Lagos", "Kano", "Kaduna", "Oyo", "Rivers", "Enugu"]
+ZONES = ["North West", "North Central", "South West", "South South", "South East"]
+CONDITIONS = ["Good", "Fair", "Poor", "Dilapidated", ""]
+STAFF_KEYS = ["doctors_staff", "nurses_staff", "chew_workers", "admin_personnel"]
+SERVICES = ["immunization", "antenatal", "family_planning", "laboratory"]
+SURVEY_KEYS = ["overall_satisfaction", "waiting_time_rating", "cleanliness_score"]
+INSERT_BATCH = 10000
+
+
+def _yes_no():
+    return random.choice(["Yes", "No"])
+
+
+def synthetic_submission(i: int, collector_id: int, now: datetime, overrides: dict) -> dict:
+    state = random.choice(STATES)
+    row = {
+        "collector_id": collector_id,
+        "facility_name": f"Facility {i}",
+        "state": state,
+        "lga": f"{state} LGA {random.randint(1, 20)}",
+        "geopolitical_zone": random.choice(ZONES),
+        "facility_condition": random.choice(CONDITIONS),
+        "ownership_type": random.choice(["Public", "Private", "Faith-based"]),
+        "assessment_type": random.choice(["Baseline", "Follow-up"]),
+        "has_health_workers": _yes_no(),
+        "sync_status": "synced",
+        "is_synced": True,
+        "created_at": now - timedelta(days=random.randint(0, 365)),
+        "updated_at": now,
+        "funding_data": {"bhcpf_received": _yes_no(),
+                         "bhcpf_status": random.choice(["Received", "Pending"]),
+                         "amount": str(random.randint(0, 5_000_000))},
+        "impact_funding_data": {"received": _yes_no()},
+        "infrastructure_data": {"has_power": _yes_no(), "has_water": _yes_no(),
+                                "has_internet": _yes_no(),
+                                "pharmacy_available": random.random() < 0.5,
+                                "revitalization": _yes_no()},
+        "human_resources_data": {key: random.randint(0, 12)
+                                 for key in random.sample(STAFF_KEYS, 3)},
+        "services_data": {**{key: random.choice(["yes", "no", "Available"])
+                             for key in SERVICES},
+                          "monthly_patients": random.randint(0, 900)},
+        "satisfaction_survey_data": {key: f"{random.randint(1, 5)} stars"
+                                     for key in SURVEY_KEYS},
+    }
+    row.update(overrides)
+    # Core inserts skip the before_flush listeners, so fill the features here
+    row.update(compute_features({attr: row[attr] for attr in SOURCE_ATTRIBUTES}))
+    return row
+
+
+def seed(rows: int, **overrides):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    admin = User(username="bench", email="bench@pfmo.org", hashed_password="-",
+                 role=UserRole.ADMIN, is_active=True)
+    db.add(admin)
+    db.commit()
+
+    now = datetime.utcnow()
+    table = FormSubmission.__table__
+    for start in range(0, rows, INSERT_BATCH):
+        batch = [synthetic_submission(i, admin.id, now, overrides)
+                 for i in range(start, min(rows, start + INSERT_BATCH))]
+        db.execute(table.insert(), batch)
+        db.commit()
+    db.close()
+
+
+def timed(build) -> tuple:
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        result = build(db)
+        return time.perf_counter() - start, result
+    finally:
+        db.close()
+
+
+def comparable(report):
+    """A report with its lists in one order: the loop lists equal counts in
+    row order, the engines in value order"""
+    if isinstance(report, dict):
+        return {key: comparable(value) for key, value in report.items()}
+    if isinstance(report, list):
+        return sorted((comparable(value) for value in report), key=repr)
+    return report
+
+
+def check_reports(results: dict, baseline, where: str):
+    """Exit unless every engine's report matches the loop's (or, without
+    one, each other's)"""
+    expected = comparable(baseline) if baseline is not None else None
+    for name, report in results.items():
+        report = comparable(report)
+        if expected is None:
+            expected = report
+        elif report != expected:
+            sys.exit(f"{name} engine disagrees with the "
+                     f"{'loop' if baseline is not None else 'other engines'} {where}")
+
+
+def check_edge_cases():
+    baseline_name, baseline_build = BASELINE
+    for case, overrides in EDGE_CASES.items():
+        seed(EDGE_CASE_ROWS, **overrides)
+        results = {name: timed(build)[1] for name, build in ENGINES.items()}
+        baseline = None if case in LOOP_DIFFERS else timed(baseline_build)[1]
+        check_reports(results, baseline, f"on {case}")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    check_edge_cases()
+    for rows in sizes:
+        seed(rows)
+        results = {}
+        line = [f"{rows:>9} submissions"]
+        baseline_name, baseline_build = BASELINE
+        baseline_seconds, baseline = timed(baseline_build)
+        line.append(f"{baseline_name} {baseline_seconds:7.2f}s")
+        for name, build in ENGINES.items():
+            seconds, results[name] = timed(build)
+            line.append(f"{name} {seconds:7.2f}s ({baseline_seconds / seconds:4.1f}x)")
+        print("  ".join(line))
+        check_reports(results, baseline, f"at {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Count the SQL statements each dashboard/stats endpoint issues per request.
+
+    python benchmarks/query_counts.py [rows]
+
+Runs against a throwaway SQLite database seeded with synthetic submissions.
+The data-version read that keys the response cache (app/core/cache.py) is
+counted apart from the queries that build the response.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.submission import FormSubmission  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.routers.auth import get_current_user, get_current_active_admin  # noqa: E402
+
+ENDPOINTS = [
+    "/api/v1/dashboard/overview",
+    "/api/v1/submissions/stats",
+]
+
+STATES = ["Lagos", "Kano", "Kaduna", "Oyo", "Rivers", "Enugu"]
+
+
+def seed(rows: int) -> User:
+    db = SessionLocal()
+    admin = User(username="bench", email="bench@pfmo.org", hashed_password="-",
+                 role=UserRole.ADMIN, is_active=True)
+    db.add(admin)
+    db.commit()
+
+    now = datetime.utcnow()
+    for i in range(rows):
+        state = random.choice(STATES)
+        db.add(FormSubmission(
+            collector_id=admin.id,
+            facility_name=f"Facility {i}",
+            state=state,
+            lga=f"{state} LGA {random.randint(1, 20)}",
+            sync_status=random.choice(["synced", "synced", "pending"]),
+            is_synced=random.random() < 0.7,
+            created_at=now - timedelta(days=random.randint(0, 90)),
+        ))
+    db.commit()
+    db.refresh(admin)
+    db.expunge(admin)
+    db.close()
+    return admin
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    admin = seed(rows)
+    app.dependency_overrides[get_current_user] = lambda: admin
+    app.dependency_overrides[get_current_active_admin] = lambda: admin
+    client = TestClient(app)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    print(f"{rows} submissions")
+    for path in ENDPOINTS:
+        statements.clear()
+        response = client.get(path)
+        response.raise_for_status()
+        versions = sum("data_versions" in statement for statement in statements)
+        print(f"{path:40} {len(statements) - versions} statements"
+              f" + {versions} data version read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Test setup: the app runs against a throwaway SQLite database (migrated at
+import like in production), with authentication replaced by a seeded admin.
+Set TEST_POSTGRES_URL to a throwaway PostgreSQL database to also run the
+tests marked `postgresql` (they drop and recreate its tables).
+"""
+import os
+import tempfile
+
+import pytest
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.routers.auth import get_current_active_admin, get_current_user  # noqa: E402
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("TEST_POSTGRES_URL"):
+        return
+    skip = pytest.mark.skip(reason="TEST_POSTGRES_URL is not set")
+    for item in items:
+        if "postgresql" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def admin():
+    session = SessionLocal()
+    user = session.query(User).filter(User.username == "tester").first()
+    if user is None:
+        user = User(username="tester", email="tester@pfmo.org", hashed_password="-",
+                    role=UserRole.ADMIN, is_active=True)
+        session.add(user)
+        session.commit()
+    session.refresh(user)
+    session.expunge(user)
+    session.close()
+    return user
+
+
+@pytest.fixture
+def client(admin):
+    app.dependency_overrides[get_current_user] = lambda: admin
+    app.dependency_overrides[get_current_active_admin] = lambda: admin
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
@@ -0,0 +1,19 @@
+from app.models.recommendation import SubmissionRecommendation
+from app.models.submission import FormSubmission
+
+
+def test_recommendation_summary_skips_retired_codes(client, db, admin):
+    submission = FormSubmission(facility_name="Stale recommendation", state="Stale State",
+                                facility_condition="poor", collector_id=admin.id)
+    db.add(submission)
+    db.commit()
+    db.add(SubmissionRecommendation(submission_id=submission.id, code="retired_code"))
+    db.commit()
+
+    response = client.get("/api/v1/ai/recommendations",
+                          params={"view": "aggregate", "state": "Stale State"})
+    assert response.status_code == 200, response.text
+
+    codes = {entry["code"] for entry in response.json()["recommendations"]}
+    assert "retired_code" not in codes
+    assert "rehabilitate_facility" in codes
@@ -0,0 +1,168 @@
+import json
+import uuid
+
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.submission import FormSubmission
+from app.models.user import User, UserRole
+from app.routers import submissions
+
+
+def _client_id():
+    return str(uuid.uuid4())
+
+
+def _insert_elsewhere(client_submission_id, collector_id):
+    """Commit a row from another session, like a concurrent sync would"""
+    session = SessionLocal()
+    row = FormSubmission(facility_name="Concurrent", collector_id=collector_id,
+                         client_submission_id=client_submission_id)
+    session.add(row)
+    session.commit()
+    submission_id = row.id
+    session.close()
+    return submission_id
+
+
+def _other_collector():
+    session = SessionLocal()
+    user = session.query(User).filter(User.username == "other-collector").first()
+    if user is None:
+        user = User(username="other-collector", email="other@pfmo.org", hashed_password="-",
+                    role=UserRole.DATA_COLLECTOR, is_active=True)
+        session.add(user)
+        session.commit()
+    user_id = user.id
+    session.close()
+    return user_id
+
+
+def test_batch_is_inserted_in_chunks(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "SUBMISSION_BATCH_CHUNK_SIZE", 2)
+    commits = []
+    insert_chunk = submissions._insert_chunk
+
+    def counting_insert_chunk(session, chunk, collector_id):
+        commits.append(len(chunk))
+        return insert_chunk(session, chunk, collector_id)
+
+    monkeypatch.setattr(submissions, "_insert_chunk", counting_insert_chunk)
+    response = client.post("/api/v1/submissions/submit-batch", json=[
+        {"facility_name": f"Chunked {i}"} for i in range(5)
+    ])
+    assert response.status_code == 200, response.text
+
+    body = response.json()
+    assert body["created"] == 5
+    assert commits == [2, 2, 1]
+    assert [r["index"] for r in body["results"]] == list(range(5))
+    ids = [r["id"] for r in body["results"]]
+    assert [db.get(FormSubmission, i).facility_name for i in ids] == \
+        [f"Chunked {i}" for i in range(5)]
+
+
+def test_batch_accepts_wrapped_and_ndjson_payloads(client):
+    wrapped = client.post("/api/v1/submissions/submit-batch", json={
+        "submissions": [{"facility_name": "Wrapped"}]
+    })
+    assert wrapped.json()["created"] == 1
+
+    ndjson = client.post(
+        "/api/v1/submissions/submit-batch",
+        content="\n".join(json.dumps({"facility_name": f"Line {i}"}) for i in range(2)),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert ndjson.json()["created"] == 2
+
+
+def test_idempotency_key_replays_the_first_submit(client):
+    key = _client_id()
+    first = client.post("/api/v1/submissions/submit", json={"facility_name": "Replayed"},
+                        headers={"Idempotency-Key": key})
+    assert first.status_code == 201, first.text
+
+    replay = client.post("/api/v1/submissions/submit", json={"facility_name": "Replayed"},
+                         headers={"Idempotency-Key": key})
+    assert replay.status_code == 200
+    assert replay.json()["id"] == first.json()["id"]
+
+    batch = client.post("/api/v1/submissions/submit-batch", json=[
+        {"facility_name": "Replayed", "client_submission_id": key}
+    ])
+    assert batch.json()["results"][0] == {
+        "index": 0, "status": "duplicate", "id": first.json()["id"], "errors": None
+    }
+
+
+def test_batch_resolves_duplicates(client):
+    held, repeated = _client_id(), _client_id()
+    held_id = client.post("/api/v1/submissions/submit", json={
+        "facility_name": "Held", "client_submission_id": held
+    }).json()["id"]
+
+    response = client.post("/api/v1/submissions/submit-batch", json=[
+        {"facility_name": "Held", "client_submission_id": held},
+        {"facility_name": "Repeated", "client_submission_id": repeated},
+        {"facility_name": "Repeated", "client_submission_id": repeated},
+    ])
+    body = response.json()
+    results = body["results"]
+    assert (body["created"], body["duplicates"], body["failed"]) == (1, 2, 0)
+    assert results[0]["status"] == "duplicate" and results[0]["id"] == held_id
+    assert results[1]["status"] == "created"
+    assert results[2]["status"] == "duplicate" and results[2]["id"] == results[1]["id"]
+
+
+def test_batch_reports_partial_failure(client, monkeypatch):
+    monkeypatch.setattr(settings, "SUBMISSION_BATCH_CHUNK_SIZE", 1)
+    insert_chunk = submissions._insert_chunk
+
+    def failing_insert_chunk(session, chunk, collector_id):
+        if chunk[0][1].facility_name == "Unlucky":
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return insert_chunk(session, chunk, collector_id)
+
+    monkeypatch.setattr(submissions, "_insert_chunk", failing_insert_chunk)
+    response = client.post("/api/v1/submissions/submit-batch", json=[
+        {"facility_name": "Fine"},
+        {"facility_name": "Unlucky"},
+        {"facility_name": "Bad", "latitude": "north"},
+        {"facility_name": "Also fine"},
+    ])
+    assert response.status_code == 200, response.text
+
+    body = response.json()
+    assert (body["total"], body["created"], body["failed"]) == (4, 2, 2)
+    assert [r["status"] for r in body["results"]] == ["created", "failed", "invalid", "created"]
+    assert body["results"][1]["errors"] == [{"msg": "OperationalError"}]
+    assert body["results"][2]["errors"][0]["loc"] == ["latitude"]
+
+
+def test_concurrent_insert_is_retried_item_by_item(client, admin, monkeypatch):
+    mine, theirs = _client_id(), _client_id()
+    other = _other_collector()
+    racing = {}
+    insert_chunk = submissions._insert_chunk
+
+    def racing_insert_chunk(session, chunk, collector_id):
+        if not racing:
+            # Both client UUIDs are committed after the batch looked them up
+            racing[mine] = _insert_elsewhere(mine, admin.id)
+            racing[theirs] = _insert_elsewhere(theirs, other)
+        return insert_chunk(session, chunk, collector_id)
+
+    monkeypatch.setattr(submissions, "_insert_chunk", racing_insert_chunk)
+    response = client.post("/api/v1/submissions/submit-batch", json=[
+        {"facility_name": "Before"},
+        {"facility_name": "Mine", "client_submission_id": mine},
+        {"facility_name": "Theirs", "client_submission_id": theirs},
+        {"facility_name": "After"},
+    ])
+    assert response.status_code == 200, response.text
+
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["created", "duplicate", "invalid", "created"]
+    assert results[1]["id"] == racing[mine]
+    assert results[2]["errors"][0]["loc"] == ["client_submission_id"]
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.migrations import get_alembic_config
+from app.database import SessionLocal
+from app.models.data_version import DataVersion
+from app.services.data_version_service import (
+    SUBMISSIONS, VERSION_SHARDS, bump_data_version, get_data_version
+)
+
+
+def test_every_shard_row_exists(db):
+    shards = {shard for (shard,) in db.query(DataVersion.shard)
+              .filter(DataVersion.name == SUBMISSIONS)}
+    assert shards == set(range(VERSION_SHARDS))
+
+
+def test_bumps_from_any_session_raise_the_version(db):
+    before = get_data_version(db)
+    for shard in (0, 5):
+        writer = SessionLocal()
+        writer.info["data_version_shard"] = shard
+        bump_data_version(writer)
+        bump_data_version(writer)
+        writer.commit()
+        writer.close()
+    assert get_data_version(db) == before + 4
+
+
+def test_a_missing_shard_row_is_recreated(db):
+    before = get_data_version(db)
+    db.query(DataVersion).filter(DataVersion.name == SUBMISSIONS,
+                                 DataVersion.shard == 3).delete()
+    db.commit()
+    lost = before - get_data_version(db)
+
+    writer = SessionLocal()
+    writer.info["data_version_shard"] = 3
+    bump_data_version(writer)
+    writer.commit()
+    writer.close()
+    assert get_data_version(db) == before - lost + 1
+
+
+def test_a_session_keeps_bumping_one_shard():
+    writer = SessionLocal()
+    bump_data_version(writer)
+    shard = writer.info["data_version_shard"]
+    bump_data_version(writer)
+    assert writer.info["data_version_shard"] == shard
+    writer.rollback()
+    writer.close()
+
+
+@pytest.mark.postgresql
+def test_writers_on_different_shards_do_not_wait():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE; CREATE SCHEMA public"))
+    config = get_alembic_config()
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        connection.commit()
+
+    first, second = Session(bind=engine), Session(bind=engine)
+    try:
+        before = get_data_version(first)
+        first.info["data_version_shard"], second.info["data_version_shard"] = 0, 1
+        bump_data_version(first)  # holds shard 0 until it commits
+        second.execute(text("SET LOCAL lock_timeout = '1s'"))
+        bump_data_version(second)
+        second.commit()
+        first.commit()
+        assert get_data_version(first) == before + 2
+    finally:
+        first.close()
+        second.close()
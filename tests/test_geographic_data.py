@@ -0,0 +1,24 @@
+import pytest
+
+from app.routers.dashboard import (
+    POINTS_BINARY_TYPE, POINTS_COLUMNAR_TYPE, POINTS_MEDIA_TYPES, _preferred_media_type
+)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, "application/json"),
+    (POINTS_BINARY_TYPE, POINTS_BINARY_TYPE),
+    (f"{POINTS_COLUMNAR_TYPE}, {POINTS_BINARY_TYPE};q=0.5", POINTS_COLUMNAR_TYPE),
+    (f"{POINTS_BINARY_TYPE};q=0", "application/json"),
+    (f"{POINTS_BINARY_TYPE};q=0, {POINTS_COLUMNAR_TYPE};q=0.1", POINTS_COLUMNAR_TYPE),
+    (f"{POINTS_BINARY_TYPE};q=abc", "application/json"),
+])
+def test_preferred_media_type(accept, expected):
+    assert _preferred_media_type(accept, POINTS_MEDIA_TYPES) == expected
+
+
+def test_refused_binary_encoding_is_not_served(client):
+    response = client.get("/api/v1/dashboard/geographic-data",
+                          headers={"Accept": f"{POINTS_BINARY_TYPE};q=0"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,46 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from app.models.submission import FormSubmission
+from app.services import image_service
+
+
+def stored_submission(db, admin, path):
+    submission = FormSubmission(collector_id=admin.id, facility_image_path=path)
+    db.add(submission)
+    db.commit()
+    return submission
+
+
+def record(path, source):
+    derivatives = image_service.create_derivatives(path)
+    uploaded_at = datetime.utcnow() - timedelta(minutes=1)
+    return asyncio.run(image_service.record_derivatives(path, derivatives, uploaded_at, source))
+
+
+def test_derivatives_are_recorded_for_the_original(tmp_path, db, admin):
+    path = str(tmp_path / "photo.jpg")
+    Image.new("RGB", (800, 600)).save(path)
+    submission = stored_submission(db, admin, path)
+
+    assert record(path, image_service.file_signature(path))
+    db.refresh(submission)
+    assert submission.facility_image_thumbnail_path == image_service.derivative_paths(path)["thumbnail"]
+
+
+def test_derivatives_of_a_replaced_original_are_not_recorded(tmp_path, db, admin):
+    path = str(tmp_path / "photo.jpg")
+    Image.new("RGB", (800, 600)).save(path)
+    source = image_service.file_signature(path)
+    submission = stored_submission(db, admin, path)
+
+    replacement = str(tmp_path / "replacement.jpg")
+    Image.new("RGB", (300, 200)).save(replacement)
+    os.replace(replacement, path)
+
+    assert not record(path, source)
+    db.refresh(submission)
+    assert submission.facility_image_thumbnail_path is None
@@ -0,0 +1,90 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.submission import FormSubmission
+from app.models.user import User, UserRole
+from app.services.ai_service import load_facility_batch
+from app.services.analytics_frame import build_detailed_analytics_frame
+from app.services.analytics_service import JsonDialect, build_detailed_analytics
+
+# Sections of every JSON kind, including the ones that once broke an engine
+SUBMISSIONS = [
+    {
+        "state": "Lagos", "facility_condition": "Good", "ownership_type": "Public",
+        "funding_data": {"bhcpf_received": "Yes", "amount": "1,000.50"},
+        "impact_funding_data": {"received": "Yes"},
+        "infrastructure_data": {"has_power": "Yes", "pharmacy_available": True,
+                                "revitalization": "Yes"},
+        "human_resources_data": {"doctors_staff": 3, "nurses_staff": "4 nurses",
+                                 "admin_personnel": 1e20},
+        "services_data": {"immunization": "Yes", "antenatal": True,
+                          "monthly_patients": 120},
+        "satisfaction_survey_data": {"overall_satisfaction": "4.5 stars",
+                                     "waiting_time_rating": 3},
+    },
+    {
+        "state": "Kano", "facility_condition": "Poor",
+        "funding_data": {"has_bhcpf": True, "bhcpf_status": "Received"},
+        "infrastructure_data": [],
+        "human_resources_data": "none",
+        "services_data": {},
+    },
+    {
+        "state": "Kano", "facility_condition": "Fair", "has_health_workers": "No",
+        "infrastructure_data": {"has_water": 1, "has_internet": ""},
+        "human_resources_data": {"chew_workers": "3000000000 workers",
+                                 "relief_staff": False, "other_staff": {}},
+        "services_data": {"monthly_patients": "12.5", "laboratory": "available"},
+        "satisfaction_survey_data": {"cleanliness_score": "n/a"},
+    },
+    {"state": "Oyo"},
+]
+
+
+def seed(url: str) -> Session:
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = Session(bind=engine)
+    collector = User(username="dialects", email="dialects@pfmo.org", hashed_password="-",
+                     role=UserRole.DATA_COLLECTOR, is_active=True)
+    db.add(collector)
+    db.flush()
+    db.add_all([FormSubmission(collector_id=collector.id, facility_name=f"Facility {i}", **data)
+                for i, data in enumerate(SUBMISSIONS)])
+    db.commit()
+    return db
+
+
+def batch_columns(db: Session) -> dict:
+    batch = load_facility_batch(db)
+    return {name: getattr(batch, name).tolist() for name in (
+        "has_funding_data", "has_infrastructure_data", "has_hr_values")}
+
+
+def test_incomplete_dialect_fails_when_created():
+    class GetOnly(JsonDialect):
+        def get(self, col, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+@pytest.mark.postgresql
+def test_postgres_json_matches_sqlite():
+    sqlite = seed("sqlite:///" + os.path.join(tempfile.mkdtemp(), "dialects.db"))
+    postgres = seed(os.environ["TEST_POSTGRES_URL"])
+    try:
+        report = build_detailed_analytics(sqlite)
+        assert build_detailed_analytics(postgres) == report
+        assert build_detailed_analytics_frame(postgres) == report
+        assert batch_columns(postgres) == batch_columns(sqlite)
+    finally:
+        sqlite.close()
+        postgres.close()
@@ -0,0 +1,73 @@
+"""
+Databases created before the migrations existed (Base.metadata.create_all,
+no alembic_version) must upgrade to head, whichever commit created them.
+"""
+import os
+import tempfile
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.migrations import get_alembic_config
+from app.models.submission import FormSubmission
+from app.models.user import User, UserRole
+
+# What create_all added to form_submissions before 0002/0003 existed
+CLIENT_SUBMISSION_ID = [
+    "ALTER TABLE form_submissions ADD COLUMN client_submission_id VARCHAR(64)",
+    "CREATE UNIQUE INDEX ix_form_submissions_client_submission_id"
+    " ON form_submissions (client_submission_id)",
+]
+KEYSET_INDEXES = [
+    "CREATE INDEX ix_form_submissions_created_at_id ON form_submissions (created_at, id)",
+    "CREATE INDEX ix_form_submissions_collector_created_at_id"
+    " ON form_submissions (collector_id, created_at, id)",
+]
+QUERY_INDEXES = KEYSET_INDEXES + [
+    "CREATE INDEX ix_form_submissions_state_lga ON form_submissions (state, lga)",
+    "CREATE INDEX ix_form_submissions_sync_status_is_synced"
+    " ON form_submissions (sync_status, is_synced)",
+]
+
+
+def upgrade(engine, revision):
+    config = get_alembic_config()
+    # Not engine.begin(): migrations that need autocommit manage the transaction
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+        connection.commit()
+
+
+@pytest.mark.parametrize("created_by, statements", [
+    ("baseline", []),
+    # the idempotency and sparse-fieldset changes, before 0001 existed
+    ("client_submission_id", CLIENT_SUBMISSION_ID),
+    # keyset pagination, before 0001 existed
+    ("keyset indexes", CLIENT_SUBMISSION_ID + KEYSET_INDEXES),
+    # every index 0003 builds, e.g. created by hand ahead of the migration
+    ("query indexes", CLIENT_SUBMISSION_ID + QUERY_INDEXES),
+])
+def test_pre_migration_database_upgrades_to_head(created_by, statements):
+    engine = create_engine("sqlite:///" + os.path.join(tempfile.mkdtemp(), "old.db"))
+    # The baseline tables, as create_all made them, without a version stamp
+    upgrade(engine, "0001")
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+        for statement in statements:
+            connection.execute(text(statement))
+
+    upgrade(engine, "head")
+
+    columns = {c["name"] for c in inspect(engine).get_columns("form_submissions")}
+    assert set(FormSubmission.__table__.columns.keys()) <= columns
+    with Session(bind=engine) as db:
+        collector = User(username="old", email="old@pfmo.org", hashed_password="-",
+                         role=UserRole.DATA_COLLECTOR, is_active=True)
+        db.add(collector)
+        db.flush()
+        db.add(FormSubmission(collector_id=collector.id, client_submission_id="a1",
+                              human_resources_data={"nurses_staff": 2}))
+        db.commit()
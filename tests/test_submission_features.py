@@ -0,0 +1,48 @@
+from app.models.submission import FormSubmission
+from app.services.submission_features import MAX_COUNT, compute_features
+
+
+def test_out_of_range_counts_are_ignored():
+    features = compute_features({
+        "human_resources_data": {"doctor_staff": 1e20, "nurse_staff": "4 nurses"},
+        "services_data": {"patient_count": "3000000000 patients"},
+    })
+    assert features["total_staff"] == 4
+    assert features["total_patients"] == 0
+
+
+def test_counts_that_sum_out_of_range_are_unknown():
+    features = compute_features({
+        "human_resources_data": {"doctor_staff": MAX_COUNT, "nurse_staff": 1},
+    })
+    assert features["total_staff"] is None
+
+
+def test_submission_with_oversized_count_is_stored(client, db):
+    response = client.post("/api/v1/submissions/submit", json={
+        "facility_name": "Oversized counts",
+        "human_resources_data": {"doctor_staff": 1e20},
+        "services_data": {"patient_count": "3000000000 patients"},
+    })
+    assert response.status_code == 201, response.text
+
+    stored = db.get(FormSubmission, response.json()["id"])
+    assert stored.total_staff == 0
+    assert stored.total_patients == 0
+
+    report = client.get("/api/v1/dashboard/detailed-analytics")
+    assert report.status_code == 200, report.text
+
+
+def test_bhcpf_keeps_the_report_and_ai_definitions_apart():
+    received = compute_features({"funding_data": {"bhcpf_received": "Yes"}})
+    assert received["has_bhcpf"] is True
+    assert received["bhcpf_funded"] is False
+
+    status = compute_features({"funding_data": {"bhcpf_status": "Received"}})
+    assert status["has_bhcpf"] is False
+    assert status["bhcpf_funded"] is True
+
+    both = compute_features({"funding_data": {"has_bhcpf": True}})
+    assert both["has_bhcpf"] is True
+    assert both["bhcpf_funded"] is True
@@ -0,0 +1,36 @@
+import pytest
+
+from app.services.ai_service import ai_service
+
+
+def analyze(text):
+    return ai_service._basic_text_analysis(text)
+
+
+@pytest.mark.parametrize("text, sentiment", [
+    ("The roof is leaking and the pharmacy is lacking drugs", "negative"),
+    ("Not working", "negative"),
+    ("The generator isn't working", "negative"),
+    ("Drugs are unavailable", "negative"),
+    ("no water", "negative"),
+    ("Everything is working and available", "positive"),
+    ("We know the schedule now", "neutral"),
+])
+def test_sentiment(text, sentiment):
+    assert analyze(text)["sentiment"] == sentiment
+
+
+@pytest.mark.parametrize("text, topic", [
+    ("Understaffed facility", "staffing"),
+    ("Nurses and doctors are overworked", "staffing"),
+    ("Supplies of medicines ran out", "supplies"),
+    ("Facilities need repairs", "infrastructure"),
+])
+def test_inflected_words_find_their_topic(text, topic):
+    assert topic in analyze(text)["topics"]
+
+
+def test_negated_positive_is_not_counted_as_positive():
+    found = ai_service.keyword_matcher.match("Not working, but staff are available")
+    assert found["negative"] == {"not working"}
+    assert found["positive"] == {"available"}
@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.config import settings
+from app.core.upload_limit import UPLOAD_FORM_OVERHEAD
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1024)
+    return tmp_path / "uploads"
+
+
+def upload(client, size):
+    return client.post("/api/v1/submissions/upload",
+                       files={"file": ("notes.txt", b"x" * size, "text/plain")})
+
+
+def test_upload_within_limit_is_stored(client, upload_dir):
+    response = upload(client, 1024)
+    assert response.status_code == 200, response.text
+    assert response.json()["size"] == 1024
+    assert [p.name for p in upload_dir.iterdir()] == [response.json()["filename"]]
+
+
+def test_oversized_content_length_is_refused_before_reading(client, upload_dir):
+    response = upload(client, 1024 + UPLOAD_FORM_OVERHEAD + 1)
+    assert response.status_code == 413
+    # The endpoint never ran, so it didn't even create the upload directory
+    assert not upload_dir.exists()
+
+
+def test_oversized_file_within_form_overhead_is_refused_by_the_endpoint(client, upload_dir):
+    response = upload(client, 2048)
+    assert response.status_code == 413
+    assert not upload_dir.exists() or list(upload_dir.iterdir()) == []